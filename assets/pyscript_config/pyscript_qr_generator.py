@@ -1,37 +1,39 @@
-import qrcode
-from qrcode.image.styledpil import StyledPilImage
-from qrcode.image.styles.moduledrawers import (
-    RoundedModuleDrawer,
-    CircleModuleDrawer,
-    SquareModuleDrawer,
-    GappedSquareModuleDrawer,
-    VerticalBarsDrawer,
-    HorizontalBarsDrawer,
-)
-from qrcode.image.styles.colormasks import (
-    SolidFillColorMask,
-    RadialGradiantColorMask,
-    SquareGradiantColorMask,
-    HorizontalGradiantColorMask,
-    VerticalGradiantColorMask,
-    ImageColorMask,
-)
 from PIL import Image, ImageDraw
 import io
 import base64
 import json
 import urllib.parse
 from js import document, window, Blob, URL, console, File, FileReader
-from pyodide.ffi import create_proxy
+from pyodide.ffi import create_proxy, to_js
 import asyncio
 
+from qr_render import make_qr, render_png, encode_png, decode_image
+from qr_svg import render_svg
+
+# Input events within this window collapse into one render
+RENDER_DEBOUNCE_MS = 150
+RENDER_WORKER_NAME = "qr-render"
+
 
 class EnhancedQRGenerator:
     def __init__(self):
-        self.current_qr_image = None
+        self._current_qr_image = None
+        self.current_png = None  # JS Uint8Array of the displayed PNG
+        self.current_image_url = None
         self.current_content = ""
         self.overlay_image = None
         self.mask_image = None
+
+        # Background rendering state (see run_render)
+        self.render_worker = None
+        self.worker_failed = False
+        self.render_timer = None
+        self.render_timer_proxy = create_proxy(self.on_render_timer)
+        self.render_id = 0
+        self.render_busy = False
+        self.render_pending = False
+        self.asset_versions = {"overlay": 0, "mask": 0}
+        self.worker_asset_versions = {"overlay": 0, "mask": 0}
         self.config = self.get_default_config()
 
         # Initialize UI
@@ -122,7 +124,7 @@ class EnhancedQRGenerator:
                 radio.addEventListener("change", create_proxy(self.on_input_change))
 
         # Checkboxes
-        checkbox_ids = ["wifi-hidden", "use-image-overlay"]
+        checkbox_ids = ["wifi-hidden", "use-image-overlay", "exact-size"]
         for cb_id in checkbox_ids:
             element = document.getElementById(cb_id)
             if element:
@@ -180,7 +182,7 @@ class EnhancedQRGenerator:
 
         # Action buttons
         button_handlers = {
-            "generate-btn": self.generate_qr,
+            "generate-btn": self.generate_now,
             "download-btn": self.download_qr,
             "download-btn-2": self.download_qr,
             "download-btn-3": self.download_qr,
@@ -488,7 +490,7 @@ class EnhancedQRGenerator:
         format_info = {
             "png": "PNG: Best quality, supports transparency, larger file size",
             "jpeg": "JPEG: Good compression, no transparency, smaller file size",
-            # "svg": "SVG: Vector format, infinite scalability, perfect for print",
+            "svg": "SVG: Vector format, infinite scalability, perfect for print",
             "webp": "WebP: Modern format, excellent compression, good quality",
             "bmp": "BMP: Uncompressed, large file size, maximum quality",
             "tiff": "TIFF: Professional format, lossless compression, large file",
@@ -643,6 +645,7 @@ class EnhancedQRGenerator:
             # Store image
             if image_type == "overlay":
                 self.overlay_image = img
+                self.asset_versions["overlay"] += 1
                 upload_elem = document.getElementById("overlay-image-upload")
                 if upload_elem:
                     text_elem = upload_elem.querySelector(".file-upload-text")
@@ -650,6 +653,7 @@ class EnhancedQRGenerator:
                         text_elem.innerHTML = f"<p>✅ Image loaded: {file.name}</p><p>Size: {img.size[0]}x{img.size[1]}</p>"
             elif image_type == "mask":
                 self.mask_image = img
+                self.asset_versions["mask"] += 1
                 upload_elem = document.getElementById("mask-image-upload")
                 if upload_elem:
                     text_elem = upload_elem.querySelector(".file-upload-text")
@@ -778,290 +782,206 @@ class EnhancedQRGenerator:
         element = document.getElementById(element_id)
         return element.value.strip() if element else ""
 
-    def hex_to_rgb(self, hex_color):
-        """Convert hex color to RGB tuple"""
-        hex_color = hex_color.lstrip("#")
-        if len(hex_color) == 3:
-            hex_color = "".join(c * 2 for c in hex_color)
-        try:
-            return tuple(int(hex_color[i : i + 2], 16) for i in (0, 2, 4))
-        except:
-            return (0, 0, 0)
-
-    def mix_colors(self, color1, color2, weight=0.5):
-        """Mix two RGB colors"""
-        return tuple(
-            int(c1 * (1 - weight) + c2 * weight) for c1, c2 in zip(color1, color2)
-        )
-
-    def get_color_mask(self):
-        """Get appropriate color mask"""
-        mask_select = document.getElementById("color-mask-select")
-        if not mask_select:
-            # Fallback when no mask select element
-            return SolidFillColorMask(front_color=(0, 0, 0), back_color=(255, 255, 255))
-            # return None
-
-        mask_type = mask_select.value
-        fg_color = self.hex_to_rgb(self.get_element_value("fg-color"))
-        bg_color = self.hex_to_rgb(self.get_element_value("bg-color"))
-
-        try:
-            if mask_type == "solid":
-                return SolidFillColorMask(front_color=fg_color, back_color=bg_color)
-
-            elif mask_type == "radial":
-                middle_color = self.mix_colors(fg_color, bg_color)
-                return RadialGradiantColorMask(
-                    back_color=bg_color, center_color=middle_color, edge_color=fg_color
-                )
-
-            elif mask_type == "square":
-                middle_color = self.mix_colors(fg_color, bg_color)
-                return SquareGradiantColorMask(
-                    back_color=bg_color, center_color=middle_color, edge_color=fg_color
-                )
-
-            elif mask_type == "horizontal":
-                middle_color = self.mix_colors(fg_color, bg_color)
-                return HorizontalGradiantColorMask(
-                    back_color=bg_color, left_color=middle_color, right_color=fg_color
-                )
-
-            elif mask_type == "vertical":
-                middle_color = self.mix_colors(fg_color, bg_color)
-                return VerticalGradiantColorMask(
-                    back_color=bg_color, top_color=middle_color, bottom_color=fg_color
-                )
-
-            elif mask_type == "image" and self.mask_image:
-                try:
-                    return ImageColorMask(
-                        back_color=bg_color, color_mask_image=self.mask_image
-                    )
-                except Exception as e:
-                    console.log(f"Image mask error: {e}")
-                    # Fallback to solid when image mask fails
-                    return SolidFillColorMask(front_color=fg_color, back_color=bg_color)
-
-            # Fallback for unknown mask types
-            return SolidFillColorMask(front_color=fg_color, back_color=bg_color)
+    def collect_settings(self):
+        """Snapshot every render setting from the page (see qr_render.render_qr)
 
-        except Exception as e:
-            console.log(f"Color mask error: {e}")
-            # Fallback for any other errors
-            return SolidFillColorMask(front_color=(0, 0, 0), back_color=(255, 255, 255))
-
-    def get_module_drawer(self):
-        """Get appropriate module drawer"""
-        theme_select = document.getElementById("theme-select")
-        if not theme_select:
-            return None
-
-        theme = theme_select.value
-
-        if theme == "rounded":
-            return RoundedModuleDrawer()
-        elif theme == "circular":
-            return CircleModuleDrawer()
-        elif theme == "gapped":
-            try:
-                # from decimal import Decimal
-                # return GappedSquareModuleDrawer(size_ratio=0.8)
-                return GappedSquareModuleDrawer()
-            except:
-                return SquareModuleDrawer()
-        elif theme == "vertical_bars":
-            return VerticalBarsDrawer()
-        elif theme == "horizontal_bars":
-            return HorizontalBarsDrawer()
-        else:
-            # These would need to be implemented or imported
+        Returns None when there is no content to encode.
+        """
+        content = self.get_content_string()
+        if not content:
+            qr_display = document.getElementById("qr-display")
+            qr_display.innerHTML = (
+                '<div class="loading-text">Enter content to generate QR code</div>'
+            )
             return None
 
-    def add_image_overlay(self, qr_img):
-        """Add image overlay to QR code"""
-        if not self.overlay_image:
-            return qr_img
-
-        try:
-            # Get settings
-            size_percent = int(self.get_element_value("image-size") or 20)
-            padding = int(self.get_element_value("image-padding") or 0)
-
-            # Get background type
-            bg_radios = document.querySelectorAll('input[name="image-bg"]')
-            bg_type = "match"
-            for radio in bg_radios:
-                if radio.checked:
-                    bg_type = radio.value
-                    break
-
-            # Calculate overlay size
-            qr_size = qr_img.size[0]
-            overlay_size = int(qr_size * size_percent / 100)
-
-            # Resize overlay maintaining aspect ratio
-            overlay = self.overlay_image.copy()
-            overlay.thumbnail((overlay_size, overlay_size), Image.Resampling.LANCZOS)
-            
-            # Handle rectangular background properly
-            final_overlay = overlay  # This will be the final overlay to paste
-
-            # Create background if needed
-            if bg_type in ["match", "custom"]:
-                # Calculate both width and height for rectangular background
-                bg_width = overlay.size[0] + 2 * padding
-                bg_height = overlay.size[1] + 2 * padding
-
-                if bg_type == "match":
-                    bg_color = self.get_element_value("bg-color")
-                else:
-                    bg_color = self.get_element_value("image-bg-color")
-
-                # Create rectangular background instead of square
-                background = Image.new("RGB", (bg_width, bg_height), bg_color)
-
-                # Center the overlay image on the rectangular background
-                overlay_x = (bg_width - overlay.size[0]) // 2
-                overlay_y = (bg_height - overlay.size[1]) // 2
+        theme_select = document.getElementById("theme-select")
+        mask_select = document.getElementById("color-mask-select")
+        exact_element = document.getElementById("exact-size")
+        use_overlay = document.getElementById("use-image-overlay")
 
-                # Handle transparency
-                if overlay.mode in ("RGBA", "LA") or (
-                    overlay.mode == "P" and "transparency" in overlay.info
-                ):
-                    background.paste(overlay, (overlay_x, overlay_y), overlay)
-                else:
-                    background.paste(overlay, (overlay_x, overlay_y))
+        return {
+            "content": content,
+            "size": int(self.get_element_value("qr-size") or 400),
+            "border": int(self.get_element_value("qr-border") or 4),
+            "fg_color": self.get_element_value("fg-color") or "#000000",
+            "bg_color": self.get_element_value("bg-color") or "#ffffff",
+            "error_correction": self.get_checked_radio("error-correction") or "Q",
+            "exact_size": bool(exact_element and exact_element.checked),
+            "theme": theme_select.value if theme_select else "classic",
+            "color_mask": mask_select.value if mask_select else "",
+            "use_image": bool(use_overlay and use_overlay.checked),
+            "image_size": int(self.get_element_value("image-size") or 20),
+            "image_padding": int(self.get_element_value("image-padding") or 0),
+            "image_bg": self.get_checked_radio("image-bg") or "match",
+            "image_bg_color": self.get_element_value("image-bg-color") or "#ffffff",
+        }
 
-                final_overlay = background
+    def generate_qr(self, event=None, immediate=False):
+        """Schedule a QR render
 
-            # Convert images for transparency support
-            if final_overlay.mode != "RGBA":
-                final_overlay = final_overlay.convert("RGBA")
+        Input events are debounced by RENDER_DEBOUNCE_MS; the Generate button
+        renders straight away. Rendering itself happens in the worker.
+        """
+        if self.render_timer is not None:
+            window.clearTimeout(self.render_timer)
+        delay = 0 if immediate else RENDER_DEBOUNCE_MS
+        self.render_timer = window.setTimeout(self.render_timer_proxy, delay)
 
-            qr_img = qr_img.convert("RGBA")
+    def generate_now(self, event=None):
+        """Generate button handler"""
+        self.generate_qr(immediate=True)
 
-            # Calculate position to center the final overlay (which might be rectangular)
-            overlay_pos = (
-                (qr_size - final_overlay.size[0]) // 2,
-                (qr_size - final_overlay.size[1]) // 2,
-            )
+    def on_render_timer(self):
+        self.render_timer = None
+        asyncio.ensure_future(self.run_render())
 
-            # Paste overlay
-            qr_img.paste(final_overlay, overlay_pos, final_overlay)
+    async def run_render(self):
+        """Render the current settings, latest request wins
 
-            return qr_img.convert("RGB")
+        Only one request is in flight at a time. Requests made meanwhile
+        collapse into a single follow-up render of the newest settings, and
+        the superseded reply is never displayed.
+        """
+        if self.render_busy:
+            self.render_pending = True
+            return
 
-        except Exception as e:
-            console.log(f"Overlay error: {e}")
-            return qr_img
+        settings = self.collect_settings()
+        if settings is None:
+            return
 
-    def generate_qr(self, event=None):
-        """Generate QR code with all features"""
+        self.render_id += 1
+        request_id = self.render_id
+        self.render_busy = True
+        started = window.performance.now()
         try:
-            # Get content
-            content = self.get_content_string()
-            if not content:
-                qr_display = document.getElementById("qr-display")
-                qr_display.innerHTML = (
-                    '<div class="loading-text">Enter content to generate QR code</div>'
+            reply = await self.request_render(request_id, settings)
+        except Exception as e:
+            reply = {"id": request_id, "error": str(e)}
+        finally:
+            self.render_busy = False
+
+        if self.render_pending:
+            self.render_pending = False
+            asyncio.ensure_future(self.run_render())
+        elif reply["id"] == self.render_id:
+            self.show_render(settings, reply, started)
+
+    async def request_render(self, request_id, settings):
+        """Send a render request to the worker (or render here without one)"""
+        worker = await self.get_render_worker()
+        if worker is None:
+            try:
+                image, png, timings = render_png(
+                    settings, self.overlay_image, self.mask_image
                 )
-                return
-
-            self.current_content = content
-
-            # Get settings
-            size = int(self.get_element_value("qr-size") or 400)
-            border = int(self.get_element_value("qr-border") or 4)
-            fg_color = self.get_element_value("fg-color") or "#000000"
-            bg_color = self.get_element_value("bg-color") or "#ffffff"
-
-            # Get error correction
-            error_radios = document.querySelectorAll('input[name="error-correction"]')
-            error_level = "Q"
-            for radio in error_radios:
-                if radio.checked:
-                    error_level = radio.value
-                    break
-
-            # Error correction mapping
-            error_levels = {
-                "L": qrcode.constants.ERROR_CORRECT_L,
-                "M": qrcode.constants.ERROR_CORRECT_M,
-                "Q": qrcode.constants.ERROR_CORRECT_Q,
-                "H": qrcode.constants.ERROR_CORRECT_H,
-            }
-
-            # Create QR code
-            qr = qrcode.QRCode(
-                version=1,
-                error_correction=error_levels.get(
-                    error_level, qrcode.constants.ERROR_CORRECT_Q
-                ),
-                box_size=10,
-                border=border,
-            )
-
-            qr.add_data(content)
-            qr.make(fit=True)
-
-            # Get styling with fallback
+            except Exception as e:
+                return {"id": request_id, "error": str(e)}
+            return {"id": request_id, "png": to_js(png), "image": image, **timings}
+
+        await self.sync_worker_assets(worker)
+        request = json.dumps({"id": request_id, "settings": settings})
+        reply = await worker.render(request)
+        # Shallow conversion keeps the PNG a JS Uint8Array
+        return reply.to_py(depth=1)
+
+    async def get_render_worker(self):
+        """The render worker, or None when workers are unavailable"""
+        if self.render_worker is None and not self.worker_failed:
             try:
-                color_mask = self.get_color_mask()
-                module_drawer = self.get_module_drawer()
+                from pyscript import workers
 
+                self.render_worker = await workers[RENDER_WORKER_NAME]
             except Exception as e:
-                console.log(f"Style error: {e}")
-                color_mask = None
-                module_drawer = None
+                console.log(f"Render worker unavailable, using main thread: {e}")
+                self.worker_failed = True
+        return self.render_worker
+
+    async def sync_worker_assets(self, worker):
+        """Send overlay/mask images the worker hasn't seen yet"""
+        for kind, image in (("overlay", self.overlay_image), ("mask", self.mask_image)):
+            version = self.asset_versions[kind]
+            if self.worker_asset_versions.get(kind) == version:
+                continue
+            data = base64.b64encode(encode_png(image)).decode() if image else ""
+            await worker.set_asset(kind, data)
+            self.worker_asset_versions[kind] = version
+
+    def show_render(self, settings, reply, started):
+        """Swap in a finished render"""
+        qr_display = document.getElementById("qr-display")
+        if "error" in reply:
+            console.log(f"QR generation error: {reply['error']}")
+            self.show_status(f"❌ Error: {reply['error']}", "error")
+            qr_display.innerHTML = (
+                f'<div class="loading-text">Error: {reply["error"]}</div>'
+            )
+            return
 
-            # Generate image with safe fallback
-            try:
-                if module_drawer or color_mask:
-                    qr_img = qr.make_image(
-                        image_factory=StyledPilImage,
-                        module_drawer=module_drawer,
-                        color_mask=color_mask,
-                        fill_color=fg_color,
-                        back_color=bg_color,
-                    )
-                else:
-                    qr_img = qr.make_image(fill_color=fg_color, back_color=bg_color)
-            except Exception as e:
-                console.log(f"QR styling error: {e}, falling back to basic QR")
-                # Fallback to basic QR if styled generation fails
-                qr_img = qr.make_image(fill_color=fg_color, back_color=bg_color)
+        self.current_content = settings["content"]
+        self.current_png = reply["png"]
+        self.current_qr_image = reply.get("image")
 
-            # Resize to target size
-            qr_img = qr_img.resize((size, size), Image.Resampling.LANCZOS)
+        # Display in browser
+        display_started = window.performance.now()
+        self.show_png(self.current_png)
+        finished = window.performance.now()
 
-            # Add image overlay if enabled
-            use_overlay = document.getElementById("use-image-overlay")
-            if use_overlay and use_overlay.checked:
-                qr_img = self.add_image_overlay(qr_img)
+        self.show_timing(reply, finished - display_started, finished - started)
 
-            # Store current image
-            self.current_qr_image = qr_img
+        # Update status
+        self.show_status("✅ QR code generated successfully!", "success")
 
-            # Convert to base64 for display
-            img_buffer = io.BytesIO()
-            qr_img.save(img_buffer, format="PNG")
-            img_data = base64.b64encode(img_buffer.getvalue()).decode()
+    def make_object_url(self, data, mime_type):
+        """Object URL for bytes (or a JS Uint8Array) - no base64 round trip"""
+        from js import Object
 
-            # Display in browser
-            data_url = f"data:image/png;base64,{img_data}"
-            qr_display = document.getElementById("qr-display")
-            qr_display.innerHTML = f'<img src="{data_url}" alt="Generated QR Code">'
+        blob = Blob.new(
+            to_js([data]), to_js({"type": mime_type}, dict_converter=Object.fromEntries)
+        )
+        return URL.createObjectURL(blob)
+
+    def show_png(self, png):
+        """Point the preview <img> at new PNG bytes, updating it in place"""
+        url = self.make_object_url(png, "image/png")
+
+        img = document.getElementById("qr-image")
+        if not img:
+            img = document.createElement("img")
+            img.id = "qr-image"
+            img.alt = "Generated QR Code"
+            document.getElementById("qr-display").replaceChildren(img)
+        img.src = url
+
+        # The previous object URL is no longer referenced by the page
+        if self.current_image_url:
+            URL.revokeObjectURL(self.current_image_url)
+        self.current_image_url = url
+
+    def show_timing(self, reply, display_ms, total_ms):
+        """Timing readout under the preview"""
+        timing = document.getElementById("render-timing")
+        if not timing:
+            return
 
-            # Update status
-            self.show_status("✅ QR code generated successfully!", "success")
+        size_kb = self.current_png.length / 1024
+        timing.textContent = (
+            f"render {reply['render_ms']:.0f} ms · PNG {reply['encode_ms']:.0f} ms "
+            f"· display {display_ms:.1f} ms · total {total_ms:.0f} ms "
+            f"· {size_kb:.1f} KB (data URL: {size_kb * 4 / 3:.1f} KB)"
+        )
 
-        except Exception as e:
-            console.log(f"QR generation error: {e}")
-            self.show_status(f"❌ Error: {str(e)}", "error")
-            qr_display = document.getElementById("qr-display")
-            qr_display.innerHTML = f'<div class="loading-text">Error: {str(e)}</div>'
+    @property
+    def current_qr_image(self):
+        """Displayed code as a PIL image, decoded from the PNG on first use"""
+        if self._current_qr_image is None and self.current_png is not None:
+            self._current_qr_image = decode_image(self.current_png.to_bytes())
+        return self._current_qr_image
+
+    @current_qr_image.setter
+    def current_qr_image(self, image):
+        self._current_qr_image = image
 
     def download_qr(self, event):
         """Download QR code with custom filename and multiple formats"""
@@ -1147,15 +1067,15 @@ class EnhancedQRGenerator:
                 mime_type = "image/png"
 
             # Create download for raster formats
-            img_data = base64.b64encode(img_buffer.getvalue()).decode()
-            data_url = f"data:{mime_type};base64,{img_data}"
+            url = self.make_object_url(img_buffer.getvalue(), mime_type)
 
             link = document.createElement("a")
-            link.href = data_url
+            link.href = url
             link.download = f"{filename}.{file_format.lower()}"
             document.body.appendChild(link)
             link.click()
             document.body.removeChild(link)
+            URL.revokeObjectURL(url)
 
             self.show_status(f"✅ {file_format.upper()} QR code downloaded!", "success")
 
@@ -1164,163 +1084,20 @@ class EnhancedQRGenerator:
             self.show_status(f"❌ Download failed: {str(e)}", "error")
 
     def generate_svg_qr(self):
-        """Generate SVG version of current QR code - WITH THEME, MASK AND OVERLAY SUPPORT"""
+        """Generate a vector SVG of the current QR code - themes, masks and logo included"""
         try:
-            # Get current content
-            content = self.current_content
-            if not content:
+            if not self.current_content:
                 return None
 
-            # Import SVG factory
-            from qrcode.image.svg import SvgPathImage
-
-            # Get current settings
-            border = int(self.get_element_value("qr-border") or 1)
-
-            # Get error correction
-            error_radios = document.querySelectorAll('input[name="error-correction"]')
-            error_level = "Q"
-            for radio in error_radios:
-                if radio.checked:
-                    error_level = radio.value
-                    break
-
-            error_levels = {
-                "L": qrcode.constants.ERROR_CORRECT_L,
-                "M": qrcode.constants.ERROR_CORRECT_M,
-                "Q": qrcode.constants.ERROR_CORRECT_Q,
-                "H": qrcode.constants.ERROR_CORRECT_H,
-            }
-
-            # Create QR code for SVG with larger box_size for better quality
-            qr = qrcode.QRCode(
-                version=1,
-                error_correction=error_levels.get(
-                    error_level, qrcode.constants.ERROR_CORRECT_Q
-                ),
-                box_size=20,
-                border=border,
-            )
-
-            qr.add_data(content)
-            qr.make(fit=True)
-
-            theme_select = document.getElementById("theme-select")
-            mask_select = document.getElementById("color-mask-select")
-            use_overlay = document.getElementById("use-image-overlay")
-
-            has_complex_styles = False
-
-            # Sprawdź theme
-            if theme_select and theme_select.value != "classic":
-                has_complex_styles = True
-
-            # Sprawdź mask
-            if mask_select and mask_select.value not in ["solid"]:
-                has_complex_styles = True
-
-            # Sprawdź overlay
-            if use_overlay and use_overlay.checked and self.overlay_image:
-                has_complex_styles = True
-
-            if has_complex_styles:
-                # console.log("Complex styles detected - generating PNG-based SVG")
-
-                # Użyj obecnego PNG QR z wszystkimi stylami
-                if self.current_qr_image:
-                    # Konwertuj PNG na SVG (embedded)
-                    img_buffer = io.BytesIO()
-                    self.current_qr_image.save(img_buffer, format="PNG")
-                    img_data = base64.b64encode(img_buffer.getvalue()).decode()
-
-                    # Utwórz SVG z embedded PNG
-                    qr_size = self.current_qr_image.size[0]
-                    svg_data = f"""<?xml version="1.0" encoding="UTF-8"?>
-    <svg width="100%" height="100%" viewBox="0 0 {qr_size} {qr_size}" 
-        preserveAspectRatio="xMidYMid meet" xmlns="http://www.w3.org/2000/svg">
-    <image x="0" y="0" width="{qr_size}" height="{qr_size}" 
-            href="data:image/png;base64,{img_data}"/>
-    </svg>"""
-                    return svg_data
-                else:
-                    # console.log("No current QR image available")
-                    return None
-
-            # console.log("Simple styles - generating native SVG")
-
-            # Generate SVG - FIXED: Handle both bytes and string output
-            img = qr.make_image(image_factory=SvgPathImage)
-
-            # Get SVG data - try multiple methods
-            svg_data = None
-
-            # Method 1: Try to get string directly
-            try:
-                if hasattr(img, "to_string"):
-                    svg_data = img.to_string()
-                    if isinstance(svg_data, bytes):
-                        svg_data = svg_data.decode("utf-8")
-            except:
-                pass
-
-            # Method 2: Try BytesIO and decode
-            if not svg_data:
-                try:
-                    svg_buffer = io.BytesIO()
-                    img.save(svg_buffer)
-                    svg_bytes = svg_buffer.getvalue()
-                    svg_data = svg_bytes.decode("utf-8")
-                except:
-                    pass
-
-            # Method 3: Try StringIO (fallback)
-            if not svg_data:
-                try:
-                    svg_buffer = io.StringIO()
-                    img.save(svg_buffer)
-                    svg_data = svg_buffer.getvalue()
-                except:
-                    pass
-
-            if not svg_data:
-                # console.log("Failed to extract SVG data")
+            settings = self.collect_settings()
+            if settings is None:
                 return None
 
-            import re
+            qr = make_qr(settings)
+            overlay = self.overlay_image if settings["use_image"] else None
+            mask = self.mask_image if settings["color_mask"] == "image" else None
 
-            # Usunięcie atrybutów width i height z tagu <svg>
-            svg_data = re.sub(r'\s*width="[^"]*"', "", svg_data)
-            svg_data = re.sub(r'\s*height="[^"]*"', "", svg_data)
-
-            # Dodanie atrybutów pozwalających na skalowanie
-            svg_data = re.sub(
-                r"<svg([^>]*?)>",
-                r'<svg\1 width="100%" height="100%" preserveAspectRatio="xMidYMid meet">',
-                svg_data,
-            )
-
-            # Apply colors to SVG
-            fg_color = self.get_element_value("fg-color") or "#000000"
-            bg_color = self.get_element_value("bg-color") or "#ffffff"
-
-            # Simple color replacement in SVG
-            svg_data = svg_data.replace('fill="black"', f'fill="{fg_color}"')
-            svg_data = svg_data.replace('fill="#000000"', f'fill="{fg_color}"')
-            svg_data = svg_data.replace('fill="#000"', f'fill="{fg_color}"')
-
-            if bg_color.lower() not in ["#ffffff", "#fff", "white"]:
-                # Znajdź tag <svg> i dodaj rect jako tło
-                viewbox_match = re.search(r'viewBox="([^"]*)"', svg_data)
-                if viewbox_match:
-                    viewbox = viewbox_match.group(1)
-                    coords = viewbox.split()
-                    if len(coords) >= 4:
-                        width, height = coords[2], coords[3]
-                        bg_rect = f'<rect x="0" y="0" width="{width}" height="{height}" fill="{bg_color}"/>'
-                        # Wstaw rect zaraz po tagu <svg>
-                        svg_data = re.sub(r"(<svg[^>]*>)", r"\1" + bg_rect, svg_data)
-
-            return svg_data
+            return render_svg(qr.modules, settings["border"], settings, overlay, mask)
 
         except Exception as e:
             console.log(f"SVG generation error: {e}")
@@ -1334,20 +1111,13 @@ class EnhancedQRGenerator:
 
         try:
             from pyodide.ffi import to_js
-            from js import Uint8Array, ClipboardItem, Object
-
-            # Convert image to PNG blob
-            img_buffer = io.BytesIO()
-            self.current_qr_image.save(img_buffer, format="PNG")
-            img_data = img_buffer.getvalue()
+            from js import ClipboardItem, Object
 
-            # Create Uint8Array
-            uint8_array = Uint8Array.new(len(img_data))
-            for i, byte in enumerate(img_data):
-                uint8_array[i] = byte
-
-            # Create Blob
-            blob = Blob.new([uint8_array], to_js({"type": "image/png"}))
+            # The displayed PNG is already a Uint8Array
+            blob = Blob.new(
+                to_js([self.current_png]),
+                to_js({"type": "image/png"}, dict_converter=Object.fromEntries),
+            )
             # console.log(f"{blob.type = }")
 
             # Check if clipboard API is available
@@ -1650,6 +1420,9 @@ class EnhancedQRGenerator:
                 "bg_color": self.get_element_value("bg-color"),
                 "error_correction": self.get_checked_radio("error-correction"),
                 "use_image": document.getElementById("use-image-overlay").checked,
+                "render_mode": (
+                    "exact" if document.getElementById("exact-size").checked else "resample"
+                ),
                 "image_size": self.get_element_value("image-size"),
                 "image_bg": self.get_checked_radio("image-bg"),
                 "image_bg_color": self.get_element_value("image-bg-color"),
@@ -1756,6 +1529,11 @@ class EnhancedQRGenerator:
                     # Trigger change event
                     self.on_checkbox_change(type("Event", (), {"target": element})())
 
+            if "render_mode" in config:
+                element = document.getElementById("exact-size")
+                if element:
+                    element.checked = config["render_mode"] == "exact"
+
             # Update displays
             self.update_all_displays()
 
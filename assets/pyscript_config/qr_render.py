@@ -0,0 +1,324 @@
+"""
+QR rendering for the PyScript front end
+Pure PIL/qrcode code with no DOM access, shared by the main thread and the
+render worker (qr_worker.py)
+"""
+
+import qrcode
+from qrcode.image.styledpil import StyledPilImage
+from qrcode.image.styles.moduledrawers import (
+    SquareModuleDrawer,
+    GappedSquareModuleDrawer,
+    CircleModuleDrawer,
+    RoundedModuleDrawer,
+    VerticalBarsDrawer,
+    HorizontalBarsDrawer,
+)
+from qrcode.image.styles.colormasks import (
+    SolidFillColorMask,
+    RadialGradiantColorMask,
+    SquareGradiantColorMask,
+    HorizontalGradiantColorMask,
+    VerticalGradiantColorMask,
+    ImageColorMask,
+)
+from PIL import Image
+import io
+import time
+
+ERROR_LEVELS = {
+    "L": qrcode.constants.ERROR_CORRECT_L,
+    "M": qrcode.constants.ERROR_CORRECT_M,
+    "Q": qrcode.constants.ERROR_CORRECT_Q,
+    "H": qrcode.constants.ERROR_CORRECT_H,
+}
+
+
+def hex_to_rgb(hex_color):
+    """Convert hex color to RGB tuple"""
+    hex_color = hex_color.lstrip("#")
+    if len(hex_color) == 3:
+        hex_color = "".join(c * 2 for c in hex_color)
+    try:
+        return tuple(int(hex_color[i : i + 2], 16) for i in (0, 2, 4))
+    except:
+        return (0, 0, 0)
+
+
+def mix_colors(color1, color2, weight=0.5):
+    """Mix two RGB colors"""
+    return tuple(int(c1 * (1 - weight) + c2 * weight) for c1, c2 in zip(color1, color2))
+
+
+def get_color_mask(settings, mask_image=None):
+    """Get appropriate color mask"""
+    mask_type = settings.get("color_mask")
+    if not mask_type:
+        # Fallback when no mask select element
+        return SolidFillColorMask(front_color=(0, 0, 0), back_color=(255, 255, 255))
+
+    fg_color = hex_to_rgb(settings["fg_color"])
+    bg_color = hex_to_rgb(settings["bg_color"])
+
+    try:
+        if mask_type == "solid":
+            return SolidFillColorMask(front_color=fg_color, back_color=bg_color)
+
+        elif mask_type == "radial":
+            middle_color = mix_colors(fg_color, bg_color)
+            return RadialGradiantColorMask(
+                back_color=bg_color, center_color=middle_color, edge_color=fg_color
+            )
+
+        elif mask_type == "square":
+            middle_color = mix_colors(fg_color, bg_color)
+            return SquareGradiantColorMask(
+                back_color=bg_color, center_color=middle_color, edge_color=fg_color
+            )
+
+        elif mask_type == "horizontal":
+            middle_color = mix_colors(fg_color, bg_color)
+            return HorizontalGradiantColorMask(
+                back_color=bg_color, left_color=middle_color, right_color=fg_color
+            )
+
+        elif mask_type == "vertical":
+            middle_color = mix_colors(fg_color, bg_color)
+            return VerticalGradiantColorMask(
+                back_color=bg_color, top_color=middle_color, bottom_color=fg_color
+            )
+
+        elif mask_type == "image" and mask_image:
+            try:
+                return ImageColorMask(back_color=bg_color, color_mask_image=mask_image)
+            except Exception as e:
+                print(f"Image mask error: {e}")
+                # Fallback to solid when image mask fails
+                return SolidFillColorMask(front_color=fg_color, back_color=bg_color)
+
+        # Fallback for unknown mask types
+        return SolidFillColorMask(front_color=fg_color, back_color=bg_color)
+
+    except Exception as e:
+        print(f"Color mask error: {e}")
+        # Fallback for any other errors
+        return SolidFillColorMask(front_color=(0, 0, 0), back_color=(255, 255, 255))
+
+
+def get_module_drawer(theme):
+    """Get appropriate module drawer"""
+    if theme == "rounded":
+        return RoundedModuleDrawer()
+    elif theme == "circular":
+        return CircleModuleDrawer()
+    elif theme == "gapped":
+        try:
+            # from decimal import Decimal
+            # return GappedSquareModuleDrawer(size_ratio=0.8)
+            return GappedSquareModuleDrawer()
+        except:
+            return SquareModuleDrawer()
+    elif theme == "vertical_bars":
+        return VerticalBarsDrawer()
+    elif theme == "horizontal_bars":
+        return HorizontalBarsDrawer()
+    else:
+        # These would need to be implemented or imported
+        return None
+
+
+def add_image_overlay(qr_img, overlay_image, settings):
+    """Add image overlay to QR code"""
+    if not overlay_image:
+        return qr_img
+
+    try:
+        size_percent = settings["image_size"]
+        padding = settings["image_padding"]
+        bg_type = settings["image_bg"]
+
+        # Calculate overlay size
+        qr_size = qr_img.size[0]
+        overlay_size = int(qr_size * size_percent / 100)
+
+        # Resize overlay maintaining aspect ratio
+        overlay = overlay_image.copy()
+        overlay.thumbnail((overlay_size, overlay_size), Image.Resampling.LANCZOS)
+
+        # Handle rectangular background properly
+        final_overlay = overlay  # This will be the final overlay to paste
+
+        # Create background if needed
+        if bg_type in ["match", "custom"]:
+            # Calculate both width and height for rectangular background
+            bg_width = overlay.size[0] + 2 * padding
+            bg_height = overlay.size[1] + 2 * padding
+
+            if bg_type == "match":
+                bg_color = settings["bg_color"]
+            else:
+                bg_color = settings["image_bg_color"]
+
+            # Create rectangular background instead of square
+            background = Image.new("RGB", (bg_width, bg_height), bg_color)
+
+            # Center the overlay image on the rectangular background
+            overlay_x = (bg_width - overlay.size[0]) // 2
+            overlay_y = (bg_height - overlay.size[1]) // 2
+
+            # Handle transparency
+            if overlay.mode in ("RGBA", "LA") or (
+                overlay.mode == "P" and "transparency" in overlay.info
+            ):
+                background.paste(overlay, (overlay_x, overlay_y), overlay)
+            else:
+                background.paste(overlay, (overlay_x, overlay_y))
+
+            final_overlay = background
+
+        # Convert images for transparency support
+        if final_overlay.mode != "RGBA":
+            final_overlay = final_overlay.convert("RGBA")
+
+        qr_img = qr_img.convert("RGBA")
+
+        # Calculate position to center the final overlay (which might be rectangular)
+        overlay_pos = (
+            (qr_size - final_overlay.size[0]) // 2,
+            (qr_size - final_overlay.size[1]) // 2,
+        )
+
+        # Paste overlay
+        qr_img.paste(final_overlay, overlay_pos, final_overlay)
+
+        return qr_img.convert("RGB")
+
+    except Exception as e:
+        print(f"Overlay error: {e}")
+        return qr_img
+
+
+def exact_box_size(modules_count, border, target_size):
+    """Largest box size at which the code (with border) fits in target_size"""
+    return max(1, int(target_size) // (modules_count + 2 * border))
+
+
+def fit_to_size(image, target_size, fill):
+    """Center-pad (or crop) a rendered code to target_size without resampling"""
+    if hasattr(image, "get_image"):
+        image = image.get_image()
+
+    width = image.size[0]
+    if width == target_size:
+        return image
+    if width > target_size:
+        offset = (width - target_size) // 2
+        return image.crop((offset, offset, offset + target_size, offset + target_size))
+
+    canvas = Image.new(image.mode, (target_size, target_size), fill)
+    offset = (target_size - width) // 2
+    canvas.paste(image, (offset, offset))
+    return canvas
+
+
+def make_qr(settings):
+    """Encode the settings' content into a QRCode (modules computed)"""
+    qr = qrcode.QRCode(
+        version=1,
+        error_correction=ERROR_LEVELS.get(
+            settings["error_correction"], qrcode.constants.ERROR_CORRECT_Q
+        ),
+        box_size=10,
+        border=settings["border"],
+    )
+
+    qr.add_data(settings["content"])
+    qr.make(fit=True)
+    return qr
+
+
+def render_qr(settings, overlay_image=None, mask_image=None):
+    """Render a QR code from a settings dict (see collect_settings)"""
+    size = settings["size"]
+    border = settings["border"]
+    fg_color = settings["fg_color"]
+    bg_color = settings["bg_color"]
+
+    # Create QR code
+    qr = make_qr(settings)
+
+    # Pick the box size up front so the image comes out at target size
+    exact_size = settings["exact_size"]
+    if exact_size:
+        qr.box_size = exact_box_size(qr.modules_count, border, size)
+
+    # Get styling with fallback
+    try:
+        color_mask = get_color_mask(settings, mask_image)
+        module_drawer = get_module_drawer(settings["theme"])
+
+    except Exception as e:
+        print(f"Style error: {e}")
+        color_mask = None
+        module_drawer = None
+
+    # Generate image with safe fallback
+    try:
+        if module_drawer or color_mask:
+            qr_img = qr.make_image(
+                image_factory=StyledPilImage,
+                module_drawer=module_drawer,
+                color_mask=color_mask,
+                fill_color=fg_color,
+                back_color=bg_color,
+            )
+        else:
+            qr_img = qr.make_image(fill_color=fg_color, back_color=bg_color)
+    except Exception as e:
+        print(f"QR styling error: {e}, falling back to basic QR")
+        # Fallback to basic QR if styled generation fails
+        qr_img = qr.make_image(fill_color=fg_color, back_color=bg_color)
+
+    # Bring to target size
+    if exact_size:
+        qr_img = fit_to_size(qr_img, size, bg_color)
+    else:
+        qr_img = qr_img.resize((size, size), Image.Resampling.LANCZOS)
+
+    # Add image overlay if enabled
+    if settings["use_image"]:
+        qr_img = add_image_overlay(qr_img, overlay_image, settings)
+
+    return qr_img
+
+
+def encode_png(image):
+    """PNG bytes of a rendered code"""
+    img_buffer = io.BytesIO()
+    image.save(img_buffer, format="PNG")
+    return img_buffer.getvalue()
+
+
+def render_png(settings, overlay_image=None, mask_image=None):
+    """Render and PNG-encode, timing both steps
+
+    Returns ``(image, png_bytes, timings)`` with timings in milliseconds.
+    """
+    started = time.perf_counter()
+    image = render_qr(settings, overlay_image, mask_image)
+    rendered = time.perf_counter()
+    png = encode_png(image)
+    encoded = time.perf_counter()
+
+    timings = {
+        "render_ms": (rendered - started) * 1000,
+        "encode_ms": (encoded - rendered) * 1000,
+    }
+    return image, png, timings
+
+
+def decode_image(data):
+    """Decode image bytes into a loaded PIL image"""
+    image = Image.open(io.BytesIO(data))
+    image.load()
+    return image
@@ -0,0 +1,50 @@
+"""
+QR render worker for the PyScript front end
+Runs in a Pyodide Web Worker so rendering and PNG encoding never block
+the page. The main thread talks to it through the exported functions below.
+"""
+
+import base64
+import json
+
+from js import Object
+from pyodide.ffi import to_js
+
+from qr_render import render_png, decode_image
+
+# Overlay / mask images sent by the main thread, keyed by kind
+assets = {}
+
+
+def set_asset(kind, data_b64):
+    """Store (or clear, with an empty string) the overlay or mask image"""
+    if data_b64:
+        assets[kind] = decode_image(base64.b64decode(data_b64))
+    else:
+        assets.pop(kind, None)
+    return True
+
+
+def render(request_json):
+    """Render one request and reply with the PNG as a Uint8Array
+
+    The request carries an ``id`` that is echoed back so the main thread can
+    drop replies to requests it has already superseded. The reply is a plain
+    JS object, so the PNG crosses to the page as raw bytes (no base64).
+    """
+    request = json.loads(request_json)
+    reply = {"id": request["id"]}
+    try:
+        _, png, timings = render_png(
+            request["settings"],
+            overlay_image=assets.get("overlay"),
+            mask_image=assets.get("mask"),
+        )
+        reply["png"] = to_js(png)
+        reply.update(timings)
+    except Exception as e:
+        reply["error"] = str(e)
+    return to_js(reply, dict_converter=Object.fromEntries)
+
+
+__export__ = ["set_asset", "render"]
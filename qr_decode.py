@@ -0,0 +1,386 @@
+#!/usr/bin/env python3
+"""
+QR Decoding Cascade
+Preprocessing shared by the GUI scanner and QRScanner: image variants are
+built lazily, cheapest first, and decoding stops at the first one that reads.
+Large photos can be decoded coarse-to-fine with PyramidDecoder. Codes are
+read by a pluggable backend - zbar (pyzbar) or OpenCV's QRCodeDetector.
+"""
+
+import time
+from collections import Counter, defaultdict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+try:
+    import cv2
+    import numpy as np
+
+    CV2_AVAILABLE = True
+except ImportError:
+    CV2_AVAILABLE = False
+
+
+def _original(gray):
+    return gray
+
+
+def _otsu(gray):
+    return cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)[1]
+
+
+def _blur(gray):
+    return cv2.GaussianBlur(gray, (5, 5), 0)
+
+
+def _adaptive(gray):
+    return cv2.adaptiveThreshold(
+        gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 11, 2
+    )
+
+
+# Variants of the grayscale image, in cost order (on a 12 MP image Otsu costs
+# about as much as the gray conversion itself, the blur twice that and the
+# adaptive threshold about nine times)
+PREPROCESS_VARIANTS = {
+    'original': _original,
+    'otsu': _otsu,
+    'blur': _blur,
+    'adaptive': _adaptive,
+}
+PREPROCESS_STAGES = tuple(PREPROCESS_VARIANTS)
+
+PREPROCESS_LABELS = {
+    'original': 'Original',
+    'otsu': 'Otsu threshold',
+    'blur': 'Gaussian blur',
+    'adaptive': 'Adaptive threshold',
+}
+
+# Pyramid decoding: the coarse pass sees the image shrunk to this long side
+PYRAMID_COARSE_SIDE = 1500
+# Candidate regions re-decoded at full resolution per image, largest first
+PYRAMID_MAX_CANDIDATES = 16
+# Smallest candidate side in coarse pixels
+PYRAMID_MIN_CANDIDATE = 12
+# Margin cropped around each candidate, as a fraction of its longer side
+PYRAMID_MARGIN = 0.25
+
+# Decoder backends, fastest first; 'auto' picks the first one available
+DECODER_BACKENDS = ('zbar', 'opencv')
+
+
+def to_gray(image):
+    """Grayscale view of an OpenCV image (BGR, BGRA or already gray)"""
+    if image.ndim == 2:
+        return image
+    if image.shape[2] == 4:
+        return cv2.cvtColor(image, cv2.COLOR_BGRA2GRAY)
+    return cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+
+
+def _result(content: str, code_type: str, x, y, width, height) -> Dict[str, Any]:
+    """A decoded code in QRScanner's result shape"""
+    return {
+        'content': content,
+        'type': code_type,
+        'quality': 'good' if len(content) > 0 else 'poor',
+        'position': {'x': int(x), 'y': int(y), 'width': int(width), 'height': int(height)},
+    }
+
+
+class ZbarBackend:
+    """pyzbar - needs the zbar shared library; fastest when installed"""
+
+    name = 'zbar'
+
+    @staticmethod
+    def available() -> bool:
+        try:
+            from pyzbar import pyzbar  # noqa: F401
+
+            return True
+        except ImportError:
+            return False
+
+    def __init__(self):
+        from pyzbar import pyzbar
+
+        self.zbar_decode = pyzbar.decode
+
+    def decode(self, image) -> List[Dict[str, Any]]:
+        results = []
+        for obj in self.zbar_decode(image):
+            try:
+                content = obj.data.decode('utf-8')
+            except UnicodeDecodeError:
+                content = f"[Binary data: {len(obj.data)} bytes]"
+            rect = obj.rect
+            results.append(
+                _result(content, obj.type, rect.left, rect.top, rect.width, rect.height)
+            )
+        return results
+
+
+class OpenCVBackend:
+    """cv2.QRCodeDetector - no dependencies beyond opencv-python-headless
+
+    detectAndDecodeMulti finds and decodes every code in one call. Codes it
+    locates but cannot read come back empty and are skipped.
+    """
+
+    name = 'opencv'
+
+    @staticmethod
+    def available() -> bool:
+        return CV2_AVAILABLE and hasattr(cv2.QRCodeDetector, 'detectAndDecodeMulti')
+
+    def __init__(self):
+        self.detector = cv2.QRCodeDetector()
+
+    def decode(self, image) -> List[Dict[str, Any]]:
+        if image.ndim == 3 and image.shape[2] == 4:
+            image = to_gray(image)
+        found, contents, corners, _ = self.detector.detectAndDecodeMulti(image)
+        if not found:
+            return []
+        results = []
+        for content, points in zip(contents, corners):
+            if content:
+                x, y, width, height = cv2.boundingRect(points.astype(np.float32))
+                results.append(_result(content, 'QRCODE', x, y, width, height))
+        return results
+
+
+BACKEND_CLASSES = {'zbar': ZbarBackend, 'opencv': OpenCVBackend}
+
+
+def available_backends() -> List[str]:
+    """Names of the backends that can run here, fastest first"""
+    return [name for name in DECODER_BACKENDS if BACKEND_CLASSES[name].available()]
+
+
+def create_backend(name: str = 'auto'):
+    """Backend instance for ``name`` ('auto' = fastest available)
+
+    Returns None when the backend (or, for 'auto', every backend) is not
+    available.
+    """
+    if name == 'auto':
+        names = available_backends()
+        return BACKEND_CLASSES[names[0]]() if names else None
+    if name not in BACKEND_CLASSES:
+        raise ValueError(f"Unknown decoder backend: {name}")
+    return BACKEND_CLASSES[name]() if BACKEND_CLASSES[name].available() else None
+
+
+class DecodeStats:
+    """Which cascade stage decoded each image, and what every stage cost
+
+    ``attempts`` counts images a stage was tried on, ``hits`` the images it
+    decoded and ``seconds`` the preprocessing + decoding time spent in it.
+    """
+
+    def __init__(self):
+        self.attempts = Counter()
+        self.hits = Counter()
+        self.seconds = defaultdict(float)
+        self.images = 0
+        self.misses = 0
+
+    def record(self, stage_seconds: Dict[str, float], stage: Optional[str]) -> None:
+        """Add one image: time per stage tried and the stage that decoded it"""
+        self.images += 1
+        for name, seconds in stage_seconds.items():
+            self.attempts[name] += 1
+            self.seconds[name] += seconds
+        if stage is None:
+            self.misses += 1
+        else:
+            self.hits[stage] += 1
+
+    def suggested_order(self, stages: Iterable[str]) -> List[str]:
+        """``stages`` reordered by mean cost per decode, unused stages last
+
+        Stages are ranked by time spent per image they decoded, the usual
+        ordering for early-exit cascades. Later stages only see what earlier
+        ones missed, so treat it as a hint and re-check after reordering.
+        """
+
+        def expected_cost(name):
+            if not self.hits[name]:
+                return float('inf')
+            return self.seconds[name] / self.hits[name]
+
+        return sorted(stages, key=expected_cost)
+
+    def report(self, stages: Iterable[str], file=None) -> None:
+        """Print per-stage tallies and a better --preprocess order, if any"""
+        stages = list(stages)
+        print("   Preprocessing (decoded/tried, mean time):", file=file)
+        for name in stages:
+            attempts = self.attempts[name]
+            mean_ms = self.seconds[name] / attempts * 1000 if attempts else 0.0
+            print(
+                f"      {name}: {self.hits[name]}/{attempts}, {mean_ms:.1f}ms",
+                file=file,
+            )
+        suggested = self.suggested_order(stages)
+        if self.hits and suggested != stages:
+            print(f"   Suggested --preprocess order: {' '.join(suggested)}", file=file)
+
+
+class CascadeDecoder:
+    """Try ``decode`` on preprocessed variants of an image until one reads
+
+    ``decode`` takes an OpenCV image and returns a (possibly empty) list of
+    results - a backend's decode or QRScanner.decode_image. Only the grayscale
+    conversion is shared; every other variant is built when its stage is
+    reached. Each call is recorded in ``stats``.
+    """
+
+    def __init__(
+        self,
+        decode: Callable[[Any], List[Any]],
+        stages: Iterable[str] = PREPROCESS_STAGES,
+        stats: DecodeStats = None,
+    ):
+        self.stages = tuple(stages)
+        if not self.stages:
+            raise ValueError("At least one preprocessing stage is required")
+        unknown = [name for name in self.stages if name not in PREPROCESS_VARIANTS]
+        if unknown:
+            raise ValueError(f"Unknown preprocessing stages: {', '.join(unknown)}")
+        self.decode_variant = decode
+        self.stats = stats if stats is not None else DecodeStats()
+
+    def decode(self, image) -> Tuple[List[Any], Optional[str], Dict[str, float]]:
+        """Returns ``(results, stage, stage_seconds)``
+
+        ``stage`` is the stage that decoded the image (None when none did),
+        ``stage_seconds`` the time spent in each stage that was tried.
+        """
+        stage_seconds = {}
+        gray = None
+        for name in self.stages:
+            start = time.perf_counter()
+            if gray is None:
+                gray = to_gray(image)
+            results = self.decode_variant(PREPROCESS_VARIANTS[name](gray))
+            stage_seconds[name] = time.perf_counter() - start
+            if results:
+                self.stats.record(stage_seconds, name)
+                return results, name, stage_seconds
+        self.stats.record(stage_seconds, None)
+        return [], None, stage_seconds
+
+
+def locate_candidates(
+    gray, min_side: int = PYRAMID_MIN_CANDIDATE, limit: int = PYRAMID_MAX_CANDIDATES
+) -> List[Tuple[int, int, int, int]]:
+    """``(x, y, width, height)`` boxes of dense, roughly square edge texture
+
+    QR modules make a block of strong edges; a morphological gradient,
+    thresholded and closed, turns each code into one solid blob. Blobs that
+    are too small, too elongated or too sparse are dropped; the rest are
+    returned largest first.
+    """
+    kernel = np.ones((3, 3), np.uint8)
+    gradient = cv2.morphologyEx(gray, cv2.MORPH_GRADIENT, kernel)
+    _, mask = cv2.threshold(gradient, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    blob_kernel = np.ones((5, 5), np.uint8)
+    mask = cv2.morphologyEx(mask, cv2.MORPH_CLOSE, blob_kernel)
+    mask = cv2.morphologyEx(mask, cv2.MORPH_OPEN, blob_kernel)
+
+    _, _, blobs, _ = cv2.connectedComponentsWithStats(mask)
+    boxes = []
+    for x, y, width, height, area in blobs[1:]:
+        if width < min_side or height < min_side:
+            continue
+        if not 0.5 < width / height < 2 or area < 0.5 * width * height:
+            continue
+        boxes.append((int(area), (int(x), int(y), int(width), int(height))))
+    boxes.sort(key=lambda box: box[0], reverse=True)
+    return [box for _, box in boxes[:limit]]
+
+
+def _covers(position: Dict[str, int], x: float, y: float) -> bool:
+    return (
+        position['x'] <= x <= position['x'] + position['width']
+        and position['y'] <= y <= position['y'] + position['height']
+    )
+
+
+class PyramidDecoder:
+    """Coarse-to-fine decoding for large images
+
+    The image is shrunk so its long side is ``coarse_side`` and decoded once.
+    Regions that look like codes in the small image (``locate_candidates``)
+    are then cropped from the full-resolution image and decoded on their
+    own, so small codes keep their native detail while the decoder never
+    scans the whole photo at full size. Images already within
+    ``coarse_side`` are decoded directly.
+
+    ``decode`` must return QRScanner-style result dicts; their ``position``
+    is mapped back to full-resolution coordinates.
+    """
+
+    def __init__(
+        self,
+        decode: Callable[[Any], List[Dict[str, Any]]],
+        coarse_side: int = PYRAMID_COARSE_SIDE,
+        max_candidates: int = PYRAMID_MAX_CANDIDATES,
+    ):
+        self.decode_region = decode
+        self.coarse_side = coarse_side
+        self.max_candidates = max_candidates
+
+    def decode(self, image) -> List[Dict[str, Any]]:
+        height, width = image.shape[:2]
+        scale = self.coarse_side / max(height, width)
+        if scale >= 1:
+            return self.decode_region(image)
+
+        coarse = cv2.resize(image, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        results = [
+            self._placed(result, 1 / scale, 0, 0) for result in self.decode_region(coarse)
+        ]
+
+        coarse_gray = to_gray(coarse)
+        for x, y, box_width, box_height in locate_candidates(
+            coarse_gray, limit=self.max_candidates
+        ):
+            center_x = (x + box_width / 2) / scale
+            center_y = (y + box_height / 2) / scale
+            if any(_covers(result['position'], center_x, center_y) for result in results):
+                continue
+
+            margin = max(box_width, box_height) * PYRAMID_MARGIN
+            left = max(0, int((x - margin) / scale))
+            top = max(0, int((y - margin) / scale))
+            right = min(width, int((x + box_width + margin) / scale) + 1)
+            bottom = min(height, int((y + box_height + margin) / scale) + 1)
+
+            for result in self.decode_region(image[top:bottom, left:right]):
+                result = self._placed(result, 1, left, top)
+                position = result['position']
+                middle_x = position['x'] + position['width'] / 2
+                middle_y = position['y'] + position['height'] / 2
+                if not any(
+                    known['content'] == result['content']
+                    and _covers(known['position'], middle_x, middle_y)
+                    for known in results
+                ):
+                    results.append(result)
+        return results
+
+    @staticmethod
+    def _placed(result: Dict[str, Any], scale: float, left: int, top: int):
+        """``result`` with its position scaled and offset into the full image"""
+        position = result['position']
+        result['position'] = {
+            'x': int(position['x'] * scale) + left,
+            'y': int(position['y'] * scale) + top,
+            'width': int(position['width'] * scale),
+            'height': int(position['height'] * scale),
+        }
+        return result
@@ -6,7 +6,6 @@ Fixes for color application, image mask loading, and config loading issues.
 
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, colorchooser
-import qrcode
 from qrcode.image.styledpil import StyledPilImage
 from qrcode.image.styles.moduledrawers import (
     RoundedModuleDrawer,
@@ -46,6 +45,19 @@ except ImportError:
         COLOR_MASKS_AVAILABLE = False
         IMAGE_COLOR_MASK_AVAILABLE = False
 
+# Vectorized drop-in replacements for the color masks (NumPy)
+try:
+    from qr_masks import (
+        FastSolidFillColorMask as SolidFillColorMask,
+        FastSquareGradiantColorMask as SquareGradiantColorMask,
+        FastRadialGradiantColorMask as RadialGradiantColorMask,
+        FastHorizontalGradiantColorMask as HorizontalGradiantColorMask,
+        FastVerticalGradiantColorMask as VerticalGradiantColorMask,
+        FastImageColorMask as ImageColorMask,
+    )
+except ImportError:
+    pass
+
 try:
     from qrcode.image.styles.moduledrawers import (
         VerticalBarsDrawer,
@@ -65,9 +77,13 @@ import subprocess
 import platform
 import tempfile
 import io
+import queue
+import threading
 import urllib.request
 import urllib.parse
 
+from qr_utils import encode_qr, exact_box_size, fit_to_size
+
 # Clipboard handling with better cross-platform support
 try:
     import pyperclip
@@ -76,16 +92,106 @@ try:
 except ImportError:
     CLIPBOARD_AVAILABLE = False
 
-# Scanning support
+# Scanning support - OpenCV decodes on its own, pyzbar + zbar is used when present
 try:
     import cv2
-    import pyzbar
 
     SCANNING_AVAILABLE = True
 except ImportError:
     SCANNING_AVAILABLE = False
 
 
+# Preview rendering
+RENDER_DEBOUNCE_MS = 150
+RENDER_POLL_MS = 15
+PREVIEW_SIZE = 400
+
+
+class RenderCancelled(Exception):
+    """Raised inside a render once a newer request has superseded it"""
+
+
+class RenderScheduler:
+    """Debounced, latest-wins background rendering for the Tk preview
+
+    Requests arriving within ``debounce_ms`` of each other collapse into one
+    render. Settings are snapshotted on the main thread, rendering happens on
+    a worker thread, and only the result of the newest request is delivered
+    back (via ``root.after``) - stale renders are dropped, and abandoned at
+    the next ``check_cancelled()`` checkpoint. At most one render runs at a
+    time; a request made meanwhile waits as the single pending job.
+    """
+
+    def __init__(self, root, snapshot, render, deliver, debounce_ms=RENDER_DEBOUNCE_MS):
+        self.root = root
+        self.snapshot = snapshot
+        self.render = render
+        self.deliver = deliver
+        self.debounce_ms = debounce_ms
+
+        self._after_id = None
+        self._generation = 0
+        self._running = False
+        self._pending = None
+        self._results = queue.Queue()
+
+    def request(self, delay_ms=None):
+        """Ask for a render after ``delay_ms`` (default: the debounce delay)"""
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+        # Anything already in flight is now stale
+        self._generation += 1
+        delay = self.debounce_ms if delay_ms is None else delay_ms
+        self._after_id = self.root.after(delay, self._fire)
+
+    def _fire(self):
+        self._after_id = None
+        settings = self.snapshot()
+        if settings is None:
+            return
+
+        job = (self._generation, settings)
+        if self._running:
+            self._pending = job
+        else:
+            self._start(job)
+
+    def _start(self, job):
+        self._running = True
+        threading.Thread(target=self._work, args=job, daemon=True).start()
+        self.root.after(RENDER_POLL_MS, self._poll)
+
+    def _work(self, generation, settings):
+        def check_cancelled():
+            if generation != self._generation:
+                raise RenderCancelled()
+
+        result = error = None
+        try:
+            result = self.render(settings, check_cancelled)
+        except RenderCancelled:
+            pass
+        except Exception as e:
+            error = e
+        self._results.put((generation, settings, result, error))
+
+    def _poll(self):
+        try:
+            generation, settings, result, error = self._results.get_nowait()
+        except queue.Empty:
+            self.root.after(RENDER_POLL_MS, self._poll)
+            return
+
+        self._running = False
+        if generation == self._generation and (result is not None or error):
+            self.deliver(settings, result, error)
+
+        if self._pending is not None:
+            job, self._pending = self._pending, None
+            if job[0] == self._generation:
+                self._start(job)
+
+
 class QRCodeGenerator:
     def __init__(self, root: tk.Tk):
         self.root: tk.Tk = root
@@ -94,9 +200,18 @@ class QRCodeGenerator:
         self.root.configure(bg='#2b2b2b')
 
         # Initialize variables
-        self.qr_image = None
+        self.qr_image = None  # full resolution, rendered on demand
+        self.preview_qr = None  # preview resolution, what the canvas shows
+        self.preview_settings = None
         self.preview_image = None
         self.current_config = {}
+        self.scan_decoder = None  # preprocessing cascade, built on first scan
+        self.render_scheduler = RenderScheduler(
+            self.root,
+            self.collect_render_settings,
+            self.render_preview,
+            self.show_render_result,
+        )
 
         # Create the GUI
         self.create_widgets()
@@ -519,6 +634,15 @@ class QRCodeGenerator:
         self.border_label = ttk.Label(size_frame, text="1 modules")
         self.border_label.pack(anchor=tk.W)
 
+        # Render straight at the target size instead of resampling
+        self.exact_size_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            size_frame,
+            text="Pixel-exact rendering (no resampling)",
+            variable=self.exact_size_var,
+            command=self.on_style_change,
+        ).pack(anchor=tk.W, pady=(10, 0))
+
         # Error correction
         ttk.Label(size_frame, text="Error Correction:").pack(anchor=tk.W, pady=(10, 0))
         self.error_correction_var = tk.StringVar(value="Q")
@@ -723,9 +847,11 @@ class QRCodeGenerator:
         self.canvas.pack(pady=(0, 10))
 
         # Generate button
-        ttk.Button(parent, text="Generate QR Code", command=self.generate_qr).pack(
-            pady=(0, 10)
-        )
+        ttk.Button(
+            parent,
+            text="Generate QR Code",
+            command=lambda: self.generate_qr(immediate=True),
+        ).pack(pady=(0, 10))
 
         # Status label
         self.status_label = ttk.Label(parent, text="Ready to generate QR code")
@@ -1032,15 +1158,15 @@ class QRCodeGenerator:
             int(c1 * (1 - weight) + c2 * weight) for c1, c2 in zip(color1, color2)
         )
 
-    def get_color_mask(self):
+    def get_color_mask(self, settings):
         """Get color mask based on selection - FIXED VERSION"""
         if not COLOR_MASKS_AVAILABLE:
             return None
 
-        mask_type = self.color_mask_map.get(self.color_mask_var.get(), "solid")
+        mask_type = settings['color_mask']
 
-        fg_color = self.fg_color.get()
-        bg_color = self.bg_color.get()
+        fg_color = settings['fg_color']
+        bg_color = settings['bg_color']
 
         # print(f"before: {fg_color = }")
         # print(f"before: {bg_color = }")
@@ -1074,17 +1200,16 @@ class QRCodeGenerator:
         elif mask_type == "image" and IMAGE_COLOR_MASK_AVAILABLE:
             # ImageColorMask requires a background image - FIXED VERSION
             try:
-                if hasattr(self, 'mask_image_path_var'):
-                    mask_path = self.mask_image_path_var.get().strip()
-                    if mask_path:
-                        # return ImageColorMask(
-                        #     back_color=bg_color,
-                        #     color_mask_path=mask_path
-                        # )
-                        mask_image = self.load_image_from_path_or_url(mask_path)
-                        return ImageColorMask(
-                            back_color=bg_color, color_mask_image=mask_image
-                        )
+                mask_path = settings['mask_image_path']
+                if mask_path:
+                    # return ImageColorMask(
+                    #     back_color=bg_color,
+                    #     color_mask_path=mask_path
+                    # )
+                    mask_image = self.load_image_from_path_or_url(mask_path)
+                    return ImageColorMask(
+                        back_color=bg_color, color_mask_image=mask_image
+                    )
 
                 # No mask image provided, fallback to solid
                 # print("No mask image path provided, using solid fill")
@@ -1096,37 +1221,30 @@ class QRCodeGenerator:
 
         return None
 
-    def generate_qr(self):
-        """Generate QR code - FIXED VERSION with better color handling"""
+    def generate_qr(self, immediate=False):
+        """Schedule a preview render
+
+        Renders are debounced and run on a worker thread (see RenderScheduler),
+        so this is cheap to call from every keystroke and slider move.
+        """
         # Don't generate if UI isn't fully initialized yet
         if not hasattr(self, 'canvas') or not hasattr(self, 'status_label'):
             return
 
+        self.render_scheduler.request(0 if immediate else None)
+
+    def collect_render_settings(self):
+        """Snapshot every setting a render needs (main thread only)
+
+        Returns None when there is nothing to render, or when a setting
+        cannot be read (shown in the status bar, e.g. a half-typed spinbox).
+        """
         try:
             content = self.get_content_string()
             if not content:
                 self.canvas.delete("all")
                 self.status_label.config(text="No content to generate QR code")
-                return
-
-            # Error correction mapping
-            error_levels = {
-                'L': qrcode.constants.ERROR_CORRECT_L,
-                'M': qrcode.constants.ERROR_CORRECT_M,
-                'Q': qrcode.constants.ERROR_CORRECT_Q,
-                'H': qrcode.constants.ERROR_CORRECT_H,
-            }
-
-            # Create QR code instance
-            qr = qrcode.QRCode(
-                version=1,
-                error_correction=error_levels[self.error_correction_var.get()],
-                box_size=10,
-                border=self.border_var.get(),
-            )
-
-            qr.add_data(content)
-            qr.make(fit=True)
+                return None
 
             # Get colors - FIXED: Ensure valid hex colors
             fg_color = self.fg_color.get()
@@ -1140,159 +1258,251 @@ class QRCodeGenerator:
                 bg_color = "#FFFFFF"
                 self.bg_color.set(bg_color)
 
-            # Apply theme/style
-            theme = self.theme_map.get(self.theme_var.get(), "classic")
+            return {
+                'content': content,
+                'error_correction': self.error_correction_var.get(),
+                'border': self.border_var.get(),
+                'size': self.size_var.get(),
+                'exact_size': self.exact_size_var.get(),
+                'fg_color': fg_color,
+                'bg_color': bg_color,
+                'theme': self.theme_map.get(self.theme_var.get(), "classic"),
+                'color_mask': self.color_mask_map.get(self.color_mask_var.get(), "solid")
+                if hasattr(self, 'color_mask_map')
+                else "solid",
+                'mask_image_path': self.mask_image_path_var.get().strip()
+                if hasattr(self, 'mask_image_path_var')
+                else "",
+                'use_image': self.use_image_var.get(),
+                'image_path': self.image_path_var.get(),
+                'image_size': self.image_size_var.get(),
+                'image_bg': self.image_bg_var.get(),
+                'image_bg_color': self.image_bg_color.get(),
+                'image_padding': self.image_padding_var.get(),
+            }
 
-            # Get color mask
-            color_mask = self.get_color_mask()
+        except Exception as e:
+            self.status_label.config(text=f"Error: {str(e)}")
+            return None
 
-            # Generate QR image based on theme
-            if theme == "classic":
-                if color_mask:
-                    qr_img = qr.make_image(
-                        image_factory=StyledPilImage,
-                        color_mask=color_mask,
-                        fill_color=fg_color,
-                        back_color=bg_color,
-                    )
-                else:
-                    qr_img = qr.make_image(fill_color=fg_color, back_color=bg_color)
-            elif theme == "rounded":
+    def render_qr(self, settings, check_cancelled=lambda: None, size=None):
+        """Render a QR image from a settings snapshot
+
+        Touches no Tk state, so it is safe on a worker thread.
+        ``check_cancelled`` raises RenderCancelled once the render is stale;
+        ``size`` overrides the output size from the settings.
+        Returns ``(image, overlay_error)``.
+        """
+        # Encoding is cached, so style-only changes just re-render
+        qr = encode_qr(
+            settings['content'], settings['error_correction'], settings['border']
+        )
+        check_cancelled()
+
+        # Pick the box size up front so the image comes out at target size
+        target_size = size or settings['size']
+        exact_size = settings['exact_size']
+        if exact_size:
+            qr.box_size = exact_box_size(qr.modules_count, qr.border, target_size)
+
+        fg_color = settings['fg_color']
+        bg_color = settings['bg_color']
+
+        # Apply theme/style
+        theme = settings['theme']
+
+        # Get color mask
+        color_mask = self.get_color_mask(settings)
+
+        # Generate QR image based on theme
+        if theme == "classic":
+            if color_mask:
                 qr_img = qr.make_image(
                     image_factory=StyledPilImage,
-                    module_drawer=RoundedModuleDrawer(),
                     color_mask=color_mask,
                     fill_color=fg_color,
                     back_color=bg_color,
                 )
-            elif theme == "circular":
+            else:
+                qr_img = qr.make_image(fill_color=fg_color, back_color=bg_color)
+        elif theme == "rounded":
+            qr_img = qr.make_image(
+                image_factory=StyledPilImage,
+                module_drawer=RoundedModuleDrawer(),
+                color_mask=color_mask,
+                fill_color=fg_color,
+                back_color=bg_color,
+            )
+        elif theme == "circular":
+            qr_img = qr.make_image(
+                image_factory=StyledPilImage,
+                module_drawer=CircleModuleDrawer(),
+                color_mask=color_mask,
+                fill_color=fg_color,
+                back_color=bg_color,
+            )
+        elif theme == "gapped":
+            # Create gapped squares using SquareModuleDrawer with size ratio
+            try:
+                # from decimal import Decimal
+
                 qr_img = qr.make_image(
                     image_factory=StyledPilImage,
-                    module_drawer=CircleModuleDrawer(),
+                    # module_drawer=GappedSquareModuleDrawer(size_ratio=Decimal(0.8)),
+                    module_drawer=GappedSquareModuleDrawer(),
                     color_mask=color_mask,
                     fill_color=fg_color,
                     back_color=bg_color,
                 )
-            elif theme == "gapped":
-                # Create gapped squares using SquareModuleDrawer with size ratio
-                try:
-                    # from decimal import Decimal
-
-                    qr_img = qr.make_image(
-                        image_factory=StyledPilImage,
-                        # module_drawer=GappedSquareModuleDrawer(size_ratio=Decimal(0.8)),
-                        module_drawer=GappedSquareModuleDrawer(),
-                        color_mask=color_mask,
-                        fill_color=fg_color,
-                        back_color=bg_color,
-                    )
-                except:
-                    qr_img = qr.make_image(fill_color=fg_color, back_color=bg_color)
-            elif theme == "vertical_bars" and ADVANCED_DRAWERS:
-                try:
-                    qr_img = qr.make_image(
-                        image_factory=StyledPilImage,
-                        module_drawer=VerticalBarsDrawer(),
-                        color_mask=color_mask,
-                        fill_color=fg_color,
-                        back_color=bg_color,
-                    )
-                except:
-                    qr_img = qr.make_image(fill_color=fg_color, back_color=bg_color)
-            elif theme == "horizontal_bars" and ADVANCED_DRAWERS:
-                try:
-                    qr_img = qr.make_image(
-                        image_factory=StyledPilImage,
-                        module_drawer=HorizontalBarsDrawer(),
-                        color_mask=color_mask,
-                        fill_color=fg_color,
-                        back_color=bg_color,
-                    )
-                except:
-                    qr_img = qr.make_image(fill_color=fg_color, back_color=bg_color)
-            else:
+            except:
                 qr_img = qr.make_image(fill_color=fg_color, back_color=bg_color)
+        elif theme == "vertical_bars" and ADVANCED_DRAWERS:
+            try:
+                qr_img = qr.make_image(
+                    image_factory=StyledPilImage,
+                    module_drawer=VerticalBarsDrawer(),
+                    color_mask=color_mask,
+                    fill_color=fg_color,
+                    back_color=bg_color,
+                )
+            except:
+                qr_img = qr.make_image(fill_color=fg_color, back_color=bg_color)
+        elif theme == "horizontal_bars" and ADVANCED_DRAWERS:
+            try:
+                qr_img = qr.make_image(
+                    image_factory=StyledPilImage,
+                    module_drawer=HorizontalBarsDrawer(),
+                    color_mask=color_mask,
+                    fill_color=fg_color,
+                    back_color=bg_color,
+                )
+            except:
+                qr_img = qr.make_image(fill_color=fg_color, back_color=bg_color)
+        else:
+            qr_img = qr.make_image(fill_color=fg_color, back_color=bg_color)
+
+        check_cancelled()
 
-            # Resize to desired size
-            target_size = self.size_var.get()
+        # Bring to desired size
+        if exact_size:
+            qr_img = fit_to_size(qr_img, target_size, bg_color)
+        else:
             qr_img = qr_img.resize((target_size, target_size), Image.Resampling.LANCZOS)
+        check_cancelled()
 
-            # Add image overlay if enabled
-            if self.use_image_var.get() and self.image_path_var.get():
-                qr_img = self.add_image_overlay(qr_img)
+        # Add image overlay if enabled
+        overlay_error = None
+        if settings['use_image'] and settings['image_path']:
+            try:
+                qr_img = self.add_image_overlay(qr_img, settings)
+            except Exception as e:
+                overlay_error = e
 
-            self.qr_image = qr_img
+        return qr_img, overlay_error
 
-            # Update preview
-            self.update_preview()
-            self.status_label.config(text="QR code generated successfully")
+    def render_preview(self, settings, check_cancelled=lambda: None):
+        """Render straight at preview resolution for interactive edits"""
+        return self.render_qr(
+            settings, check_cancelled, size=min(PREVIEW_SIZE, settings['size'])
+        )
 
-        except Exception as e:
-            self.status_label.config(text=f"Error: {str(e)}")
-            print(f"QR Generation Error: {str(e)}")
+    def show_render_result(self, settings, result, error):
+        """Display a finished render (main thread, called by RenderScheduler)"""
+        if error is not None:
+            self.status_label.config(text=f"Error: {str(error)}")
+            print(f"QR Generation Error: {str(error)}")
+            return
 
-    def add_image_overlay(self, qr_img):
-        try:
-            # Load overlay image
-            overlay = self.load_image_from_path_or_url(self.image_path_var.get())
+        qr_img, overlay_error = result
+        self.preview_qr = qr_img
+        self.preview_settings = settings
+        # Small codes are already rendered at full size; otherwise the
+        # full-resolution image is rendered when it is first needed
+        self.qr_image = qr_img if qr_img.size[0] == settings['size'] else None
 
-            # Calculate overlay size
-            qr_size = qr_img.size[0]
-            overlay_size = int(qr_size * self.image_size_var.get() / 100)
+        # Update preview
+        self.update_preview()
+        self.status_label.config(text="QR code generated successfully")
 
-            # Resize overlay maintaining aspect ratio
-            overlay.thumbnail((overlay_size, overlay_size), Image.Resampling.LANCZOS)
+        if overlay_error is not None:
+            messagebox.showerror(
+                "Image Error", f"Failed to add image overlay: {str(overlay_error)}"
+            )
 
-            # Create background if needed
-            bg_type = self.image_bg_var.get()
-            if bg_type in ["match", "custom"]:
-                padding = self.image_padding_var.get()
-                bg_size = overlay.size[0] + 2 * padding
+    def add_image_overlay(self, qr_img, settings):
+        # Load overlay image
+        overlay = self.load_image_from_path_or_url(settings['image_path'])
 
-                if bg_type == "match":
-                    bg_color = self.bg_color.get()
-                else:  # custom
-                    bg_color = self.image_bg_color.get()
+        # Calculate overlay size
+        qr_size = qr_img.size[0]
+        overlay_size = int(qr_size * settings['image_size'] / 100)
 
-                background = Image.new('RGB', (bg_size, bg_size), bg_color)
+        # Resize overlay maintaining aspect ratio
+        overlay.thumbnail((overlay_size, overlay_size), Image.Resampling.LANCZOS)
 
-                # Handle transparency in overlay
-                if overlay.mode in ('RGBA', 'LA') or (
-                    overlay.mode == 'P' and 'transparency' in overlay.info
-                ):
-                    background.paste(overlay, (padding, padding), overlay)
-                else:
-                    background.paste(overlay, (padding, padding))
+        # Create background if needed
+        bg_type = settings['image_bg']
+        if bg_type in ["match", "custom"]:
+            padding = settings['image_padding']
+            bg_size = overlay.size[0] + 2 * padding
 
-                overlay = background
+            if bg_type == "match":
+                bg_color = settings['bg_color']
+            else:  # custom
+                bg_color = settings['image_bg_color']
 
-            # Convert to RGBA for transparency support
-            if overlay.mode != 'RGBA':
-                overlay = overlay.convert('RGBA')
+            background = Image.new('RGB', (bg_size, bg_size), bg_color)
 
-            # Paste overlay on QR code
-            qr_img = qr_img.convert('RGBA')
-            overlay_pos = (
-                (qr_size - overlay.size[0]) // 2,
-                (qr_size - overlay.size[1]) // 2,
-            )
-            qr_img.paste(overlay, overlay_pos, overlay)
+            # Handle transparency in overlay
+            if overlay.mode in ('RGBA', 'LA') or (
+                overlay.mode == 'P' and 'transparency' in overlay.info
+            ):
+                background.paste(overlay, (padding, padding), overlay)
+            else:
+                background.paste(overlay, (padding, padding))
 
-            return qr_img.convert('RGB')
+            overlay = background
 
-        except Exception as e:
-            messagebox.showerror(
-                "Image Error", f"Failed to add image overlay: {str(e)}"
-            )
-            return qr_img
+        # Convert to RGBA for transparency support
+        if overlay.mode != 'RGBA':
+            overlay = overlay.convert('RGBA')
+
+        # Paste overlay on QR code
+        qr_img = qr_img.convert('RGBA')
+        overlay_pos = (
+            (qr_size - overlay.size[0]) // 2,
+            (qr_size - overlay.size[1]) // 2,
+        )
+        qr_img.paste(overlay, overlay_pos, overlay)
+
+        return qr_img.convert('RGB')
+
+    def get_full_image(self):
+        """Full-resolution image for the current preview, rendered lazily
+
+        Returns None (after telling the user) when there is nothing to export.
+        """
+        if self.qr_image is None and self.preview_settings is not None:
+            self.status_label.config(text="Rendering full resolution...")
+            self.root.update_idletasks()
+            try:
+                self.qr_image, _ = self.render_qr(self.preview_settings)
+            except Exception as e:
+                self.status_label.config(text=f"Error: {str(e)}")
+                messagebox.showerror("Error", f"Failed to render QR code: {str(e)}")
+                return None
+            self.status_label.config(text="QR code generated successfully")
+        return self.qr_image
 
     def update_preview(self):
-        if self.qr_image:
-            # Resize for preview (max 400x400)
-            preview_size = min(400, self.qr_image.size[0])
-            preview_img = self.qr_image.resize(
-                (preview_size, preview_size), Image.Resampling.LANCZOS
-            )
+        if self.preview_qr:
+            # Preview renders are already at most PREVIEW_SIZE
+            preview_size = min(PREVIEW_SIZE, self.preview_qr.size[0])
+            preview_img = self.preview_qr
+            if preview_img.size[0] != preview_size:
+                preview_img = preview_img.resize(
+                    (preview_size, preview_size), Image.Resampling.LANCZOS
+                )
 
             self.preview_image = ImageTk.PhotoImage(preview_img)
 
@@ -1307,7 +1517,8 @@ class QRCodeGenerator:
 
     def copy_image_to_clipboard(self):
         """Copy QR image to clipboard - CROSS-PLATFORM VERSION"""
-        if not self.qr_image:
+        qr_image = self.get_full_image()
+        if not qr_image:
             messagebox.showwarning("Warning", "No QR code to copy. Generate one first.")
             return
 
@@ -1324,7 +1535,7 @@ class QRCodeGenerator:
                     # Convert image to bitmap format for Windows clipboard
                     output = io.BytesIO()
                     # Convert to RGB if not already (Windows clipboard needs RGB)
-                    img_copy = self.qr_image.convert('RGB')
+                    img_copy = qr_image.convert('RGB')
                     img_copy.save(output, format='BMP')
                     data = output.getvalue()[14:]  # Remove BMP header for clipboard
                     output.close()
@@ -1341,7 +1552,7 @@ class QRCodeGenerator:
                     except ImportError:
                         # Fallback: Save temp file and use PowerShell
                         temp_file = os.path.join(tempfile.gettempdir(), "qr_temp.png")
-                        self.qr_image.save(temp_file)
+                        qr_image.save(temp_file)
 
                         powershell_cmd = f'''
 Add-Type -AssemblyName System.Windows.Forms
@@ -1365,7 +1576,7 @@ $img.Dispose()
             elif platform.system() == "Darwin":
                 try:
                     temp_file = os.path.join(tempfile.gettempdir(), "qr_temp.png")
-                    self.qr_image.save(temp_file)
+                    qr_image.save(temp_file)
 
                     # Use osascript to copy image to clipboard
                     applescript = f'''
@@ -1384,7 +1595,7 @@ end tell
             elif platform.system() == "Linux":
                 try:
                     temp_file = os.path.join(tempfile.gettempdir(), "qr_temp.png")
-                    self.qr_image.save(temp_file)
+                    qr_image.save(temp_file)
 
                     # Try different Linux clipboard utilities
                     linux_commands = [
@@ -1437,7 +1648,7 @@ end tell
 
                     filename = f"QR_Code_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
                     filepath = os.path.join(save_dir, filename)
-                    self.qr_image.save(filepath)
+                    qr_image.save(filepath)
 
                     messagebox.showinfo(
                         "Image Saved",
@@ -1550,7 +1761,8 @@ end tell
         self.copy_image_to_clipboard()
 
     def export_qr(self):
-        if not self.qr_image:
+        qr_image = self.get_full_image()
+        if not qr_image:
             messagebox.showwarning(
                 "Warning", "No QR code to export. Generate one first."
             )
@@ -1570,7 +1782,7 @@ end tell
 
         if filename:
             try:
-                self.qr_image.save(filename)
+                qr_image.save(filename)
                 self.status_label.config(text=f"QR code saved as {filename}")
                 messagebox.showinfo("Success", f"QR code saved successfully!")
             except Exception as e:
@@ -1588,6 +1800,7 @@ end tell
                 'size': self.size_var.get(),
                 'border': self.border_var.get(),
                 'error_correction': self.error_correction_var.get(),
+                'render_mode': 'exact' if self.exact_size_var.get() else 'resample',
                 'fg_color': self.fg_color.get(),
                 'bg_color': self.bg_color.get(),
                 'use_image': self.use_image_var.get(),
@@ -1659,6 +1872,7 @@ end tell
                     self.size_var.set(config.get('size', 400))
                     self.border_var.set(config.get('border', 4))
                     self.error_correction_var.set(config.get('error_correction', 'M'))
+                    self.exact_size_var.set(config.get('render_mode') == 'exact')
 
                     # Colors
                     self.fg_color.set(config.get('fg_color', '#000000'))
@@ -1730,7 +1944,7 @@ end tell
 
     def share_qr(self):
         """Share QR code via various methods"""
-        if not self.qr_image:
+        if not self.preview_qr:
             messagebox.showwarning(
                 "Warning", "No QR code to share. Generate one first."
             )
@@ -1778,7 +1992,10 @@ end tell
             default_filename = f"QR_Code_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
             filepath = os.path.join(save_dir, default_filename)
 
-            self.qr_image.save(filepath)
+            qr_image = self.get_full_image()
+            if not qr_image:
+                return
+            qr_image.save(filepath)
 
             # Open folder containing the file
             system = platform.system()
@@ -1841,47 +2058,19 @@ end tell
 
     def scan_qr_file(self):
         """Enhanced QR scanning with comprehensive dependency checking"""
-        opencv_available, pyzbar_available, zbar_system_available = (
-            self.check_scanning_dependencies()
-        )
+        opencv_available = self.check_scanning_dependencies()[0]
 
-        if not opencv_available or not pyzbar_available:
-            missing = []
-            if not opencv_available:
-                missing.append("opencv-python-headless")
-            if not pyzbar_available:
-                missing.append("pyzbar")
-
-            message = f"QR scanning requires additional packages:\n\n"
-            message += f"Missing: {', '.join(missing)}\n\n"
+        if not opencv_available:
+            message = f"QR scanning requires OpenCV:\n\n"
             message += f"Install with:\n"
-            message += f"pip install {' '.join(missing)}\n\n"
-
-            if not zbar_system_available and platform.system() == "Linux":
-                message += f"Also install system library:\n"
-                message += f"sudo apt-get install libzbar0  # Ubuntu/Debian\n"
-                message += f"sudo dnf install zbar          # Fedora\n"
-                message += f"sudo pacman -S zbar           # Arch\n\n"
-
+            message += f"pip install opencv-python-headless\n\n"
+            message += f"Optionally add pyzbar (and the zbar system library)\n"
+            message += f"for the faster zbar decoder.\n\n"
             message += f"Then restart the application."
 
             messagebox.showinfo("Scanning Dependencies Required", message)
             return
 
-        if not zbar_system_available:
-            message = f"QR scanning requires the zbar system library:\n\n"
-            if platform.system() == "Linux":
-                message += f"Install with:\n"
-                message += f"sudo apt-get install libzbar0  # Ubuntu/Debian\n"
-                message += f"sudo dnf install zbar          # Fedora\n"
-                message += f"sudo pacman -S zbar           # Arch\n\n"
-                message += f"Then restart the application."
-            else:
-                message += f"This should be automatically available on your system."
-
-            messagebox.showinfo("System Library Required", message)
-            return
-
         # All dependencies available, proceed with scanning
         filename = filedialog.askopenfilename(
             title="Select QR Code Image",
@@ -1893,7 +2082,7 @@ end tell
         if filename:
             try:
                 import cv2
-                from pyzbar import pyzbar
+                from qr_decode import CascadeDecoder, PREPROCESS_LABELS, create_backend
 
                 # Read image with better error handling
                 image = cv2.imread(filename)
@@ -1913,91 +2102,34 @@ end tell
                         )
                         return
 
-                # Decode QR codes
-                decoded_objects = pyzbar.decode(image)
-
-                if not decoded_objects:
-                    # Try image preprocessing to improve detection
-                    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-
-                    # Try different preprocessing methods
-                    methods = [
-                        ("Original", gray),
-                        ("Gaussian Blur", cv2.GaussianBlur(gray, (5, 5), 0)),
-                        (
-                            "Threshold",
-                            cv2.threshold(
-                                gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU
-                            )[1],
-                        ),
-                        (
-                            "Adaptive Threshold",
-                            cv2.adaptiveThreshold(
-                                gray,
-                                255,
-                                cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
-                                cv2.THRESH_BINARY,
-                                11,
-                                2,
-                            ),
-                        ),
-                    ]
-
-                    for method_name, processed in methods:
-                        decoded_objects = pyzbar.decode(processed)
-                        if decoded_objects:
-                            break
-
-                    if not decoded_objects:
-                        messagebox.showinfo(
-                            "No QR Codes Found",
-                            "No QR codes found in the image.\n\n"
-                            "Tips:\n"
-                            "• Ensure the QR code is clearly visible\n"
-                            "• Try a higher resolution image\n"
-                            "• Make sure the image is not rotated\n"
-                            "• Check that the QR code is not damaged",
-                        )
-                        return
+                # Decode QR codes, preprocessing only as far as needed
+                if self.scan_decoder is None:
+                    self.scan_decoder = CascadeDecoder(create_backend().decode)
+                results, stage, _ = self.scan_decoder.decode(image)
 
-                # Process results
-                results = []
-                for i, obj in enumerate(decoded_objects):
-                    try:
-                        content = obj.data.decode('utf-8')
-                        results.append(
-                            {
-                                'content': content,
-                                'type': obj.type,
-                                'position': (
-                                    obj.rect.left,
-                                    obj.rect.top,
-                                    obj.rect.width,
-                                    obj.rect.height,
-                                ),
-                            }
-                        )
-                    except UnicodeDecodeError:
-                        # Handle binary data
-                        results.append(
-                            {
-                                'content': f"[Binary data: {len(obj.data)} bytes]",
-                                'type': obj.type,
-                                'position': (
-                                    obj.rect.left,
-                                    obj.rect.top,
-                                    obj.rect.width,
-                                    obj.rect.height,
-                                ),
-                            }
-                        )
+                if not results:
+                    messagebox.showinfo(
+                        "No QR Codes Found",
+                        "No QR codes found in the image.\n\n"
+                        "Tips:\n"
+                        "• Ensure the QR code is clearly visible\n"
+                        "• Try a higher resolution image\n"
+                        "• Make sure the image is not rotated\n"
+                        "• Check that the QR code is not damaged",
+                    )
+                    return
 
                 # Show results
+                note = ""
+                if stage != self.scan_decoder.stages[0]:
+                    note = f"\n\nDecoded after preprocessing: {PREPROCESS_LABELS[stage]}"
+
                 if len(results) == 1:
                     content = results[0]['content']
                     qr_type = results[0]['type']
                     messagebox.showinfo(
-                        "QR Code Found", f"Type: {qr_type}\n\nContent:\n{content}"
+                        "QR Code Found",
+                        f"Type: {qr_type}\n\nContent:\n{content}{note}",
                     )
                 else:
                     result_text = f"Found {len(results)} QR codes:\n\n"
@@ -2007,7 +2139,7 @@ end tell
                         )
                         if len(result['content']) > 100:
                             result_text += "   ...\n"
-                    messagebox.showinfo("Multiple QR Codes Found", result_text)
+                    messagebox.showinfo("Multiple QR Codes Found", result_text + note)
 
             except ImportError as e:
                 messagebox.showerror(
@@ -2049,10 +2181,10 @@ end tell
         help_content += (
             f"  OpenCV: {'✅ Available' if opencv_available else '❌ Missing'}\n"
         )
-        help_content += (
-            f"  PyZBar: {'✅ Available' if pyzbar_available else '❌ Missing'}\n"
-        )
-        help_content += f"  ZBar System Library: {'✅ Available' if zbar_system_available else '❌ Missing'}\n\n"
+        help_content += f"  PyZBar (optional): {'✅ Available' if pyzbar_available else '❌ Missing'}\n"
+        help_content += f"  ZBar System Library (optional): {'✅ Available' if zbar_system_available else '❌ Missing'}\n\n"
+        help_content += "OpenCV alone is enough to scan; with pyzbar and zbar the\n"
+        help_content += "faster zbar decoder is used automatically.\n\n"
 
         if opencv_available and pyzbar_available and zbar_system_available:
             help_content += (
@@ -2072,12 +2204,12 @@ end tell
                 step += 1
 
             if not pyzbar_available:
-                help_content += f"{step}. Install PyZBar:\n"
+                help_content += f"{step}. Install PyZBar (optional):\n"
                 help_content += "   pip install pyzbar\n\n"
                 step += 1
 
             if not zbar_system_available:
-                help_content += f"{step}. Install ZBar system library:\n"
+                help_content += f"{step}. Install ZBar system library (optional):\n"
                 if platform.system() == "Linux":
                     help_content += "   Ubuntu/Debian: sudo apt-get install libzbar0\n"
                     help_content += "   Fedora/RHEL:   sudo dnf install zbar\n"
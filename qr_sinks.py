@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Batch Output Sinks
+Destinations for encoded batch outputs - a directory of loose files, a ZIP
+or tar archive, or a set of WebDataset-style tar shards
+"""
+
+import io
+import tarfile
+import time
+import zipfile
+from pathlib import Path
+
+# Output kinds accepted by open_sink
+SINK_TYPES = ('dir', 'zip', 'tar', 'shards')
+
+# Samples per tar shard in 'shards' mode
+DEFAULT_SHARD_SIZE = 10000
+SHARD_NAME_PATTERN = 'shard-{:06d}.tar'
+
+# Archive members worth deflating - PNG/JPEG/WebP are already compressed
+COMPRESSIBLE_SUFFIXES = ('.svg', '.eps', '.pdf', '.bmp', '.tif', '.tiff')
+
+TAR_COMPRESSED_SUFFIXES = {'.tgz': 'gz', '.gz': 'gz', '.bz2': 'bz2', '.xz': 'xz'}
+
+
+class OutputSink:
+    """Where batch outputs go
+
+    ``write`` receives the output's relative name and its encoded bytes and
+    is only ever called from one thread. ``directory`` is the folder outputs
+    land in as loose files, or None for archive sinks (incremental runs need
+    a directory to compare against).
+    """
+
+    directory = None
+    description = 'Output'
+
+    def write(self, name: str, data: bytes) -> None:
+        raise NotImplementedError("OutputSink.write")
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class DirectorySink(OutputSink):
+    """One loose file per output (the classic batch layout)"""
+
+    def __init__(self, directory: str):
+        self.directory = str(directory)
+        self.description = f"📁 Output directory: {directory}"
+        Path(directory).mkdir(parents=True, exist_ok=True)
+
+    def write(self, name: str, data: bytes) -> None:
+        (Path(self.directory) / name).write_bytes(data)
+
+
+class ZipSink(OutputSink):
+    """Stream outputs into a single ZIP file, storing pre-compressed images"""
+
+    def __init__(self, path: str):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.description = f"🗜️  Output archive: {path}"
+        self.archive = zipfile.ZipFile(path, 'w', allowZip64=True)
+
+    def write(self, name: str, data: bytes) -> None:
+        info = zipfile.ZipInfo(name, date_time=time.localtime()[:6])
+        info.compress_type = (
+            zipfile.ZIP_DEFLATED
+            if Path(name).suffix.lower() in COMPRESSIBLE_SUFFIXES
+            else zipfile.ZIP_STORED
+        )
+        self.archive.writestr(info, data)
+
+    def close(self) -> None:
+        self.archive.close()
+
+
+class TarSink(OutputSink):
+    """Stream outputs into a tar file (.tar.gz / .tgz / .tar.xz compress it)"""
+
+    def __init__(self, path: str):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.description = f"📦 Output archive: {path}"
+        compression = TAR_COMPRESSED_SUFFIXES.get(Path(path).suffix.lower(), '')
+        self.archive = tarfile.open(path, f"w|{compression}")
+
+    def write(self, name: str, data: bytes) -> None:
+        add_tar_member(self.archive, name, data)
+
+    def close(self) -> None:
+        self.archive.close()
+
+
+class ShardSink(OutputSink):
+    """WebDataset-style shards: numbered tar files of ``shard_size`` outputs
+
+    Outputs are grouped by the file name without its extension, so shards can
+    be read with ``webdataset`` or any tar reader without unpacking.
+    """
+
+    def __init__(self, directory: str, shard_size: int = DEFAULT_SHARD_SIZE):
+        Path(directory).mkdir(parents=True, exist_ok=True)
+        self.root = Path(directory)
+        self.shard_size = max(1, shard_size)
+        self.description = (
+            f"📦 Output shards: {self.root / SHARD_NAME_PATTERN.format(0)}, ... "
+            f"({self.shard_size} per shard)"
+        )
+        self.shard_index = 0
+        self.count = 0
+        self.archive = None
+
+    def write(self, name: str, data: bytes) -> None:
+        if self.archive is None or self.count == self.shard_size:
+            self.close()
+            self.archive = tarfile.open(
+                self.root / SHARD_NAME_PATTERN.format(self.shard_index), 'w|'
+            )
+            self.shard_index += 1
+            self.count = 0
+        add_tar_member(self.archive, name, data)
+        self.count += 1
+
+    def close(self) -> None:
+        if self.archive is not None:
+            self.archive.close()
+            self.archive = None
+
+
+def add_tar_member(archive: tarfile.TarFile, name: str, data: bytes) -> None:
+    """Append one regular file to a (possibly streaming) tar archive"""
+    info = tarfile.TarInfo(name)
+    info.size = len(data)
+    info.mtime = int(time.time())
+    info.mode = 0o644
+    archive.addfile(info, io.BytesIO(data))
+
+
+def guess_sink_type(output: str) -> str:
+    """Pick a sink from the output path: archives by suffix, else a directory"""
+    suffixes = [suffix.lower() for suffix in Path(output).suffixes]
+    if suffixes[-1:] == ['.zip']:
+        return 'zip'
+    if '.tar' in suffixes[-2:] or suffixes[-1:] == ['.tgz']:
+        return 'tar'
+    return 'dir'
+
+
+def open_sink(
+    output: str, sink_type: str = None, shard_size: int = DEFAULT_SHARD_SIZE
+) -> OutputSink:
+    """Create the sink for ``output`` (see SINK_TYPES)"""
+    sink_type = sink_type or guess_sink_type(output)
+    if sink_type == 'zip':
+        return ZipSink(output)
+    if sink_type == 'tar':
+        return TarSink(output)
+    if sink_type == 'shards':
+        return ShardSink(output, shard_size)
+    if sink_type == 'dir':
+        return DirectorySink(output)
+    raise ValueError(f"Unknown output sink: {sink_type}")
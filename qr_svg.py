@@ -0,0 +1,455 @@
+#!/usr/bin/env python3
+"""
+Vector QR Renderers
+Native SVG output for every theme and color mask, shared by qr_utils.py and
+the PyScript front end, plus PDF/EPS for print (pure Python, no NumPy)
+"""
+
+import base64
+import io
+import math
+import zlib
+from typing import Any, Dict, List, Optional
+
+from PIL import Image
+
+# Shapes are drawn in module units: one module is 1x1 in the viewBox
+GAPPED_RATIO = 0.8  # GappedSquareModuleDrawer size_ratio
+BAR_SHRINK = 0.8  # Vertical/HorizontalBarsDrawer shrink
+
+# Embedded logos are stored at up to this many pixels per displayed pixel
+LOGO_OVERSAMPLE = 2
+
+# PDF/EPS page units are points; sizes in the configs are CSS pixels
+POINTS_PER_PIXEL = 72 / 96
+
+SVG_THEMES = ('classic', 'rounded', 'circular', 'gapped', 'vertical_bars', 'horizontal_bars')
+SVG_COLOR_MASKS = ('solid', 'radial', 'square', 'horizontal', 'vertical', 'image')
+
+
+def _num(value: float) -> str:
+    """Shortest fixed-point form of a coordinate"""
+    text = f"{value:.3f}".rstrip('0').rstrip('.')
+    return '0' if text in ('', '-0') else text
+
+
+def _hex_to_rgb(hex_color: str):
+    hex_color = hex_color.lstrip('#')
+    if len(hex_color) == 3:
+        hex_color = ''.join(c * 2 for c in hex_color)
+    try:
+        return tuple(int(hex_color[i : i + 2], 16) for i in (0, 2, 4))
+    except ValueError:
+        return (0, 0, 0)
+
+
+def _rgb_to_hex(rgb) -> str:
+    return '#{:02x}{:02x}{:02x}'.format(*rgb)
+
+
+def _png_data_uri(image: Image.Image) -> str:
+    buffer = io.BytesIO()
+    image.save(buffer, format='PNG', optimize=True)
+    return 'data:image/png;base64,' + base64.b64encode(buffer.getvalue()).decode()
+
+
+def is_eye(row: int, col: int, count: int) -> bool:
+    """Finder pattern module (drawn as plain squares, like StyledPilImage)"""
+    return (
+        (row < 7 and col < 7)
+        or (row < 7 and count - col < 8)
+        or (count - row < 8 and col < 7)
+    )
+
+
+def module_outlines(cells) -> List[List[tuple]]:
+    """Trace a set of (row, col) squares into minimal rectilinear polygons
+
+    Every cell contributes its four edges clockwise; edges shared by two
+    cells cancel out, and the remaining ones chain into closed loops -
+    outlines clockwise, holes counter-clockwise, so the nonzero fill rule
+    works everywhere. Collinear points are dropped, so the vertex count
+    follows the number of edges in the outline, not the number of modules.
+    Points are (x, y) in module units.
+    """
+    cells = set(cells)
+    if not cells:
+        return []
+
+    # Vertices are packed into ints (y * stride + x) while tracing
+    stride = max(col for _, col in cells) + 2
+    edges = {}
+
+    def add(start, end):
+        if start in edges:
+            edges[start].append(end)
+        else:
+            edges[start] = [end]
+
+    for row, col in cells:
+        top_left = row * stride + col
+        bottom_left = top_left + stride
+        if (row - 1, col) not in cells:
+            add(top_left, top_left + 1)
+        if (row, col + 1) not in cells:
+            add(top_left + 1, bottom_left + 1)
+        if (row + 1, col) not in cells:
+            add(bottom_left + 1, bottom_left)
+        if (row, col - 1) not in cells:
+            add(bottom_left, top_left)
+
+    polygons = []
+    while edges:
+        start = next(iter(edges))
+        points = [start]
+        current = start
+        while True:
+            ends = edges[current]
+            end = ends.pop()
+            if not ends:
+                del edges[current]
+            if end == start:
+                break
+            points.append(end)
+            current = end
+
+        # Keep only the corners - a point is a corner when the step into it
+        # and the step out of it differ
+        count = len(points)
+        corners = [
+            divmod(point, stride)[::-1]
+            for i, point in enumerate(points)
+            if point - points[i - 1] != points[(i + 1) % count] - point
+        ]
+        polygons.append(corners)
+
+    return polygons
+
+
+def _svg_polygon(points, border: int) -> str:
+    """Rectilinear polygon as compact path data (H/V segments only)"""
+    x0, y0 = points[0]
+    path = f"M{x0 + border} {y0 + border}"
+    for (px, py), (x, y) in zip(points, points[1:]):
+        path += f"H{x + border}" if y == py else f"V{y + border}"
+    return path + "z"
+
+
+def _rounded_module(x: int, y: int, n: bool, e: bool, s: bool, w: bool) -> str:
+    """RoundedModuleDrawer outline - corners without neighbours are arcs"""
+    path = f"M{_num(x + 0.5)} {y}"
+    # NE, SE, SW, NW quadrants, clockwise
+    path += "a.5 .5 0 0 1 .5 .5" if not (n or e) else "h.5v.5"
+    path += "a.5 .5 0 0 1 -.5 .5" if not (e or s) else "v.5h-.5"
+    path += "a.5 .5 0 0 1 -.5 -.5" if not (s or w) else "h-.5v-.5"
+    path += "a.5 .5 0 0 1 .5 -.5" if not (w or n) else "v-.5h.5"
+    return path + "z"
+
+
+def module_paths(modules: List[List[bool]], border: int, theme: str = 'classic') -> str:
+    """Path data for all dark modules, merged into one ``d`` string
+
+    Square modules (the classic theme, finder patterns, and rounded modules
+    with no free corner) are merged into outline polygons.
+    """
+    count = len(modules)
+
+    def active(row, col):
+        return 0 <= row < count and 0 <= col < count and bool(modules[row][col])
+
+    squares = set()
+    parts = []
+    for row in range(count):
+        for col in range(count):
+            if not modules[row][col]:
+                continue
+            x, y = col + border, row + border
+
+            if theme not in SVG_THEMES[1:] or is_eye(row, col, count):
+                squares.add((row, col))
+            elif theme == 'gapped':
+                inset = (1 - GAPPED_RATIO) / 2
+                side = _num(GAPPED_RATIO)
+                parts.append(
+                    f"M{_num(x + inset)} {_num(y + inset)}h{side}v{side}h-{side}z"
+                )
+            elif theme == 'circular':
+                parts.append(f"M{x} {_num(y + 0.5)}a.5 .5 0 1 0 1 0a.5 .5 0 1 0 -1 0z")
+            elif theme == 'rounded':
+                n, e = active(row - 1, col), active(row, col + 1)
+                s, w = active(row + 1, col), active(row, col - 1)
+                if (n or e) and (e or s) and (s or w) and (w or n):
+                    # No free corner - a plain square that can join a run
+                    squares.add((row, col))
+                else:
+                    parts.append(_rounded_module(x, y, n, e, s, w))
+            elif theme == 'vertical_bars':
+                # One rounded bar per vertical run, started at its top module
+                # (finder patterns are ringed by light separators, so runs
+                # never reach into an eye)
+                if active(row - 1, col):
+                    continue
+                end = row
+                while active(end + 1, col):
+                    end += 1
+                inset = (1 - BAR_SHRINK) / 2
+                rx, width = _num(BAR_SHRINK / 2), _num(BAR_SHRINK)
+                parts.append(
+                    f"M{_num(x + inset)} {_num(y + 0.5)}a{rx} .5 0 0 1 {width} 0"
+                    f"V{_num(end + border + 0.5)}a{rx} .5 0 0 1 -{width} 0z"
+                )
+            elif theme == 'horizontal_bars':
+                if active(row, col - 1):
+                    continue
+                end = col
+                while active(row, end + 1):
+                    end += 1
+                inset = (1 - BAR_SHRINK) / 2
+                ry, height = _num(BAR_SHRINK / 2), _num(BAR_SHRINK)
+                parts.append(
+                    f"M{_num(x + 0.5)} {_num(y + inset)}H{_num(end + border + 0.5)}"
+                    f"a.5 {ry} 0 0 1 0 {height}H{_num(x + 0.5)}a.5 {ry} 0 0 1 0 -{height}z"
+                )
+
+    if squares:
+        parts = [_svg_polygon(p, border) for p in module_outlines(squares)] + parts
+    return ''.join(parts)
+
+
+def _fill_definition(config: Dict[str, Any], extent: int, mask_image=None):
+    """(fill attribute, <defs> content) for the config's color mask
+
+    Mirrors the qrcode color masks over the full image (border included):
+    gradients run from the fg/bg midpoint to fg, like qr_utils and the GUI.
+    SVG has no square gradient, so 'square' is approximated by a radial
+    gradient touching the edge midpoints.
+    """
+    mask_type = config.get('color_mask', 'solid')
+    fg = _hex_to_rgb(config.get('fg_color', '#000000'))
+    bg = _hex_to_rgb(config.get('bg_color', '#FFFFFF'))
+    mid = _rgb_to_hex(tuple(int((f + b) / 2) for f, b in zip(fg, bg)))
+    fg = _rgb_to_hex(fg)
+
+    stops = f'<stop offset="0" stop-color="{mid}"/><stop offset="1" stop-color="{fg}"/>'
+    half = _num(extent / 2)
+
+    if mask_type in ('radial', 'square'):
+        radius = extent / math.sqrt(2) if mask_type == 'radial' else extent / 2
+        defs = (
+            f'<radialGradient id="qr-fill" gradientUnits="userSpaceOnUse" '
+            f'cx="{half}" cy="{half}" r="{_num(radius)}">{stops}</radialGradient>'
+        )
+    elif mask_type in ('horizontal', 'vertical'):
+        x2, y2 = (extent, 0) if mask_type == 'horizontal' else (0, extent)
+        defs = (
+            f'<linearGradient id="qr-fill" gradientUnits="userSpaceOnUse" '
+            f'x1="0" y1="0" x2="{x2}" y2="{y2}">{stops}</linearGradient>'
+        )
+    elif mask_type == 'image' and mask_image is not None:
+        # ImageColorMask stretches the image over the whole code
+        defs = (
+            f'<pattern id="qr-fill" patternUnits="userSpaceOnUse" '
+            f'width="{extent}" height="{extent}">'
+            f'<image width="{extent}" height="{extent}" preserveAspectRatio="none" '
+            f'href="{_png_data_uri(mask_image.convert("RGB"))}"/></pattern>'
+        )
+    else:
+        return fg, ''
+
+    return 'url(#qr-fill)', defs
+
+
+def _overlay_elements(
+    config: Dict[str, Any], extent: int, size: int, overlay_image: Image.Image
+) -> str:
+    """Logo (with optional background) centered on the code"""
+    scale = extent / size  # viewBox units per output pixel
+    box = size * config.get('image_size', 20) / 100
+
+    width, height = overlay_image.size
+    fit = box / max(width, height)
+    logo_w, logo_h = width * fit * scale, height * fit * scale
+
+    # Embed at a resolution matching the displayed size, not the source
+    pixels = max(1, int(box * LOGO_OVERSAMPLE))
+    logo = overlay_image.copy()
+    logo.thumbnail((pixels, pixels), Image.Resampling.LANCZOS)
+    if logo.mode not in ('RGB', 'RGBA'):
+        logo = logo.convert('RGBA')
+
+    elements = ''
+    bg_type = config.get('image_bg', 'match')
+    if bg_type in ('match', 'custom'):
+        padding = config.get('image_padding', 10) * scale
+        bg_color = config.get(
+            'bg_color' if bg_type == 'match' else 'image_bg_color', '#FFFFFF'
+        )
+        bg_w, bg_h = logo_w + 2 * padding, logo_h + 2 * padding
+        elements += (
+            f'<rect x="{_num((extent - bg_w) / 2)}" y="{_num((extent - bg_h) / 2)}" '
+            f'width="{_num(bg_w)}" height="{_num(bg_h)}" fill="{bg_color}"/>'
+        )
+
+    elements += (
+        f'<image x="{_num((extent - logo_w) / 2)}" y="{_num((extent - logo_h) / 2)}" '
+        f'width="{_num(logo_w)}" height="{_num(logo_h)}" href="{_png_data_uri(logo)}"/>'
+    )
+    return elements
+
+
+def render_svg(
+    modules: List[List[bool]],
+    border: int,
+    config: Optional[Dict[str, Any]] = None,
+    overlay_image: Optional[Image.Image] = None,
+    mask_image: Optional[Image.Image] = None,
+) -> str:
+    """Render a QR module matrix as a standalone SVG document
+
+    ``config`` uses the same keys as the batch/GUI configs (size, theme,
+    color_mask, fg_color, bg_color, image_size, image_padding, image_bg,
+    image_bg_color). All dark modules go into a single path filled with a
+    flat color, a gradient, or (for image masks) a pattern; ``<image>`` is
+    otherwise used only for the logo.
+    """
+    config = config or {}
+    extent = len(modules) + 2 * border
+    size = int(config.get('size', extent * 10))
+
+    fill, defs = _fill_definition(config, extent, mask_image)
+    bg_color = config.get('bg_color', '#FFFFFF')
+
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{size}" height="{size}" '
+        f'viewBox="0 0 {extent} {extent}" shape-rendering="geometricPrecision">'
+    ]
+    if defs:
+        parts.append(f'<defs>{defs}</defs>')
+    parts.append(f'<rect width="{extent}" height="{extent}" fill="{bg_color}"/>')
+    parts.append(
+        f'<path fill="{fill}" d="{module_paths(modules, border, config.get("theme", "classic"))}"/>'
+    )
+    if overlay_image is not None:
+        parts.append(_overlay_elements(config, extent, size, overlay_image))
+    parts.append('</svg>')
+
+    return '<?xml version="1.0" encoding="UTF-8"?>\n' + ''.join(parts) + '\n'
+
+
+def _dark_cells(modules: List[List[bool]]):
+    return [
+        (row, col)
+        for row, line in enumerate(modules)
+        for col, dark in enumerate(line)
+        if dark
+    ]
+
+
+def _print_colors(config: Dict[str, Any]):
+    """Flat (fg, bg) colors as 0-1 floats for PDF/EPS"""
+    fg = _hex_to_rgb(config.get('fg_color', '#000000'))
+    bg = _hex_to_rgb(config.get('bg_color', '#FFFFFF'))
+    return (
+        ' '.join(_num(c / 255) for c in fg),
+        ' '.join(_num(c / 255) for c in bg),
+    )
+
+
+def _print_path(modules: List[List[bool]], border: int, move: str, line: str, close: str) -> str:
+    """Merged module outlines in PDF/PostScript path syntax"""
+    ops = []
+    for points in module_outlines(_dark_cells(modules)):
+        x, y = points[0]
+        ops.append(f"{x + border} {y + border} {move}")
+        ops.extend(f"{x + border} {y + border} {line}" for x, y in points[1:])
+        ops.append(close)
+    return '\n'.join(ops)
+
+
+def render_pdf(
+    modules: List[List[bool]], border: int, config: Optional[Dict[str, Any]] = None
+) -> bytes:
+    """Render a QR module matrix as a single-page vector PDF
+
+    Print output: classic square modules, merged into outline polygons, in
+    flat fg/bg colors. The page is ``size`` CSS pixels square.
+    """
+    config = config or {}
+    extent = len(modules) + 2 * border
+    page = int(config.get('size', extent * 10)) * POINTS_PER_PIXEL
+    scale = page / extent
+    fg, bg = _print_colors(config)
+
+    content = '\n'.join(
+        [
+            f"{bg} rg 0 0 {_num(page)} {_num(page)} re f",
+            # Module units, y axis pointing down like the SVG
+            f"{_num(scale)} 0 0 {_num(-scale)} 0 {_num(page)} cm",
+            f"{fg} rg",
+            _print_path(modules, border, 'm', 'l', 'h'),
+            "f",
+        ]
+    ).encode('ascii')
+    stream = zlib.compress(content)
+
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {_num(page)} {_num(page)}] "
+        f"/Contents 4 0 R /Resources << >> >>".encode('ascii'),
+        f"<< /Length {len(stream)} /Filter /FlateDecode >>\nstream\n".encode('ascii')
+        + stream
+        + b"\nendstream",
+    ]
+
+    pdf = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(pdf))
+        pdf += f"{number} 0 obj\n".encode('ascii') + body + b"\nendobj\n"
+
+    xref = len(pdf)
+    pdf += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode('ascii')
+    for offset in offsets:
+        pdf += f"{offset:010d} 00000 n \n".encode('ascii')
+    pdf += (
+        f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\n"
+        f"startxref\n{xref}\n%%EOF\n"
+    ).encode('ascii')
+    return bytes(pdf)
+
+
+def render_eps(
+    modules: List[List[bool]], border: int, config: Optional[Dict[str, Any]] = None
+) -> str:
+    """Render a QR module matrix as Encapsulated PostScript
+
+    Same drawing model as render_pdf: merged square-module outlines in flat
+    fg/bg colors, ``size`` CSS pixels square.
+    """
+    config = config or {}
+    extent = len(modules) + 2 * border
+    page = int(config.get('size', extent * 10)) * POINTS_PER_PIXEL
+    scale = page / extent
+    fg, bg = _print_colors(config)
+
+    return '\n'.join(
+        [
+            "%!PS-Adobe-3.0 EPSF-3.0",
+            f"%%BoundingBox: 0 0 {math.ceil(page)} {math.ceil(page)}",
+            f"%%HiResBoundingBox: 0 0 {_num(page)} {_num(page)}",
+            "%%Creator: QR Generator",
+            "%%EndComments",
+            "/m { moveto } bind def /l { lineto } bind def /h { closepath } bind def",
+            "gsave",
+            f"{bg} setrgbcolor 0 0 {_num(page)} {_num(page)} rectfill",
+            f"[{_num(scale)} 0 0 {_num(-scale)} 0 {_num(page)}] concat",
+            f"{fg} setrgbcolor",
+            "newpath",
+            _print_path(modules, border, 'm', 'l', 'h'),
+            "fill",
+            "grestore",
+            "%%EOF",
+            "",
+        ]
+    )
@@ -8,8 +8,22 @@ import csv
 import json
 import os
 import argparse
+import bisect
+import copy
+import cProfile
+import heapq
+import pstats
+import functools
+import glob
+import hashlib
+import itertools
+import multiprocessing
+import queue
+import threading
+import time
+from collections import OrderedDict
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable, Iterator, Tuple
 import qrcode
 from qrcode.image.styledpil import StyledPilImage
 from qrcode.image.styles.moduledrawers import (
@@ -32,18 +46,554 @@ try:
 except ImportError:
     COLOR_MASKS_AVAILABLE = False
 
+try:
+    from qrcode.image.styles.colormasks import ImageColorMask
+
+    IMAGE_COLOR_MASK_AVAILABLE = True
+except ImportError:
+    IMAGE_COLOR_MASK_AVAILABLE = False
+
+# Vectorized drop-in replacements for the color masks (NumPy)
+try:
+    from qr_masks import (
+        FastSolidFillColorMask as SolidFillColorMask,
+        FastSquareGradiantColorMask as SquareGradiantColorMask,
+        FastRadialGradiantColorMask as RadialGradiantColorMask,
+        FastHorizontalGradiantColorMask as HorizontalGradiantColorMask,
+        FastVerticalGradiantColorMask as VerticalGradiantColorMask,
+        FastImageColorMask as ImageColorMask,
+    )
+
+    FAST_MASKS_AVAILABLE = True
+except ImportError:
+    FAST_MASKS_AVAILABLE = False
+
+from qr_svg import render_svg, render_pdf, render_eps
+from qr_sinks import (
+    OutputSink,
+    SINK_TYPES,
+    DEFAULT_SHARD_SIZE,
+    open_sink,
+    guess_sink_type,
+)
+from qr_decode import (
+    CascadeDecoder,
+    DecodeStats,
+    PyramidDecoder,
+    PREPROCESS_STAGES,
+    DECODER_BACKENDS,
+    available_backends,
+    create_backend,
+)
+
+try:
+    import numpy as np
+
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
 from PIL import Image
+
+# AVIF output on Pillow < 11.3 needs the pillow-avif-plugin package
+try:
+    import pillow_avif  # noqa: F401
+except ImportError:
+    pass
+
 import sys
 import urllib.request
 import urllib.parse
 import io
 
+# Rows handed to each pool worker per dispatch in parallel batch mode
+DEFAULT_BATCH_CHUNKSIZE = 16
+# Chunks queued per worker before the reader waits for results
+BATCH_CHUNKS_IN_FLIGHT = 2
+# Results buffered between pipeline stages (render -> encode -> write)
+BATCH_STAGE_QUEUE_SIZE = 64
+# Pipeline stages timed in the batch summary. render/encode/verify are CPU
+# time of the thread doing them (summed over workers), so GIL waits between
+# stages are not double counted; read/write are wall time, as they wait on I/O.
+BATCH_STAGES = ('read', 'render', 'encode', 'verify', 'write')
+# Stages only shown in the summary when they ran
+OPTIONAL_BATCH_STAGES = ('verify',)
+
+# 'resample' draws at box_size 10 and LANCZOS-resizes to the target size,
+# 'exact' picks the box size from the target size so no resample is needed
+RENDER_MODES = ('resample', 'exact')
+
+# Encoded QR matrices kept per process, keyed by (content, ECC, border)
+ENCODE_CACHE_SIZE = 128
+
+# Module drawers / color masks kept per generator
+STYLE_CACHE_SIZE = 64
+# Decoded images and prepared logo overlays shared by the whole process
+ASSET_CACHE_SIZE = 32
+
+# Batch 'format' values written by the vector renderers (qr_svg) instead of PIL
+VECTOR_FORMATS = ('SVG', 'PDF', 'EPS')
+
+# Per-format encoder settings read from the batch config (see encode_image):
+# png_compress_level 0-9, reduce_colors N (palette/bilevel output for images
+# with at most N colors, 0 = off), quality for JPEG/WebP/AVIF (the effort
+# level for lossless WebP), webp_lossless and webp_method 0-6
+ENCODER_OPTIONS = (
+    'png_compress_level',
+    'reduce_colors',
+    'quality',
+    'webp_lossless',
+    'webp_method',
+)
+# Formats that store palette and bilevel images natively
+PALETTE_FORMATS = ('PNG', 'GIF', 'BMP', 'TIFF')
+
+# Incremental batch runs: sidecar manifest in the output directory mapping
+# each output file to the hash of everything that went into it. Bump
+# OUTPUT_CACHE_VERSION whenever rendering changes so old outputs are redone.
+OUTPUT_MANIFEST_NAME = '.qr_manifest.json'
+OUTPUT_CACHE_VERSION = 1
+
+# Stages reported to QRBatchGenerator.stage_hooks by generate_qr_code, plus
+# the batch-only 'save' (image encoding), 'verify' and 'write' (sink) stages
+PROFILE_STAGES = (
+    'encode',
+    'draw',
+    'mask',
+    'resize',
+    'overlay',
+    'save',
+    'verify',
+    'write',
+)
+# Upper bounds (ms) of the --profile histogram buckets; the last is open
+PROFILE_BUCKETS_MS = (0.5, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+# Slowest rows re-run under cProfile by default, and functions printed
+DEFAULT_PROFILE_TOP = 5
+PROFILE_PRINT_FUNCTIONS = 15
+
+# Batch scanning (scan --dir / --glob)
+SCAN_IMAGE_SUFFIXES = ('.png', '.jpg', '.jpeg', '.bmp', '.gif', '.webp', '.tif', '.tiff')
+DEFAULT_SCAN_CHUNKSIZE = 32
+# Failed files listed in the end-of-run report (all go to --failures)
+SCAN_FAILURES_SHOWN = 50
+
+# Default matrix for `bench --suite pipeline`
+BENCH_THEMES = (
+    'classic',
+    'rounded',
+    'circular',
+    'gapped',
+    'vertical_bars',
+    'horizontal_bars',
+)
+BENCH_MASKS = ('solid', 'radial')
+BENCH_ECC_LEVELS = ('M',)
+BENCH_LOGO_PATH = str(
+    Path(__file__).resolve().parent / 'assets' / 'images' / 'LogoPlaceHolders192.png'
+)
+
+# Synthetic photos for `bench --suite pyramid`: photo size, codes per photo
+# and the sides (pixels) codes are pasted at
+BENCH_PHOTO_SIZE = (6000, 4000)
+BENCH_PHOTO_CODES = 3
+BENCH_PHOTO_CODE_SIDES = (180, 260, 400, 800)
+# Themes rendered for `bench --suite backends` next to the synthetic photos
+BENCH_BACKEND_THEMES = ('classic', 'rounded', 'circular')
+
+# Streaming JSON input
+JSON_LINES_SUFFIXES = ('.jsonl', '.ndjson')
+JSON_STREAM_READ_SIZE = 64 * 1024
+# A parse error this close to the end of the read buffer may just be a
+# truncated element (the longest literal prefix, "-Infinity", is 9 chars)
+JSON_TRUNCATION_WINDOW = 10
+JSON_PARSE_ERROR_KEY = '_parse_error'
+
+
+class LRUCache:
+    """Small thread-safe least-recently-used cache with hit/miss counters"""
+
+    _MISSING = object()
+
+    def __init__(self, maxsize: int = 128):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_create(self, key, factory):
+        """Return the cached value for ``key``, calling ``factory()`` on a miss
+
+        Exceptions raised by ``factory`` propagate and nothing is cached.
+        The factory runs outside the lock, so two threads missing on the same
+        key may both build it; the last one stored wins.
+        """
+        with self._lock:
+            value = self._data.get(key, self._MISSING)
+            if value is not self._MISSING:
+                self.hits += 1
+                self._data.move_to_end(key)
+                return value
+            self.misses += 1
+
+        value = factory()
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key) -> bool:
+        return key in self._data
+
+
+class TimedStyledPilImage(StyledPilImage):
+    """StyledPilImage that records how long its color mask pass took"""
+
+    process_seconds = 0.0
+
+    def process(self):
+        start = time.perf_counter()
+        super().process()
+        self.process_seconds = time.perf_counter() - start
+
+
+def exact_box_size(modules_count: int, border: int, target_size: int) -> int:
+    """Largest box size at which the code (with border) fits in target_size"""
+    return max(1, int(target_size) // (modules_count + 2 * border))
+
+
+def fit_to_size(image, target_size: int, fill) -> Image.Image:
+    """Center-pad (or crop) a rendered code to target_size without resampling
+
+    Padding uses ``fill`` and only widens the quiet zone; cropping only
+    happens when even a 1px box size is larger than the target.
+    """
+    if hasattr(image, 'get_image'):
+        image = image.get_image()
+
+    width = image.size[0]
+    if width == target_size:
+        return image
+    if width > target_size:
+        offset = (width - target_size) // 2
+        return image.crop(
+            (offset, offset, offset + target_size, offset + target_size)
+        )
+
+    canvas = Image.new(image.mode, (target_size, target_size), fill)
+    offset = (target_size - width) // 2
+    canvas.paste(image, (offset, offset))
+    return canvas
+
+
+def render_module_matrix(
+    modules, border: int, box_size: int, fg_rgb, bg_rgb, target_size: int = None
+) -> Image.Image:
+    """Render a QR module matrix to a two-color palette image in one step
+
+    Pixel-identical to StyledPilImage with square modules and a solid fill,
+    but built with NumPy instead of drawing module by module. With
+    ``target_size`` the result is centered on (or cropped to) that size like
+    fit_to_size().
+    """
+    matrix = np.pad(np.asarray(modules, dtype=np.uint8), border)
+    pixels = np.repeat(np.repeat(matrix, box_size, axis=0), box_size, axis=1)
+
+    if target_size is not None:
+        width = pixels.shape[0]
+        if width > target_size:
+            offset = (width - target_size) // 2
+            pixels = pixels[
+                offset : offset + target_size, offset : offset + target_size
+            ]
+        elif width < target_size:
+            before = (target_size - width) // 2
+            pixels = np.pad(pixels, (before, target_size - width - before))
+
+    # Palette index 0 is the background, 1 the foreground
+    image = Image.fromarray(np.ascontiguousarray(pixels))
+    image.putpalette(tuple(bg_rgb) + tuple(fg_rgb))
+    return image
+
+
+def reduce_colors(image: Image.Image, max_colors: int) -> Image.Image:
+    """Losslessly convert to a palette image if it has at most max_colors colors
+
+    Pure black and white codes become bilevel ('1') images. Otherwise each
+    color gets a palette entry - PNG then picks a 1/2/4/8-bit depth from the
+    palette size. Images with more colors are returned unchanged.
+    """
+    if image.mode != 'RGB' or max_colors < 2:
+        return image
+    counted = image.getcolors(min(max_colors, 256))
+    if counted is None:
+        return image
+
+    colors = [color for _, color in counted]
+    if set(colors) <= {(0, 0, 0), (255, 255, 255)}:
+        return image.convert('1', dither=Image.Dither.NONE)
+
+    palette = [channel for color in colors for channel in color]
+
+    # Fast path: when every color has its own gray level, the grayscale image
+    # identifies each pixel's color exactly and a lookup table indexes it
+    swatch = Image.new('RGB', (len(colors), 1))
+    swatch.putdata(colors)
+    levels = list(swatch.convert('L').tobytes())
+    if len(set(levels)) == len(colors):
+        lookup = [0] * 256
+        for index, level in enumerate(levels):
+            lookup[level] = index
+        indexed = image.convert('L').point(lookup)
+        indexed.putpalette(palette)
+        return indexed
+
+    if not NUMPY_AVAILABLE:
+        return image
+
+    # Colors sharing a gray level - index by packed RGB value instead
+    packed = np.array(
+        [(r << 16) | (g << 8) | b for r, g, b in colors], dtype=np.uint32
+    )
+    order = np.argsort(packed)
+    pixels = np.asarray(image).astype(np.uint32)
+    keys = (pixels[..., 0] << 16) | (pixels[..., 1] << 8) | pixels[..., 2]
+    indices = order[np.searchsorted(packed[order], keys)].astype(np.uint8)
+    indexed = Image.fromarray(indices, 'L')
+    indexed.putpalette(palette)
+    return indexed
+
+
+def encoder_options(config: Dict[str, Any]) -> Dict[str, Any]:
+    """The ENCODER_OPTIONS set in a batch config (None / unset = library default)"""
+    return {
+        key: config[key] for key in ENCODER_OPTIONS if config.get(key) is not None
+    }
+
+
+def encode_image(
+    image: Image.Image, output_name: str, options: Dict[str, Any] = None
+) -> bytes:
+    """Encode a rendered code in the format implied by the output's suffix
+
+    ``options`` are ENCODER_OPTIONS (see ``encoder_options``); the ones that
+    do not apply to the output format are ignored.
+    """
+    options = options or {}
+    suffix = Path(output_name).suffix.lower()
+    image_format = Image.registered_extensions().get(suffix)
+    if image_format is None:
+        raise ValueError(f"unknown file extension: {suffix}")
+
+    save_options = {}
+    if image_format in PALETTE_FORMATS and options.get('reduce_colors'):
+        image = reduce_colors(image, int(options['reduce_colors']))
+    if image_format == 'PNG' and 'png_compress_level' in options:
+        save_options['compress_level'] = int(options['png_compress_level'])
+    if image_format in ('JPEG', 'WEBP', 'AVIF') and 'quality' in options:
+        save_options['quality'] = int(options['quality'])
+    if image_format == 'WEBP':
+        save_options['lossless'] = bool(options.get('webp_lossless', False))
+        if 'webp_method' in options:
+            save_options['method'] = int(options['webp_method'])
+    if image_format in ('JPEG', 'WEBP', 'AVIF') and image.mode in ('P', '1'):
+        image = image.convert('RGB')
+
+    buffer = io.BytesIO()
+    image.save(buffer, format=image_format, **save_options)
+    return buffer.getvalue()
+
+
+# Process-wide cache of decoded image assets and prepared overlay composites
+ASSET_CACHE = LRUCache(ASSET_CACHE_SIZE)
+
+# Process-wide cache of encoded QR codes (module matrix + version)
+ENCODE_CACHE = LRUCache(ENCODE_CACHE_SIZE)
+
+# Error correction mapping
+ERROR_CORRECTION_LEVELS = {
+    'L': qrcode.constants.ERROR_CORRECT_L,
+    'M': qrcode.constants.ERROR_CORRECT_M,
+    'Q': qrcode.constants.ERROR_CORRECT_Q,
+    'H': qrcode.constants.ERROR_CORRECT_H,
+}
+
+
+def encode_qr(content: str, error_correction: str = 'M', border: int = 4):
+    """Encoded qrcode.QRCode for (content, error correction, border)
+
+    Data encoding, version fitting and mask-pattern selection run once per
+    key. Callers get a shallow copy sharing the cached module matrix, so
+    they can set box_size and render without touching the cached instance.
+    """
+
+    def encode():
+        qr = qrcode.QRCode(
+            version=1,
+            error_correction=ERROR_CORRECTION_LEVELS.get(
+                error_correction, qrcode.constants.ERROR_CORRECT_M
+            ),
+            box_size=10,
+            border=border,
+        )
+        qr.add_data(content)
+        qr.make(fit=True)
+        return qr
+
+    return copy.copy(
+        ENCODE_CACHE.get_or_create((content, error_correction, border), encode)
+    )
+
+
+class StageProfiler:
+    """Per-stage latency histograms for a profiled batch (``batch --profile``)
+
+    Fed one row at a time with the row's stage times; keeps every sample for
+    percentiles plus the ``top`` slowest rows (with their items) so they can
+    be re-run under cProfile and dumped to ``dump_dir``.
+    """
+
+    def __init__(self, top: int = DEFAULT_PROFILE_TOP, dump_dir: str = None):
+        self.top = top
+        self.dump_dir = dump_dir
+        self.samples = {stage: [] for stage in PROFILE_STAGES}
+        self.rows = 0
+        # Min-heap of (seconds, index, item, source) for the slowest rows
+        self._slowest = []
+
+    def record_row(
+        self, index: int, item, source: str, stage_seconds: Dict[str, float]
+    ) -> None:
+        self.rows += 1
+        for stage, seconds in stage_seconds.items():
+            self.samples.setdefault(stage, []).append(seconds)
+
+        if self.top > 0 and item is not None:
+            entry = (sum(stage_seconds.values()), index, item, source)
+            if len(self._slowest) < self.top:
+                heapq.heappush(self._slowest, entry)
+            elif entry[0] > self._slowest[0][0]:
+                heapq.heapreplace(self._slowest, entry)
+
+    def slowest_rows(self) -> List[Tuple[float, int, Any, str]]:
+        """The slowest rows, slowest first"""
+        return sorted(self._slowest, key=lambda entry: entry[0], reverse=True)
+
+    def report(self) -> None:
+        """Print per-stage totals, percentiles and latency histograms"""
+        stages = [stage for stage, values in self.samples.items() if values]
+        if not stages:
+            return
+        grand_total = sum(sum(self.samples[stage]) for stage in stages)
+
+        print(f"\n🔬 Stage profile ({self.rows} items):")
+        print(
+            f"   {'stage':<9}{'calls':>8}{'total':>10}{'share':>8}"
+            f"{'mean':>10}{'p50':>10}{'p95':>10}{'max':>10}"
+        )
+        for stage in stages:
+            values = sorted(self.samples[stage])
+            total = sum(values)
+            print(
+                f"   {stage:<9}{len(values):>8}{total:>9.2f}s"
+                f"{total / grand_total if grand_total else 0:>8.1%}"
+                f"{total / len(values) * 1000:>8.2f}ms"
+                f"{_percentile(values, 0.50) * 1000:>8.2f}ms"
+                f"{_percentile(values, 0.95) * 1000:>8.2f}ms"
+                f"{values[-1] * 1000:>8.2f}ms"
+            )
+
+        labels = [f"<{bound:g}" for bound in PROFILE_BUCKETS_MS]
+        labels.append(f">={PROFILE_BUCKETS_MS[-1]:g}")
+        print(f"\n   Latency histogram (ms):")
+        print(f"   {'stage':<9}" + "".join(f"{label:>7}" for label in labels))
+        for stage in stages:
+            counts = [0] * len(labels)
+            for seconds in self.samples[stage]:
+                counts[bisect.bisect_right(PROFILE_BUCKETS_MS, seconds * 1000)] += 1
+            print(f"   {stage:<9}" + "".join(f"{count:>7}" for count in counts))
+
+
+class VerifyReport:
+    """Outcome of the batch --verify stage: counts plus the rejected rows
+
+    Rejects are listed after the run and, with ``report_file``, written there
+    as JSON Lines (row, output name, content and reason).
+    """
+
+    def __init__(self, report_file: str = None):
+        self.report_file = report_file
+        self.verified = 0
+        self.unverified = 0
+        self.rejects = []
+
+    def record(self, result: Dict[str, Any], source: str) -> None:
+        if 'verified' not in result:
+            return
+        if result['verified'] is None:
+            self.unverified += 1
+        elif result['verified']:
+            self.verified += 1
+        else:
+            self.rejects.append(
+                {
+                    'row' if source == 'csv' else 'item': result['index'] + 1,
+                    'output': result['output'],
+                    'content': result['expected'],
+                    'reason': result['verify_error'],
+                }
+            )
+
+    def report(self) -> None:
+        print(f"\n🔍 Verification:")
+        print(f"   Decoded correctly: {self.verified}")
+        print(f"   Rejected: {len(self.rejects)}")
+        if self.unverified:
+            print(f"   Not verified (vector formats): {self.unverified}")
+
+        for reject in self.rejects[:SCAN_FAILURES_SHOWN]:
+            label = f"Row {reject['row']}" if 'row' in reject else f"Item {reject['item']}"
+            print(f"   ❌ {label} ({reject['output']}): {reject['reason']}")
+        if len(self.rejects) > SCAN_FAILURES_SHOWN:
+            print(f"   ... and {len(self.rejects) - SCAN_FAILURES_SHOWN} more")
+
+        if self.report_file:
+            with open(self.report_file, 'w', encoding='utf-8') as f:
+                for reject in self.rejects:
+                    f.write(json.dumps(reject, ensure_ascii=False) + '\n')
+            print(f"📝 Reject report saved to {self.report_file}")
+
 
 class QRBatchGenerator:
     """Enhanced batch generation with theme and color mask support"""
 
     def __init__(self, config: Dict[str, Any] = None):
         self.config = config or self.get_default_config()
+        # Module drawers and color masks shared by rows of one style
+        self.style_cache = LRUCache(STYLE_CACHE_SIZE)
+        # Output file -> digest from the previous run (incremental mode only)
+        self.output_manifest = None
+        # Callables ``hook(stage, seconds)`` told how long each step of
+        # generate_qr_code took (see PROFILE_STAGES)
+        self.stage_hooks = []
+        # Per-item stage times for batch profiling (see enable_row_profiling)
+        self.profile_rows = False
+        self.row_stages = {}
+        # Decode every rendered output back before writing it (--verify)
+        self.verify_outputs = False
+        self._scanner = None
 
     def get_default_config(self) -> Dict[str, Any]:
         """Get default configuration for batch generation"""
@@ -56,6 +606,7 @@ class QRBatchGenerator:
             'color_mask': 'solid',
             'fg_color': '#000000',
             'bg_color': '#FFFFFF',
+            'render_mode': 'resample',
         }
 
     def load_config(self, config_file: str) -> None:
@@ -119,21 +670,15 @@ class QRBatchGenerator:
             elif mask_type == 'image':
                 # ImageColorMask support
                 image_path = config.get('mask_image_path', '')
-                if image_path:
+                if image_path and not IMAGE_COLOR_MASK_AVAILABLE:
+                    print(f"Warning: ImageColorMask not available, using solid fill")
+                    return SolidFillColorMask(front_color=fg_color, back_color=bg_color)
+                elif image_path:
                     try:
-                        from qrcode.image.styles.colormasks import ImageColorMask
-
-                        mask_image = self.load_image_from_path_or_url(image_path)
+                        mask_image = self.load_cached_image(image_path)
                         return ImageColorMask(
                             back_color=bg_color, color_mask_image=mask_image
                         )
-                    except ImportError:
-                        print(
-                            f"Warning: ImageColorMask not available, using solid fill"
-                        )
-                        return SolidFillColorMask(
-                            front_color=fg_color, back_color=bg_color
-                        )
                     except Exception as e:
                         print(f"Warning: Failed to load mask image: {e}")
                         return SolidFillColorMask(
@@ -147,31 +692,152 @@ class QRBatchGenerator:
 
         return None
 
-    def add_image_overlay(self, qr_image, config):
-        """Add image overlay support to batch generation"""
-        if not config.get('use_image', False) or not config.get('image_path'):
-            return qr_image
-
+    def asset_identity(self, path_or_url: str):
+        """Identify an image asset so edits to a local file invalidate caches"""
+        if path_or_url.startswith(('http://', 'https://')):
+            return path_or_url
         try:
-            # Load overlay image
-            overlay = self.load_image_from_path_or_url(config['image_path'])
-            qr_size = qr_image.size[0]
-            overlay_size = int(qr_size * config.get('image_size', 20) / 100)
+            stat = os.stat(path_or_url)
+            return (os.path.abspath(path_or_url), stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            return path_or_url
+
+    def asset_fingerprint(self, path_or_url: str) -> str:
+        """Content hash of a local asset (URLs are identified by address)"""
+        if path_or_url.startswith(('http://', 'https://')):
+            return path_or_url
+
+        def fingerprint():
+            digest = hashlib.sha256()
+            try:
+                with open(path_or_url, 'rb') as f:
+                    for block in iter(lambda: f.read(64 * 1024), b''):
+                        digest.update(block)
+                return digest.hexdigest()
+            except OSError:
+                return f"missing:{path_or_url}"
+
+        return ASSET_CACHE.get_or_create(
+            ('fingerprint', self.asset_identity(path_or_url)), fingerprint
+        )
+
+    def output_digest(self, content: str, config: Dict[str, Any]) -> str:
+        """Hash of the content, effective config and assets behind one output"""
+        assets = {
+            key: self.asset_fingerprint(config[key])
+            for key in ('image_path', 'mask_image_path')
+            if config.get(key)
+        }
+        payload = json.dumps(
+            [OUTPUT_CACHE_VERSION, content, config, assets],
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def load_cached_image(self, path_or_url: str) -> Image.Image:
+        """Decode an image asset once per process (see ASSET_CACHE)
+
+        The returned image is shared - callers must copy it before any
+        in-place operation such as ``thumbnail``.
+        """
+
+        def load():
+            image = self.load_image_from_path_or_url(path_or_url)
+            image.load()
+            return image
+
+        return ASSET_CACHE.get_or_create(
+            ('decoded', self.asset_identity(path_or_url)), load
+        )
+
+    def get_cached_color_mask(self, config):
+        """Color mask for ``config``, reused across rows with the same style
+
+        ImageColorMask resizes its image in place when a QR code is drawn, so
+        it is rebuilt per row around the cached mask image instead.
+        """
+        mask_type = config.get('color_mask', 'solid')
+        if mask_type == 'image':
+            return self.get_enhanced_color_mask(config)
+
+        key = (
+            'color_mask',
+            mask_type,
+            str(config.get('fg_color', '#000000')).lower(),
+            str(config.get('bg_color', '#FFFFFF')).lower(),
+        )
+        return self.style_cache.get_or_create(
+            key, lambda: self.get_enhanced_color_mask(config)
+        )
 
+    def get_module_drawer(self, theme: str):
+        """Module drawer for ``theme`` (None for classic), built once per theme"""
+        return self.style_cache.get_or_create(
+            ('module_drawer', theme), lambda: self._create_module_drawer(theme)
+        )
+
+    def _create_module_drawer(self, theme: str):
+        """Build the module drawer for a theme"""
+        if theme == 'rounded':
+            return RoundedModuleDrawer()
+        elif theme == 'circular':
+            return CircleModuleDrawer()
+        elif theme == 'gapped':
+            try:
+                from decimal import Decimal
+
+                return SquareModuleDrawer(size_ratio=Decimal(0.8))
+            except Exception:
+                # Fallback if SquareModuleDrawer doesn't support size_ratio
+                return SquareModuleDrawer()
+        elif theme in ['vertical_bars', 'horizontal_bars']:
+            try:
+                # Try to import advanced drawers
+                if theme == 'vertical_bars':
+                    from qrcode.image.styles.moduledrawers import VerticalBarsDrawer
+
+                    return VerticalBarsDrawer()
+                else:
+                    from qrcode.image.styles.moduledrawers import (
+                        HorizontalBarsDrawer,
+                    )
+
+                    return HorizontalBarsDrawer()
+            except ImportError:
+                print(f"Warning: {theme} not available, using classic theme")
+                return None
+
+        return None  # classic or unknown
+
+    def get_overlay_composite(self, config, qr_size: int) -> Image.Image:
+        """Resized, padded RGBA logo for a QR code of ``qr_size`` pixels
+
+        Built once per (image, target size, padding, background) and kept in
+        the process-wide ASSET_CACHE, so a batch sharing one logo decodes and
+        resizes it exactly once.
+        """
+        image_path = config['image_path']
+        overlay_size = int(qr_size * config.get('image_size', 20) / 100)
+
+        bg_type = config.get('image_bg', 'match')
+        if bg_type in ['match', 'custom']:
+            padding = config.get('image_padding', 10)
+            if bg_type == 'match':
+                bg_color = config.get('bg_color', '#FFFFFF')
+            else:
+                bg_color = config.get('image_bg_color', '#FFFFFF')
+        else:
+            padding = bg_color = None
+
+        def build():
             # Resize overlay maintaining aspect ratio
+            overlay = self.load_cached_image(image_path).copy()
             overlay.thumbnail((overlay_size, overlay_size), Image.Resampling.LANCZOS)
 
             # Create background if specified
-            bg_type = config.get('image_bg', 'match')
-            if bg_type in ['match', 'custom']:
-                padding = config.get('image_padding', 10)
+            if bg_color is not None:
                 bg_size = overlay.size[0] + 2 * padding
-
-                if bg_type == 'match':
-                    bg_color = config.get('bg_color', '#FFFFFF')
-                else:
-                    bg_color = config.get('image_bg_color', '#FFFFFF')
-
                 background = Image.new('RGB', (bg_size, bg_size), bg_color)
 
                 # Handle transparency in overlay
@@ -188,6 +854,68 @@ class QRBatchGenerator:
             if overlay.mode != 'RGBA':
                 overlay = overlay.convert('RGBA')
 
+            return overlay
+
+        key = (
+            'overlay',
+            self.asset_identity(image_path),
+            overlay_size,
+            padding,
+            bg_color,
+        )
+        return ASSET_CACHE.get_or_create(key, build)
+
+    def render_styled(self, qr, config, theme, fg_color, bg_color):
+        """Render through StyledPilImage with the row's drawer and color mask"""
+        color_mask = self.get_cached_color_mask(config)
+
+        # Generate image based on theme with proper error handling
+        try:
+            module_drawer = self.get_module_drawer(theme)
+
+            if module_drawer is not None:
+                return qr.make_image(
+                    image_factory=TimedStyledPilImage,
+                    module_drawer=module_drawer,
+                    color_mask=color_mask,
+                    fill_color=fg_color,
+                    back_color=bg_color,
+                )
+            elif color_mask:
+                return qr.make_image(
+                    image_factory=TimedStyledPilImage,
+                    color_mask=color_mask,
+                    fill_color=fg_color,
+                    back_color=bg_color,
+                )
+            else:
+                return qr.make_image(fill_color=fg_color, back_color=bg_color)
+
+        except Exception as e:
+            print(f"Warning: Theme '{theme}' failed ({e}), using basic generation")
+            return qr.make_image(fill_color=fg_color, back_color=bg_color)
+
+    def is_plain_style(self, config) -> bool:
+        """True when a row can use the NumPy fast-path renderer
+
+        That is square modules (classic theme, or a theme that falls back to
+        it) with a solid two-color fill.
+        """
+        return (
+            NUMPY_AVAILABLE
+            and config.get('color_mask', 'solid') == 'solid'
+            and self.get_module_drawer(config.get('theme', 'classic')) is None
+        )
+
+    def add_image_overlay(self, qr_image, config):
+        """Add image overlay support to batch generation"""
+        if not config.get('use_image', False) or not config.get('image_path'):
+            return qr_image
+
+        try:
+            qr_size = qr_image.size[0]
+            overlay = self.get_overlay_composite(config, qr_size)
+
             qr_image = qr_image.convert('RGBA')
             overlay_pos = (
                 (qr_size - overlay.size[0]) // 2,
@@ -201,165 +929,607 @@ class QRBatchGenerator:
             print(f"Warning: Failed to add image overlay: {e}")
             return qr_image
 
-    def generate_from_csv(
-        self, csv_file: str, output_dir: str = "./exports/batch_output"
-    ) -> None:
-        """Enhanced CSV generation with full feature support"""
-        Path(output_dir).mkdir(parents=True, exist_ok=True)
+    def build_row_config(self, row: Dict[str, Any], index: int, messages: List[str]):
+        """Build the effective configuration for one CSV row"""
+        row_config = self.config.copy()
+
+        # Map all possible CSV columns to config
+        config_mapping = {
+            'size': ('size', int, 400),
+            'theme': ('theme', str, 'classic'),
+            'color_mask': ('color_mask', str, 'solid'),
+            'fg_color': ('fg_color', str, '#000000'),
+            'bg_color': ('bg_color', str, '#FFFFFF'),
+            'error_correction': ('error_correction', str, 'M'),
+            'border': ('border', int, 4),
+            'format': ('format', str, 'PNG'),
+            'use_image': ('use_image', bool, False),
+            'image_path': ('image_path', str, ''),
+            'image_size': ('image_size', int, 20),
+            'image_bg': ('image_bg', str, 'match'),
+            'image_bg_color': ('image_bg_color', str, '#FFFFFF'),
+            'image_padding': ('image_padding', int, 10),
+            'mask_image_path': ('mask_image_path', str, ''),
+            'render_mode': ('render_mode', str, 'resample'),
+            'png_compress_level': ('png_compress_level', int, None),
+            'reduce_colors': ('reduce_colors', int, None),
+            'quality': ('quality', int, None),
+            'webp_lossless': ('webp_lossless', bool, None),
+            'webp_method': ('webp_method', int, None),
+        }
 
-        print(f"🏭 Starting batch generation from CSV: {csv_file}")
-        print(f"📁 Output directory: {output_dir}")
+        for csv_key, (config_key, converter, default) in config_mapping.items():
+            if csv_key in row and row[csv_key]:
+                try:
+                    if converter == bool:
+                        value = row[csv_key].lower() in ['true', '1', 'yes', 'on']
+                    else:
+                        value = converter(row[csv_key])
+                    row_config[config_key] = value
+                except (ValueError, TypeError):
+                    messages.append(
+                        f"⚠️  Row {index + 1}: Invalid {csv_key} value '{row[csv_key]}', using default"
+                    )
+                    row_config[config_key] = default
+
+        return row_config
+
+    def build_item_config(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the effective configuration for one JSON item"""
+        # Override config with item-specific settings
+        item_config = self.config.copy()
+        item_config.update(item)  # JSON can contain any config keys
+        return item_config
+
+    def process_batch_item(
+        self,
+        index: int,
+        item: Dict[str, Any],
+        output_dir: str = None,
+        source: str = 'csv',
+        encode: bool = True,
+    ) -> Dict[str, Any]:
+        """Render and encode one CSV row / JSON item
+
+        Never raises - the outcome is returned as a result dict so the same
+        accounting works inline and inside pool workers. On success the
+        result carries the output name and encoded bytes (``output`` /
+        ``data``) for the caller to hand to its OutputSink; ``output_dir`` is
+        only needed to check existing files in incremental mode. With
+        ``encode=False`` raster results carry the PIL ``image`` instead, for
+        a separate encode stage (``_encode_batch_result``).
+        """
+        label = 'Row' if source == 'csv' else 'Item'
+        result = {
+            'index': index,
+            'label': f"{label} {index + 1}",
+            'success': False,
+            'messages': [],
+            'timings': {},
+        }
+        render_start = time.thread_time()
+        if self.profile_rows:
+            self.row_stages = {}
 
         try:
-            with open(csv_file, 'r', newline='', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
+            if JSON_PARSE_ERROR_KEY in item:
+                result['messages'].append(
+                    f"❌ {label} {index + 1}: Invalid JSON - {item[JSON_PARSE_ERROR_KEY]}"
+                )
+                return result
 
-                total_rows = 0
-                success_count = 0
+            # Get content and filename from row
+            content = item.get('content', item.get('text', ''))
+            filename = item.get('filename', f'qr_{index + 1:03d}')
 
-                for i, row in enumerate(reader):
-                    total_rows += 1
-                    try:
-                        # Get content and filename from row
-                        content = row.get('content', row.get('text', ''))
-                        filename = row.get('filename', f'qr_{i + 1:03d}')
-
-                        if not content:
-                            print(f"⚠️  Row {i + 1}: Empty content, skipping")
-                            continue
-
-                        # Build configuration from row with defaults
-                        row_config = self.config.copy()
-
-                        # Map all possible CSV columns to config
-                        config_mapping = {
-                            'size': ('size', int, 400),
-                            'theme': ('theme', str, 'classic'),
-                            'color_mask': ('color_mask', str, 'solid'),
-                            'fg_color': ('fg_color', str, '#000000'),
-                            'bg_color': ('bg_color', str, '#FFFFFF'),
-                            'error_correction': ('error_correction', str, 'M'),
-                            'border': ('border', int, 4),
-                            'format': ('format', str, 'PNG'),
-                            'use_image': ('use_image', bool, False),
-                            'image_path': ('image_path', str, ''),
-                            'image_size': ('image_size', int, 20),
-                            'image_bg': ('image_bg', str, 'match'),
-                            'image_bg_color': ('image_bg_color', str, '#FFFFFF'),
-                            'image_padding': ('image_padding', int, 10),
-                            'mask_image_path': ('mask_image_path', str, ''),
-                        }
-
-                        for csv_key, (
-                            config_key,
-                            converter,
-                            default,
-                        ) in config_mapping.items():
-                            if csv_key in row and row[csv_key]:
-                                try:
-                                    if converter == bool:
-                                        value = row[csv_key].lower() in [
-                                            'true',
-                                            '1',
-                                            'yes',
-                                            'on',
-                                        ]
-                                    else:
-                                        value = converter(row[csv_key])
-                                    row_config[config_key] = value
-                                except (ValueError, TypeError):
-                                    print(
-                                        f"⚠️  Row {i + 1}: Invalid {csv_key} value '{row[csv_key]}', using default"
-                                    )
-                                    row_config[config_key] = default
-
-                        # Generate QR code
-                        qr_image = self.generate_qr_code(content, row_config)
-
-                        # Save image
-                        output_path = (
-                            Path(output_dir)
-                            / f"{filename}.{row_config['format'].lower()}"
-                        )
-                        qr_image.save(output_path)
+            if not content:
+                result['messages'].append(
+                    f"⚠️  {label} {index + 1}: Empty content, skipping"
+                )
+                return result
 
-                        print(f"✅ Row {i + 1}: Generated {output_path.name}")
-                        success_count += 1
+            # Build configuration from row with defaults
+            if source == 'csv':
+                item_config = self.build_row_config(item, index, result['messages'])
+            else:
+                item_config = self.build_item_config(item)
+
+            output_format = item_config.get('format', 'PNG').upper()
+            output_name = f"{filename}.{output_format.lower()}"
+            result['output'] = output_name
+            if self.verify_outputs:
+                result['expected'] = content
+
+            if self.output_manifest is not None:
+                result['digest'] = self.output_digest(content, item_config)
+                if (
+                    self.output_manifest.get(output_name) == result['digest']
+                    and (Path(output_dir) / output_name).exists()
+                ):
+                    result['messages'].append(
+                        f"⏭️  {label} {index + 1}: Unchanged, kept {output_name}"
+                    )
+                    result['success'] = True
+                    result['skipped'] = True
+                    return result
+
+            if output_format in VECTOR_FORMATS:
+                if output_format != 'SVG' and not self.is_print_style(item_config):
+                    result['messages'].append(
+                        f"⚠️  {label} {index + 1}: {output_format} uses classic "
+                        f"square modules in flat colors"
+                    )
+                result['data'] = self.generate_vector(
+                    content, item_config, output_format
+                )
+            else:
+                # Generate QR code
+                qr_image = self.generate_qr_code(content, item_config)
+                if encode:
+                    encode_start = time.thread_time()
+                    result['data'] = encode_image(
+                        qr_image, output_name, encoder_options(item_config)
+                    )
+                    result['timings']['encode'] = time.thread_time() - encode_start
+                else:
+                    result['image'] = qr_image
+                    result['encoder'] = encoder_options(item_config)
 
-                    except Exception as e:
-                        print(f"❌ Row {i + 1}: Error - {e}")
+            result['success'] = True
+
+        except Exception as e:
+            result['messages'].append(f"❌ {label} {index + 1}: Error - {e}")
+
+        result['timings']['render'] = (
+            time.thread_time() - render_start - result['timings'].get('encode', 0.0)
+        )
+        if self.verify_outputs and encode:
+            self._verify_batch_result(result)
+        if self.profile_rows:
+            result['profile'] = self.row_stages
+            result['item'] = item
+        return result
+
+    def run_batch(
+        self,
+        items: Iterable[Dict[str, Any]],
+        sink: OutputSink,
+        source: str = 'csv',
+        workers: int = 1,
+        chunksize: int = DEFAULT_BATCH_CHUNKSIZE,
+        ordered: bool = True,
+        incremental: bool = False,
+        prune: bool = False,
+        profiler: StageProfiler = None,
+        verifier: 'VerifyReport' = None,
+    ) -> Tuple[int, int, Dict[str, float]]:
+        """Process batch items as a read -> render -> encode -> write pipeline
+
+        The calling thread reads items and renders them; encoding and writing
+        to ``sink`` run behind it on BatchStage threads joined by bounded
+        queues, so a slow disk only stalls rendering once the queues fill.
+        With ``workers > 1`` rendering and encoding move to a
+        ``multiprocessing.Pool`` instead: rows are dispatched in chunks of
+        ``chunksize`` and every worker builds its own ``QRBatchGenerator``
+        once. ``ordered=False`` reports rows as they complete instead of in
+        input order. Returns ``(total, successful, stage_seconds)``.
+
+        ``incremental=True`` skips rows whose output is already in the output
+        directory's manifest with the same digest (see ``output_digest``);
+        ``prune=True`` also deletes manifest-tracked outputs that no row
+        produced this run. Both need a directory sink.
+
+        With a ``profiler`` every item's generation stages (stage_hooks) plus
+        its save and write times are recorded in it. With a ``verifier``
+        every raster output is decoded back before it is written, on its own
+        stage thread (or in the pool workers); mismatches are not written and
+        are collected in the verifier's reject report.
+        """
+        incremental = incremental or prune
+        output_dir = sink.directory
+        if incremental and output_dir is None:
+            raise ValueError("Incremental runs need a directory output")
+        previous = load_output_manifest(output_dir) if incremental else None
+        self.output_manifest = previous
+        if profiler is not None:
+            self.enable_row_profiling()
+        if verifier is not None:
+            self.enable_verification()
+
+        started = time.perf_counter()
+        stage_seconds = dict.fromkeys(BATCH_STAGES, 0.0)
+        tasks = (
+            (index, item, output_dir, source)
+            for index, item in enumerate(_timed_iter(items, stage_seconds, 'read'))
+        )
+
+        tally = {'total': 0, 'success': 0, 'skipped': 0}
+        # Outputs written or confirmed this run, and every output name seen
+        current = {}
+        seen = set()
+
+        def write(result):
+            # Runs on the writer thread - the only one touching the sink,
+            # the tallies and stdout until the pipeline is drained
+            write_start = time.perf_counter()
+            self._write_batch_result(sink, result)
+            write_seconds = time.perf_counter() - write_start
+            stage_seconds['write'] += write_seconds
+            timings = result.pop('timings', {})
+            for stage, seconds in timings.items():
+                stage_seconds[stage] += seconds
+
+            if verifier is not None:
+                verifier.record(result, source)
+
+            row_stages = result.pop('profile', None)
+            item = result.pop('item', None)
+            if profiler is not None and row_stages is not None:
+                if 'encode' in timings:
+                    row_stages['save'] = timings['encode']
+                if 'verify' in timings:
+                    row_stages['verify'] = timings['verify']
+                row_stages['write'] = write_seconds
+                profiler.record_row(result['index'], item, source, row_stages)
+
+            tally['total'] += 1
+            tally['success'] += self._report_batch_result(result)
+            if 'output' in result:
+                seen.add(result['output'])
+            if result['success'] and 'digest' in result:
+                current[result['output']] = result['digest']
+                tally['skipped'] += result.get('skipped', False)
+
+        writer = BatchStage('write', write)
+        stages = [writer]
+        if workers <= 1:
+            if self.verify_outputs:
+                verify = BatchStage('verify', self._verify_batch_result, writer)
+                stages.insert(0, verify)
+            encoder = BatchStage('encode', self._encode_batch_result, stages[0])
+            stages.insert(0, encoder)
+            results = (self.process_batch_item(*task, encode=False) for task in tasks)
+        else:
+            print(f"⚙️  Using {workers} worker processes (chunksize {chunksize})")
+            results = self._iter_parallel_results(tasks, workers, chunksize, ordered)
+
+        completed = False
+        try:
+            for result in results:
+                stages[0].put(result)
+            completed = True
+        finally:
+            # Drain queued results in pipeline order before touching the tallies;
+            # every stage is stopped even if an earlier one failed
+            stage_error = None
+            for stage in stages:
+                try:
+                    stage.finish()
+                except Exception as e:
+                    stage_error = stage_error or e
+            stage_seconds['wall'] = time.perf_counter() - started
+
+            self.output_manifest = None
+            if incremental:
+                # Failed rows drop out of the manifest so they are retried;
+                # rows not seen are orphans, pruned only after a full run
+                outputs = {
+                    name: digest
+                    for name, digest in previous.items()
+                    if name not in seen
+                }
+                pruned = 0
+                if prune and completed:
+                    pruned = prune_outputs(output_dir, outputs)
+                    outputs = {}
+                outputs.update(current)
+                save_output_manifest(output_dir, outputs)
 
-                print(f"\n📊 Batch Generation Complete:")
-                print(f"   Total rows: {total_rows}")
-                print(f"   Successful: {success_count}")
-                print(f"   Failed: {total_rows - success_count}")
                 print(
-                    f"   Success rate: {(success_count / total_rows) * 100:.1f}%"
-                    if total_rows > 0
-                    else "   No rows processed"
+                    f"♻️  Incremental: {tally['skipped']} unchanged, "
+                    f"{len(current) - tally['skipped']} generated"
+                    + (f", {pruned} pruned" if prune else "")
                 )
 
+            if not completed or stage_error is not None:
+                # Callers summarize finished runs; show how far an aborted
+                # one got before its error propagates
+                self._print_batch_summary(
+                    tally['total'],
+                    tally['success'],
+                    'row' if source == 'csv' else 'item',
+                    stage_seconds,
+                    title="Batch Generation Stopped",
+                )
+
+            if stage_error is not None:
+                raise stage_error
+
+        return tally['total'], tally['success'], stage_seconds
+
+    def _iter_parallel_results(self, tasks, workers, chunksize, ordered):
+        """Dispatch task chunks to a process pool and yield per-item results
+
+        At most ``workers * BATCH_CHUNKS_IN_FLIGHT`` chunks are submitted at
+        any time, so input is read from ``tasks`` only as fast as the pool
+        drains it and memory stays bounded for arbitrarily large inputs.
+        """
+        completed = queue.Queue()
+        max_in_flight = workers * BATCH_CHUNKS_IN_FLIGHT
+        # Chunks finished ahead of their turn (ordered mode only)
+        finished = {}
+        next_seq = 0
+        in_flight = 0
+
+        with multiprocessing.Pool(
+            processes=workers,
+            initializer=_init_batch_worker,
+            initargs=(
+                self.config,
+                self.output_manifest,
+                self.profile_rows,
+                self.verify_outputs,
+            ),
+        ) as pool:
+
+            def wait_for_chunk():
+                nonlocal next_seq, in_flight
+                seq, chunk_results = completed.get()
+                in_flight -= 1
+                if not ordered:
+                    return chunk_results
+                finished[seq] = chunk_results
+                ready = []
+                while next_seq in finished:
+                    ready.extend(finished.pop(next_seq))
+                    next_seq += 1
+                return ready
+
+            for seq, chunk in enumerate(_chunked(tasks, chunksize)):
+                pool.apply_async(
+                    _run_batch_chunk,
+                    (chunk,),
+                    callback=functools.partial(_put_chunk, completed, seq),
+                    error_callback=functools.partial(
+                        _put_failed_chunk, completed, seq, chunk
+                    ),
+                )
+                in_flight += 1
+                while in_flight >= max_in_flight:
+                    yield from wait_for_chunk()
+
+            while in_flight:
+                yield from wait_for_chunk()
+
+    def _encode_batch_result(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Encode stage - turn a rendered ``image`` into output bytes"""
+        image = result.pop('image', None)
+        if image is None:
+            return result
+        encode_start = time.thread_time()
+        try:
+            result['data'] = encode_image(
+                image, result['output'], result.pop('encoder', None)
+            )
         except Exception as e:
-            print(f"❌ Error reading CSV file: {e}")
+            result['success'] = False
+            result['messages'].append(f"❌ {result['label']}: Error - {e}")
+        result['timings']['encode'] = time.thread_time() - encode_start
+        return result
+
+    def enable_verification(self) -> None:
+        """Decode every batch output back and reject rows that do not match
+
+        Outputs are handed to the decoder as NumPy arrays, so numpy is
+        required whichever backend decodes them.
+        """
+        if not NUMPY_AVAILABLE:
+            raise ImportError("Output verification requires numpy")
+        self.verify_outputs = True
+        if self._scanner is None:
+            self._scanner = QRScanner()
+
+    def _verify_batch_result(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Verify stage - decode the encoded output in memory
+
+        The output is read through the scanner's preprocessing cascade, as
+        ``scan`` would read the file. The row is rejected (its bytes dropped,
+        so nothing is written) unless one of the decoded codes equals the
+        row's content. Vector outputs are not rasterized and pass unverified.
+        """
+        data = result.get('data')
+        if data is None or 'expected' not in result:
+            return result
+        if Path(result['output']).suffix.lstrip('.').upper() in VECTOR_FORMATS:
+            result['verified'] = None
+            return result
+
+        verify_start = time.thread_time()
+        try:
+            image = np.asarray(Image.open(io.BytesIO(data)).convert('L'))
+            codes = self._scanner.decoder.decode(image)[0]
+            decoded = [code['content'] for code in codes]
+            if result['expected'] in decoded:
+                reason = None
+            elif decoded:
+                reason = f"decoded {decoded[0]!r} instead of the content"
+            else:
+                reason = 'no QR code found'
+        except Exception as e:
+            reason = f"decode error - {e}"
+        result['timings']['verify'] = time.thread_time() - verify_start
+
+        result['verified'] = reason is None
+        if reason is not None:
+            del result['data']
+            result['success'] = False
+            result['verify_error'] = reason
+            result['messages'].append(
+                f"❌ {result['label']}: Verification failed, {reason} "
+                f"({result['output']} not written)"
+            )
+        return result
 
-    def generate_from_json(
-        self, json_file: str, output_dir: str = "./exports/batch_output"
+    def _write_batch_result(self, sink: OutputSink, result: Dict[str, Any]) -> None:
+        """Hand a rendered item's bytes to the sink and record the outcome"""
+        data = result.pop('data', None)
+        if data is None:
+            return
+        try:
+            sink.write(result['output'], data)
+            result['messages'].append(
+                f"✅ {result['label']}: Generated {result['output']}"
+            )
+        except Exception as e:
+            result['success'] = False
+            result['messages'].append(f"❌ {result['label']}: Write error - {e}")
+
+    def _report_batch_result(self, result: Dict[str, Any]) -> int:
+        """Print messages collected for one batch item"""
+        for message in result['messages']:
+            print(message)
+        return 1 if result['success'] else 0
+
+    def _print_batch_summary(
+        self,
+        total: int,
+        success_count: int,
+        noun: str,
+        stage_seconds: Dict[str, float] = None,
+        title: str = "Batch Generation Complete",
+    ):
+        """Print the final batch summary"""
+        print(f"\n📊 {title}:")
+        print(f"   Total {noun}s: {total}")
+        print(f"   Successful: {success_count}")
+        print(f"   Failed: {total - success_count}")
+        print(
+            f"   Success rate: {(success_count / total) * 100:.1f}%"
+            if total > 0
+            else f"   No {noun}s processed"
+        )
+        if stage_seconds:
+            stages = ", ".join(
+                f"{stage} {stage_seconds[stage]:.2f}s"
+                for stage in BATCH_STAGES
+                if stage_seconds[stage] or stage not in OPTIONAL_BATCH_STAGES
+            )
+            print(f"   Stage time: {stages}")
+            print(
+                f"   Wall time: {stage_seconds['wall']:.2f}s"
+                + (
+                    f" ({total / stage_seconds['wall']:.0f} {noun}s/s)"
+                    if stage_seconds['wall'] > 0
+                    else ""
+                )
+            )
+
+    def generate_from_csv(
+        self,
+        csv_file: str,
+        output_dir: str = "./exports/batch_output",
+        workers: int = 1,
+        chunksize: int = DEFAULT_BATCH_CHUNKSIZE,
+        ordered: bool = True,
+        incremental: bool = False,
+        prune: bool = False,
+        sink_type: str = None,
+        shard_size: int = DEFAULT_SHARD_SIZE,
+        profiler: StageProfiler = None,
+        verifier: 'VerifyReport' = None,
     ) -> None:
-        """Enhanced JSON generation with full feature support"""
-        Path(output_dir).mkdir(parents=True, exist_ok=True)
+        """Enhanced CSV generation with full feature support
 
-        print(f"🏭 Starting batch generation from JSON: {json_file}")
-        print(f"📁 Output directory: {output_dir}")
+        ``output_dir`` may also name a ZIP/tar archive or a shard directory,
+        see ``qr_sinks.open_sink``.
+        """
+        print(f"🏭 Starting batch generation from CSV: {csv_file}")
 
         try:
-            with open(json_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            with open(csv_file, 'r', newline='', encoding='utf-8') as f, open_sink(
+                output_dir, sink_type, shard_size
+            ) as sink:
+                print(sink.description)
+                reader = csv.DictReader(f)
 
-            # Handle both list of objects and single object
-            if isinstance(data, dict):
-                data = [data]
+                total_rows, success_count, stage_seconds = self.run_batch(
+                    reader,
+                    sink,
+                    'csv',
+                    workers,
+                    chunksize,
+                    ordered,
+                    incremental,
+                    prune,
+                    profiler,
+                    verifier,
+                )
 
-            total_items = len(data)
-            success_count = 0
+                self._print_batch_summary(
+                    total_rows, success_count, 'row', stage_seconds
+                )
 
-            for i, item in enumerate(data):
-                try:
-                    content = item.get('content', item.get('text', ''))
-                    filename = item.get('filename', f'qr_{i + 1:03d}')
+            if verifier is not None:
+                verifier.report()
 
-                    if not content:
-                        print(f"⚠️  Item {i + 1}: Empty content, skipping")
-                        continue
+            if profiler is not None:
+                profiler.report()
+                self.profile_slowest_rows(profiler)
 
-                    # Override config with item-specific settings
-                    item_config = self.config.copy()
-                    item_config.update(item)  # JSON can contain any config keys
+        except Exception as e:
+            print(f"❌ Error reading CSV file: {e}")
 
-                    # Generate QR code
-                    qr_image = self.generate_qr_code(content, item_config)
+    def generate_from_json(
+        self,
+        json_file: str,
+        output_dir: str = "./exports/batch_output",
+        workers: int = 1,
+        chunksize: int = DEFAULT_BATCH_CHUNKSIZE,
+        ordered: bool = True,
+        incremental: bool = False,
+        prune: bool = False,
+        sink_type: str = None,
+        shard_size: int = DEFAULT_SHARD_SIZE,
+        profiler: StageProfiler = None,
+        verifier: 'VerifyReport' = None,
+    ) -> None:
+        """Enhanced JSON generation with full feature support
 
-                    # Save image
-                    output_path = (
-                        Path(output_dir)
-                        / f"{filename}.{item_config.get('format', 'PNG').lower()}"
-                    )
-                    qr_image.save(output_path)
+        Accepts a JSON array, a single JSON object or JSON Lines
+        (``.jsonl``/``.ndjson``). Items are parsed incrementally, so memory
+        use does not grow with the size of the input file. ``output_dir``
+        may also name an archive, as in ``generate_from_csv``.
+        """
+        print(f"🏭 Starting batch generation from JSON: {json_file}")
 
-                    print(f"✅ Item {i + 1}: Generated {output_path.name}")
-                    success_count += 1
+        try:
+            items = iter_json_items(json_file)
+
+            with open_sink(output_dir, sink_type, shard_size) as sink:
+                print(sink.description)
+                total_items, success_count, stage_seconds = self.run_batch(
+                    items,
+                    sink,
+                    'json',
+                    workers,
+                    chunksize,
+                    ordered,
+                    incremental,
+                    prune,
+                    profiler,
+                    verifier,
+                )
 
-                except Exception as e:
-                    print(f"❌ Item {i + 1}: Error - {e}")
+                self._print_batch_summary(
+                    total_items, success_count, 'item', stage_seconds
+                )
 
-            print(f"\n📊 Batch Generation Complete:")
-            print(f"   Total items: {total_items}")
-            print(f"   Successful: {success_count}")
-            print(f"   Failed: {total_items - success_count}")
-            print(
-                f"   Success rate: {(success_count / total_items) * 100:.1f}%"
-                if total_items > 0
-                else "   No items processed"
-            )
+            if verifier is not None:
+                verifier.report()
+
+            if profiler is not None:
+                profiler.report()
+                self.profile_slowest_rows(profiler)
 
         except Exception as e:
             print(f"❌ Error reading JSON file: {e}")
@@ -367,141 +1537,479 @@ class QRBatchGenerator:
     def generate_qr_code(
         self, content: str, config: Dict[str, Any] = None
     ) -> Image.Image:
-        """Generate a single QR code with enhanced configuration support"""
+        """Generate a single QR code with enhanced configuration support
+
+        Each step (see PROFILE_STAGES) is timed and reported to
+        ``stage_hooks``.
+        """
         if config is None:
             config = self.config
 
-        # Error correction mapping
-        error_levels = {
-            'L': qrcode.constants.ERROR_CORRECT_L,
-            'M': qrcode.constants.ERROR_CORRECT_M,
-            'Q': qrcode.constants.ERROR_CORRECT_Q,
-            'H': qrcode.constants.ERROR_CORRECT_H,
-        }
-
-        qr = qrcode.QRCode(
-            version=1,
-            error_correction=error_levels.get(
-                config.get('error_correction', 'M'), qrcode.constants.ERROR_CORRECT_M
-            ),
-            box_size=10,
-            border=config.get('border', 4),
+        start = time.perf_counter()
+        qr = encode_qr(
+            content, config.get('error_correction', 'M'), config.get('border', 4)
         )
+        start = self.report_stage('encode', start)
 
-        qr.add_data(content)
-        qr.make(fit=True)
+        # Pick the box size up front so the image comes out at target size
+        target_size = config.get('size', 400)
+        render_mode = config.get('render_mode', 'resample')
+        if render_mode == 'exact':
+            qr.box_size = exact_box_size(qr.modules_count, qr.border, target_size)
 
         # Get colors
         fg_color = config.get('fg_color', '#000000')
         bg_color = config.get('bg_color', '#FFFFFF')
 
-        # Apply theme and color mask
+        # Apply theme and color mask (shared with other rows of the same style)
         theme = config.get('theme', 'classic')
-        color_mask = self.get_enhanced_color_mask(config)
 
-        # Generate image based on theme with proper error handling
-        try:
-            if theme == 'rounded':
-                qr_image = qr.make_image(
-                    image_factory=StyledPilImage,
-                    module_drawer=RoundedModuleDrawer(),
-                    color_mask=color_mask,
-                    fill_color=fg_color,
-                    back_color=bg_color,
-                )
-            elif theme == 'circular':
-                qr_image = qr.make_image(
-                    image_factory=StyledPilImage,
-                    module_drawer=CircleModuleDrawer(),
-                    color_mask=color_mask,
-                    fill_color=fg_color,
-                    back_color=bg_color,
-                )
-            elif theme == 'gapped':
-                try:
-                    from decimal import Decimal
-
-                    qr_image = qr.make_image(
-                        image_factory=StyledPilImage,
-                        module_drawer=SquareModuleDrawer(size_ratio=Decimal(0.8)),
-                        color_mask=color_mask,
-                        fill_color=fg_color,
-                        back_color=bg_color,
-                    )
-                except Exception:
-                    # Fallback if SquareModuleDrawer doesn't support size_ratio
-                    qr_image = qr.make_image(
-                        image_factory=StyledPilImage,
-                        module_drawer=SquareModuleDrawer(),
-                        color_mask=color_mask,
-                        fill_color=fg_color,
-                        back_color=bg_color,
-                    )
-            elif theme in ['vertical_bars', 'horizontal_bars']:
-                try:
-                    # Try to import advanced drawers
-                    if theme == 'vertical_bars':
-                        from qrcode.image.styles.moduledrawers import VerticalBarsDrawer
+        if self.is_plain_style(config):
+            # Square modules in two flat colors - skip StyledPilImage entirely
+            qr_image = render_module_matrix(
+                qr.modules,
+                qr.border,
+                qr.box_size,
+                self.hex_to_rgb(fg_color),
+                self.hex_to_rgb(bg_color),
+                target_size if render_mode == 'exact' else None,
+            )
+            if render_mode != 'exact':
+                # Palette images would be resized with NEAREST, not LANCZOS
+                qr_image = qr_image.convert('RGB')
+            start = self.report_stage('draw', start)
+        else:
+            qr_image = self.render_styled(qr, config, theme, fg_color, bg_color)
+            # The color mask runs inside make_image; split it out of drawing
+            mask_seconds = getattr(qr_image, 'process_seconds', 0.0)
+            self.report_stage('draw', start + mask_seconds)
+            if mask_seconds:
+                self.report_stage('mask', time.perf_counter() - mask_seconds)
+            start = time.perf_counter()
+
+        # Bring to target size
+        if render_mode == 'exact':
+            qr_image = fit_to_size(qr_image, target_size, bg_color)
+        else:
+            qr_image = qr_image.resize(
+                (target_size, target_size), Image.Resampling.LANCZOS
+            )
+        start = self.report_stage('resize', start)
 
-                        drawer = VerticalBarsDrawer()
-                    else:
-                        from qrcode.image.styles.moduledrawers import (
-                            HorizontalBarsDrawer,
-                        )
+        # Add image overlay if configured
+        if config.get('use_image', False) and config.get('image_path'):
+            qr_image = self.add_image_overlay(qr_image, config)
+            self.report_stage('overlay', start)
 
-                        drawer = HorizontalBarsDrawer()
+        return qr_image
 
-                    qr_image = qr.make_image(
-                        image_factory=StyledPilImage,
-                        module_drawer=drawer,
-                        color_mask=color_mask,
-                        fill_color=fg_color,
-                        back_color=bg_color,
-                    )
-                except ImportError:
-                    print(f"Warning: {theme} not available, using classic theme")
-                    if color_mask:
-                        qr_image = qr.make_image(
-                            image_factory=StyledPilImage,
-                            color_mask=color_mask,
-                            fill_color=fg_color,
-                            back_color=bg_color,
-                        )
-                    else:
-                        qr_image = qr.make_image(
-                            fill_color=fg_color, back_color=bg_color
-                        )
-            else:  # classic or unknown
-                if color_mask:
-                    qr_image = qr.make_image(
-                        image_factory=StyledPilImage,
-                        color_mask=color_mask,
-                        fill_color=fg_color,
-                        back_color=bg_color,
-                    )
-                else:
-                    qr_image = qr.make_image(fill_color=fg_color, back_color=bg_color)
+    def report_stage(self, stage: str, start: float) -> float:
+        """Pass the time since ``start`` to every stage hook; returns now"""
+        now = time.perf_counter()
+        for hook in self.stage_hooks:
+            hook(stage, now - start)
+        return now
+
+    def enable_row_profiling(self) -> None:
+        """Collect each batch item's stage times into its result's ``profile``"""
+        if not self.profile_rows:
+            self.profile_rows = True
+            self.stage_hooks.append(self._record_row_stage)
+
+    def _record_row_stage(self, stage: str, seconds: float) -> None:
+        self.row_stages[stage] = self.row_stages.get(stage, 0.0) + seconds
+
+    def profile_slowest_rows(self, profiler: 'StageProfiler') -> None:
+        """Re-run the profiler's slowest rows under cProfile and dump pstats
+
+        The encode cache is cleared before each row so the dump shows a
+        cold render; outputs are rendered and encoded but not written.
+        """
+        rows = profiler.slowest_rows()
+        if not rows or not profiler.dump_dir:
+            return
 
-        except Exception as e:
-            print(f"Warning: Theme '{theme}' failed ({e}), using basic generation")
-            qr_image = qr.make_image(fill_color=fg_color, back_color=bg_color)
+        dump_dir = Path(profiler.dump_dir)
+        dump_dir.mkdir(parents=True, exist_ok=True)
+        manifest, self.output_manifest = self.output_manifest, None
+
+        print(f"\n🐢 cProfile of the {len(rows)} slowest item(s):")
+        dumps = []
+        for seconds, index, item, source in rows:
+            ENCODE_CACHE.clear()
+            profile = cProfile.Profile()
+            profile.enable()
+            self.process_batch_item(index, item, None, source)
+            profile.disable()
+
+            dump_path = dump_dir / f"item_{index + 1:06d}.pstats"
+            profile.dump_stats(dump_path)
+            dumps.append(dump_path)
+            label = 'Row' if source == 'csv' else 'Item'
+            print(f"   {label} {index + 1}: {seconds * 1000:.1f}ms -> {dump_path}")
+
+        self.output_manifest = manifest
+        print(f"\nTop functions of the slowest item ({dumps[0].name}):")
+        pstats.Stats(str(dumps[0])).sort_stats('cumulative').print_stats(
+            PROFILE_PRINT_FUNCTIONS
+        )
+        print("💡 Explore a dump with: python -m pstats <file>")
 
-        # Resize to target size
-        target_size = config.get('size', 400)
-        qr_image = qr_image.resize((target_size, target_size), Image.Resampling.LANCZOS)
+    def generate_svg(self, content: str, config: Dict[str, Any] = None) -> str:
+        """Generate a single QR code as a vector SVG document (see qr_svg)"""
+        if config is None:
+            config = self.config
 
-        # Add image overlay if configured
-        qr_image = self.add_image_overlay(qr_image, config)
+        qr = encode_qr(
+            content, config.get('error_correction', 'M'), config.get('border', 4)
+        )
 
-        return qr_image
+        overlay_image = mask_image = None
+        if config.get('use_image', False) and config.get('image_path'):
+            try:
+                overlay_image = self.load_cached_image(config['image_path'])
+            except Exception as e:
+                print(f"Warning: Failed to add image overlay: {e}")
+        if config.get('color_mask') == 'image' and config.get('mask_image_path'):
+            try:
+                mask_image = self.load_cached_image(config['mask_image_path'])
+            except Exception as e:
+                print(f"Warning: Failed to load mask image: {e}")
+
+        return render_svg(qr.modules, qr.border, config, overlay_image, mask_image)
+
+    def generate_vector(
+        self, content: str, config: Dict[str, Any], output_format: str
+    ) -> bytes:
+        """Encoded file contents for one of VECTOR_FORMATS"""
+        if output_format == 'SVG':
+            return self.generate_svg(content, config).encode('utf-8')
+
+        qr = encode_qr(
+            content, config.get('error_correction', 'M'), config.get('border', 4)
+        )
+        if output_format == 'PDF':
+            return render_pdf(qr.modules, qr.border, config)
+        return render_eps(qr.modules, qr.border, config).encode('ascii')
+
+    def is_print_style(self, config: Dict[str, Any]) -> bool:
+        """Whether PDF/EPS output can reproduce this style exactly"""
+        return (
+            config.get('theme', 'classic') == 'classic'
+            and config.get('color_mask', 'solid') == 'solid'
+            and not (config.get('use_image', False) and config.get('image_path'))
+        )
+
+
+# Per-process generator used by batch pool workers (see QRBatchGenerator.run_batch)
+_WORKER_GENERATOR = None
+
+
+def _init_batch_worker(
+    config: Dict[str, Any],
+    output_manifest: Dict[str, str] = None,
+    profile_rows: bool = False,
+    verify_outputs: bool = False,
+) -> None:
+    """Pool initializer - build the worker's QRBatchGenerator once"""
+    global _WORKER_GENERATOR
+    _WORKER_GENERATOR = QRBatchGenerator(config)
+    _WORKER_GENERATOR.output_manifest = output_manifest
+    if profile_rows:
+        _WORKER_GENERATOR.enable_row_profiling()
+    if verify_outputs:
+        _WORKER_GENERATOR.enable_verification()
+
+
+def _run_batch_chunk(chunk) -> List[Dict[str, Any]]:
+    """Pool task - process a chunk of batch items with the worker's generator"""
+    return [_WORKER_GENERATOR.process_batch_item(*task) for task in chunk]
+
+
+def _put_chunk(completed: queue.Queue, seq: int, chunk_results) -> None:
+    """Pool callback - hand finished chunk results to the dispatching thread"""
+    completed.put((seq, chunk_results))
+
+
+def _put_failed_chunk(completed: queue.Queue, seq: int, chunk, error) -> None:
+    """Pool error callback - report every item of a crashed chunk as failed"""
+    completed.put(
+        (
+            seq,
+            [
+                {
+                    'index': task[0],
+                    'success': False,
+                    'messages': [
+                        f"❌ {'Row' if task[3] == 'csv' else 'Item'} {task[0] + 1}: "
+                        f"Worker error - {error}"
+                    ],
+                }
+                for task in chunk
+            ],
+        )
+    )
+
+
+class BatchStage(threading.Thread):
+    """Pipeline stage thread fed through a bounded queue
+
+    Applies ``func`` to every item ``put`` on it and passes the return value
+    on to ``downstream`` (if any). ``put`` blocks while the queue is full,
+    which is what bounds memory and pushes back on earlier stages.
+
+    If ``func`` (or a downstream stage) raises, the first exception is kept
+    in ``error`` and the thread keeps draining its queue without processing,
+    so upstream stages never block on it. ``put`` then re-raises the error
+    to stop the producer, and ``finish`` re-raises it once the thread ends.
+    """
+
+    _DONE = object()
+
+    def __init__(self, name: str, func, downstream: 'BatchStage' = None):
+        super().__init__(name=f"batch-{name}", daemon=True)
+        self.func = func
+        self.downstream = downstream
+        self.queue = queue.Queue(maxsize=BATCH_STAGE_QUEUE_SIZE)
+        self.error = None
+        self.start()
+
+    def put(self, item) -> None:
+        if self.error is not None:
+            raise self.error
+        self.queue.put(item)
+
+    def finish(self) -> None:
+        """Process everything queued so far, then stop the thread"""
+        self.queue.put(self._DONE)
+        self.join()
+        if self.error is not None:
+            raise self.error
+
+    def run(self):
+        while True:
+            item = self.queue.get()
+            if item is self._DONE:
+                return
+            if self.error is not None:
+                continue
+            try:
+                item = self.func(item)
+                if self.downstream is not None:
+                    self.downstream.put(item)
+            except Exception as e:
+                self.error = e
+
+
+def _timed_iter(iterable: Iterable, seconds: Dict[str, float], key: str) -> Iterator:
+    """Yield from ``iterable``, adding the time spent in ``next`` to seconds[key]"""
+    iterator = iter(iterable)
+    while True:
+        start = time.perf_counter()
+        try:
+            item = next(iterator)
+        except StopIteration:
+            return
+        finally:
+            seconds[key] += time.perf_counter() - start
+        yield item
+
+
+def _chunked(iterable: Iterable, size: int) -> Iterator[list]:
+    """Yield lists of up to ``size`` items without materializing the input"""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def load_output_manifest(output_dir: str) -> Dict[str, str]:
+    """Output file -> digest recorded by the last incremental run"""
+    manifest_path = Path(output_dir) / OUTPUT_MANIFEST_NAME
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        print(f"⚠️  Ignoring unreadable manifest {manifest_path}: {e}")
+        return {}
+
+    if manifest.get('version') != OUTPUT_CACHE_VERSION:
+        return {}
+    return manifest.get('outputs', {})
+
+
+def save_output_manifest(output_dir: str, outputs: Dict[str, str]) -> None:
+    """Atomically replace the output directory's manifest"""
+    manifest_path = Path(output_dir) / OUTPUT_MANIFEST_NAME
+    temp_path = manifest_path.with_name(manifest_path.name + '.tmp')
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump({'version': OUTPUT_CACHE_VERSION, 'outputs': outputs}, f)
+    os.replace(temp_path, manifest_path)
+
+
+def prune_outputs(output_dir: str, outputs: Dict[str, str]) -> int:
+    """Delete the given manifest-tracked outputs, returning how many existed"""
+    root = Path(output_dir).resolve()
+    pruned = 0
+    for name in outputs:
+        path = (root / name).resolve()
+        # Never follow a manifest entry out of the output directory
+        if root not in path.parents:
+            continue
+        try:
+            path.unlink()
+            pruned += 1
+        except FileNotFoundError:
+            pass
+    return pruned
+
+
+def iter_json_items(json_file: str) -> Iterator[Dict[str, Any]]:
+    """Stream batch items from a JSON array, a single object or JSON Lines
+
+    JSON Lines files yield one item per non-blank line; a line that fails to
+    parse yields a placeholder carrying ``JSON_PARSE_ERROR_KEY`` so it is
+    reported as a failed item instead of aborting the batch.
+    """
+    if Path(json_file).suffix.lower() in JSON_LINES_SUFFIXES:
+        with open(json_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError as e:
+                    yield {JSON_PARSE_ERROR_KEY: str(e)}
+        return
+
+    with open(json_file, 'r', encoding='utf-8') as f:
+        prefix = ''
+        first = f.read(1)
+        while first and first.isspace():
+            prefix += first
+            first = f.read(1)
+
+        if first == '[':
+            yield from _iter_json_array(f, prefix=prefix + first)
+        elif first:
+            # Single object - small by definition, parse it whole
+            yield json.loads(first + f.read())
+
+
+def _iter_json_array(
+    f, read_size: int = JSON_STREAM_READ_SIZE, prefix: str = '['
+) -> Iterator[Any]:
+    """Incrementally decode the elements of a top-level JSON array
+
+    ``f`` must be positioned just after the opening ``[``, with ``prefix``
+    the text read up to there. Only the element currently being decoded
+    (plus one read block) is held in memory. Syntax errors raise ValueError
+    at once, located in the whole file as ``json`` would.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ''
+    pos = 0
+    eof = False
+    expect_value = True
+    # Characters and line breaks before buffer[0], for error locations
+    offset = len(prefix)
+    lines = prefix.count('\n')
+    last_newline = prefix.rfind('\n')
+
+    def fill(size=read_size):
+        nonlocal buffer, pos, eof, offset, lines, last_newline
+        data = f.read(size)
+        if not data:
+            eof = True
+        dropped = buffer[:pos]
+        if '\n' in dropped:
+            lines += dropped.count('\n')
+            last_newline = offset + dropped.rfind('\n')
+        offset += pos
+        buffer = buffer[pos:] + data
+        pos = 0
+
+    def location(index):
+        before = buffer[:index]
+        newlines = before.count('\n')
+        if newlines:
+            column = index - before.rfind('\n')
+        else:
+            column = offset + index - last_newline
+        return f"line {lines + newlines + 1} column {column} (char {offset + index})"
+
+    while True:
+        # Skip whitespace and separators between elements
+        while True:
+            while pos < len(buffer) and buffer[pos].isspace():
+                pos += 1
+            if pos < len(buffer) or eof:
+                break
+            fill()
+
+        if pos >= len(buffer):
+            raise ValueError("Unexpected end of JSON array")
+
+        char = buffer[pos]
+        if char == ']':
+            return
+        if char == ',' and not expect_value:
+            pos += 1
+            expect_value = True
+            continue
+        if not expect_value:
+            raise ValueError(
+                f"Expected ',' or ']' in JSON array, got {char!r}: {location(pos)}"
+            )
+
+        try:
+            item, end = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError as e:
+            # Only an element cut off by the end of the buffer can be fixed
+            # by reading on; anything else is a syntax error in the file
+            truncated = len(buffer) - e.pos <= JSON_TRUNCATION_WINDOW or e.msg.startswith(
+                'Unterminated string'
+            )
+            if eof or not truncated:
+                raise ValueError(f"{e.msg}: {location(e.pos)}") from None
+            # Grow geometrically so a large element is not re-parsed per block
+            fill(max(read_size, len(buffer) - pos))
+            continue
+
+        # A scalar ending exactly at the buffer edge may be truncated
+        if end == len(buffer) and not eof:
+            fill()
+            continue
+
+        yield item
+        pos = end
+        expect_value = False
 
 
 class QRScanner:
     """Enhanced QR code scanning with better error handling"""
 
-    def __init__(self):
+    def __init__(
+        self,
+        preprocess: Iterable[str] = PREPROCESS_STAGES,
+        pyramid: bool = False,
+        backend: str = 'auto',
+    ):
         self.opencv_available = self._check_opencv()
         self.pyzbar_available = self._check_pyzbar()
+        # Decoder backend (see qr_decode.DECODER_BACKENDS), None if unavailable
+        self.backend_name = backend
+        self.backend = create_backend(backend)
+        self.scanning_available = self.opencv_available and self.backend is not None
+        # Files are decoded through these preprocessing stages (see qr_decode),
+        # coarse-to-fine with ``pyramid`` so large photos are never scanned whole
+        self.pyramid = pyramid
+        decode = PyramidDecoder(self.decode_image).decode if pyramid else self.decode_image
+        self.decoder = CascadeDecoder(decode, preprocess)
 
     def _check_opencv(self) -> bool:
         """Check if OpenCV is available"""
@@ -513,24 +2021,31 @@ class QRScanner:
             return False
 
     def _check_pyzbar(self) -> bool:
-        """Check if pyzbar is available"""
+        """Check if pyzbar and the zbar shared library it wraps are available"""
         try:
-            import pyzbar
+            from pyzbar import pyzbar
 
             return True
         except ImportError:
             return False
 
+    def print_requirements(self) -> None:
+        """Tell the user what the chosen backend is missing"""
+        if self.backend_name == 'zbar':
+            print("Error: The zbar backend requires OpenCV, pyzbar and the zbar library")
+            print("Install with: pip install opencv-python-headless pyzbar")
+        else:
+            print("Error: OpenCV is required for QR scanning")
+            print("Install with: pip install opencv-python-headless")
+
     def scan_from_file(self, image_path: str) -> List[Dict[str, Any]]:
         """Scan QR codes from image file with detailed results"""
-        if not self.opencv_available or not self.pyzbar_available:
-            print("Error: OpenCV and pyzbar are required for QR scanning")
-            print("Install with: pip install opencv-python-headless pyzbar")
+        if not self.scanning_available:
+            self.print_requirements()
             return []
 
         try:
             import cv2
-            from pyzbar import pyzbar
 
             # Read image
             image = cv2.imread(image_path)
@@ -538,25 +2053,12 @@ class QRScanner:
                 print(f"Error: Could not read image {image_path}")
                 return []
 
-            # Decode QR codes
-            decoded_objects = pyzbar.decode(image)
-
-            results = []
-            for obj in decoded_objects:
-                data = obj.data.decode('utf-8')
-                result = {
-                    'content': data,
-                    'type': obj.type,
-                    'quality': 'good' if len(data) > 0 else 'poor',
-                    'position': {
-                        'x': obj.rect.left,
-                        'y': obj.rect.top,
-                        'width': obj.rect.width,
-                        'height': obj.rect.height,
-                    },
-                }
-                results.append(result)
-                print(f"Found QR code: {data}")
+            # Decode QR codes, preprocessing only as far as needed
+            results, stage, _ = self.decoder.decode(image)
+            if stage is not None and stage != self.decoder.stages[0]:
+                print(f"Decoded after preprocessing: {stage}")
+            for result in results:
+                print(f"Found QR code: {result['content']}")
 
             return results
 
@@ -564,6 +2066,70 @@ class QRScanner:
             print(f"Error scanning QR code: {e}")
             return []
 
+    def decode_image(self, image) -> List[Dict[str, Any]]:
+        """Decode every QR code in an OpenCV image as-is (no preprocessing)"""
+        return self.backend.decode(image)
+
+    def scan_file_record(self, image_path: str, analyze: bool = False) -> Dict[str, Any]:
+        """Scan one file for batch scanning - a JSON-ready record, never raises
+
+        ``ok`` is True when at least one code decoded; otherwise ``error``
+        says why. ``stage`` names the preprocessing stage that decoded it and
+        ``stage_seconds`` the time spent in each stage tried. ``seconds``
+        covers reading and decoding the file.
+        """
+        record = {'file': image_path, 'ok': False, 'codes': []}
+        start = time.perf_counter()
+        try:
+            import cv2
+
+            image = cv2.imread(image_path)
+            if image is None:
+                record['error'] = 'Could not read image'
+            else:
+                codes, record['stage'], record['stage_seconds'] = self.decoder.decode(
+                    image
+                )
+                record['codes'] = codes
+                if analyze:
+                    for code in record['codes']:
+                        code['analysis'] = self.analyze_content_type(code['content'])
+                record['ok'] = bool(record['codes'])
+                if not record['ok']:
+                    record['error'] = 'No QR code found'
+        except Exception as e:
+            record['error'] = str(e)
+        record['seconds'] = time.perf_counter() - start
+        return record
+
+    def scan_files(
+        self,
+        paths: Iterable[str],
+        workers: int = 1,
+        chunksize: int = DEFAULT_SCAN_CHUNKSIZE,
+        ordered: bool = True,
+        analyze: bool = False,
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield a ``scan_file_record`` per path, on a process pool if workers > 1
+
+        Paths are small, so unlike batch generation the pool's own feeder
+        thread is allowed to queue all of them up front.
+        """
+        if workers <= 1:
+            for path in paths:
+                yield self.scan_file_record(path, analyze)
+            return
+
+        with multiprocessing.Pool(
+            processes=workers,
+            initializer=_init_scan_worker,
+            initargs=(self.decoder.stages, self.pyramid, self.backend.name),
+        ) as pool:
+            imap = pool.imap if ordered else pool.imap_unordered
+            yield from imap(
+                functools.partial(_scan_file, analyze=analyze), paths, chunksize
+            )
+
     def analyze_content_type(self, content: str) -> Dict[str, Any]:
         """Analyze QR content and determine type"""
         analysis = {'content': content, 'type': 'text', 'details': {}}
@@ -628,6 +2194,119 @@ class QRScanner:
         return analysis
 
 
+# Per-process scanner used by scan pool workers (see QRScanner.scan_files)
+_WORKER_SCANNER = None
+
+
+def _init_scan_worker(preprocess: Tuple[str, ...], pyramid: bool, backend: str) -> None:
+    """Pool initializer - build the worker's QRScanner once"""
+    global _WORKER_SCANNER
+    _WORKER_SCANNER = QRScanner(preprocess, pyramid, backend)
+
+
+def _scan_file(image_path: str, analyze: bool = False) -> Dict[str, Any]:
+    """Pool task - scan one file with the worker's scanner"""
+    return _WORKER_SCANNER.scan_file_record(image_path, analyze)
+
+
+def iter_image_paths(
+    directory: str = None, pattern: str = None, recursive: bool = False
+) -> Iterator[str]:
+    """Image files to scan, in a stable order
+
+    Either every file with a SCAN_IMAGE_SUFFIXES suffix in ``directory``
+    (and its subdirectories with ``recursive``), or every file matching the
+    glob ``pattern`` (``**`` matches across directories).
+    """
+    if pattern is not None:
+        for path in sorted(glob.iglob(pattern, recursive=True)):
+            if os.path.isfile(path):
+                yield path
+        return
+
+    for root, dirs, files in os.walk(directory):
+        dirs.sort()
+        for name in sorted(files):
+            if Path(name).suffix.lower() in SCAN_IMAGE_SUFFIXES:
+                yield os.path.join(root, name)
+        if not recursive:
+            return
+
+
+def scan_batch(
+    scanner: QRScanner,
+    paths: Iterable[str],
+    output: str = None,
+    failures_file: str = None,
+    **scan_options,
+) -> Tuple[int, int]:
+    """Scan many files, streaming one JSON line per file
+
+    Records go to ``output`` (stdout when None, with progress messages moved
+    to stderr). Files that did not decode are listed at the end and, with
+    ``failures_file``, written there as JSON Lines. The summary includes
+    how often each preprocessing stage decoded a file. Returns
+    ``(total, decoded)``.
+    """
+    log = sys.stdout if output else sys.stderr
+    out = open(output, 'w', encoding='utf-8') if output else sys.stdout
+
+    total = 0
+    codes_found = 0
+    failures = []
+    seconds = []
+    # Tallied from the records, as pool workers keep their own decoders
+    stage_stats = DecodeStats()
+    started = time.perf_counter()
+    try:
+        for record in scanner.scan_files(paths, **scan_options):
+            total += 1
+            codes_found += len(record['codes'])
+            seconds.append(record['seconds'])
+            if 'stage_seconds' in record:
+                stage_stats.record(record['stage_seconds'], record['stage'])
+            if not record['ok']:
+                failures.append(record)
+            out.write(json.dumps(record, ensure_ascii=False) + '\n')
+    finally:
+        if output:
+            out.close()
+        else:
+            out.flush()
+    wall = time.perf_counter() - started
+
+    decoded = total - len(failures)
+    seconds.sort()
+    print(f"\n📊 Scan Complete:", file=log)
+    print(f"   Files: {total}", file=log)
+    print(f"   Decoded: {decoded} ({codes_found} codes)", file=log)
+    print(f"   Failed: {len(failures)}", file=log)
+    if total:
+        print(
+            f"   Per file: p50 {_percentile(seconds, 0.50) * 1000:.1f}ms, "
+            f"p95 {_percentile(seconds, 0.95) * 1000:.1f}ms",
+            file=log,
+        )
+        print(f"   Wall time: {wall:.2f}s ({total / wall:.0f} files/s)", file=log)
+    if stage_stats.images:
+        stage_stats.report(scanner.decoder.stages, file=log)
+
+    if failures:
+        print(f"\n❌ Files that did not decode:", file=log)
+        for record in failures[:SCAN_FAILURES_SHOWN]:
+            print(f"   {record['file']}: {record.get('error')}", file=log)
+        if len(failures) > SCAN_FAILURES_SHOWN:
+            print(f"   ... and {len(failures) - SCAN_FAILURES_SHOWN} more", file=log)
+
+    if failures_file:
+        with open(failures_file, 'w', encoding='utf-8') as f:
+            for record in failures:
+                f.write(json.dumps(record, ensure_ascii=False) + '\n')
+        print(f"📝 Failure report saved to {failures_file}", file=log)
+
+    return total, decoded
+
+
 def create_sample_csv_enhanced():
     """Create an enhanced sample CSV file with all features"""
     sample_data = [
@@ -794,6 +2473,525 @@ def create_config_template():
     print("✓ Created config_template.json with documentation")
 
 
+def benchmark_color_masks(
+    sizes: List[int], content: str = 'https://example.com/benchmark'
+) -> List[Dict[str, Any]]:
+    """Time qrcode's per-pixel color masks against the NumPy versions
+
+    Every mask is rendered at each size through StyledPilImage with both
+    implementations; the largest per-channel difference is reported.
+    """
+    if not FAST_MASKS_AVAILABLE:
+        print("Error: The mask benchmark requires numpy")
+        print("Install with: pip install numpy")
+        return []
+
+    import numpy as np
+    import qr_masks
+    from qrcode.image.styles import colormasks as reference_masks
+
+    fg_color = (26, 54, 93)
+    bg_color = (255, 255, 255)
+    mid_color = tuple(int((fg + bg) / 2) for fg, bg in zip(fg_color, bg_color))
+    mask_specs = {
+        'solid': (
+            'SolidFillColorMask',
+            {'front_color': fg_color, 'back_color': bg_color},
+        ),
+        'radial': (
+            'RadialGradiantColorMask',
+            {'back_color': bg_color, 'center_color': mid_color, 'edge_color': fg_color},
+        ),
+        'square': (
+            'SquareGradiantColorMask',
+            {'back_color': bg_color, 'center_color': mid_color, 'edge_color': fg_color},
+        ),
+        'horizontal': (
+            'HorizontalGradiantColorMask',
+            {'back_color': bg_color, 'left_color': mid_color, 'right_color': fg_color},
+        ),
+        'vertical': (
+            'VerticalGradiantColorMask',
+            {'back_color': bg_color, 'top_color': mid_color, 'bottom_color': fg_color},
+        ),
+    }
+
+    def render(qr, color_mask):
+        start = time.perf_counter()
+        image = qr.make_image(image_factory=StyledPilImage, color_mask=color_mask)
+        return np.asarray(image.get_image(), dtype=np.int16), time.perf_counter() - start
+
+    results = []
+    print(f"{'mask':<12}{'size':>7}{'qrcode':>12}{'numpy':>12}{'speedup':>10}{'max diff':>10}")
+    for size in sizes:
+        qr = qrcode.QRCode(error_correction=qrcode.constants.ERROR_CORRECT_M, border=4)
+        qr.add_data(content)
+        qr.make(fit=True)
+        qr.box_size = exact_box_size(qr.modules_count, qr.border, size)
+
+        for mask_name, (class_name, kwargs) in mask_specs.items():
+            reference, reference_time = render(
+                qr, getattr(reference_masks, class_name)(**kwargs)
+            )
+            fast, fast_time = render(qr, getattr(qr_masks, f"Fast{class_name}")(**kwargs))
+            max_diff = int(np.abs(reference - fast).max())
+
+            results.append(
+                {
+                    'mask': mask_name,
+                    'size': reference.shape[0],
+                    'reference_seconds': reference_time,
+                    'numpy_seconds': fast_time,
+                    'speedup': reference_time / fast_time if fast_time else None,
+                    'max_channel_diff': max_diff,
+                }
+            )
+            print(
+                f"{mask_name:<12}{reference.shape[0]:>7}"
+                f"{reference_time * 1000:>10.1f}ms{fast_time * 1000:>10.1f}ms"
+                f"{reference_time / fast_time:>9.1f}x{max_diff:>10}"
+            )
+
+    return results
+
+
+def benchmark_encoders(
+    sizes: List[int], repeats: int = 5, content: str = 'https://example.com/benchmark'
+) -> List[Dict[str, Any]]:
+    """Compare encode time and output size across formats and ENCODER_OPTIONS
+
+    A flat black-and-white code and a styled (rounded, radial gradient) code
+    are rendered at each size and encoded with every case; the median of
+    ``repeats`` runs is reported. Lossless cases are decoded again to check
+    that the pixels survived unchanged.
+    """
+    generator = QRBatchGenerator()
+    styles = {
+        'classic': {},
+        'styled': {'theme': 'rounded', 'color_mask': 'radial', 'fg_color': '#1a365d'},
+    }
+    cases = [
+        ('png', {}),
+        ('png', {'png_compress_level': 1}),
+        ('png', {'png_compress_level': 9}),
+        ('png', {'reduce_colors': 256}),
+        ('png', {'reduce_colors': 256, 'png_compress_level': 9}),
+        ('jpg', {'quality': 90}),
+        ('webp', {}),
+        ('webp', {'webp_lossless': True}),
+        ('webp', {'webp_lossless': True, 'quality': 0}),
+        ('avif', {}),
+    ]
+    lossy = ('jpg', 'avif')
+
+    results = []
+    print(f"{'style':<9}{'size':>6}  {'encoder':<48}{'time':>10}{'bytes':>10}{'exact':>7}")
+    for size in sizes:
+        for style_name, style in styles.items():
+            config = dict(generator.config, size=size, **style)
+            image = generator.generate_qr_code(content, config)
+            reference = image.convert('RGB')
+
+            for extension, options in cases:
+                name = f"{extension} " + (
+                    " ".join(f"{key}={value}" for key, value in options.items())
+                    or "default"
+                )
+                try:
+                    timings = []
+                    for _ in range(repeats):
+                        start = time.perf_counter()
+                        data = encode_image(image, f"bench.{extension}", options)
+                        timings.append(time.perf_counter() - start)
+                except Exception as e:
+                    print(f"{style_name:<9}{size:>6}  {name:<48}  skipped: {e}")
+                    continue
+
+                seconds = sorted(timings)[len(timings) // 2]
+                exact = None
+                if extension not in lossy and not (
+                    extension == 'webp' and not options.get('webp_lossless')
+                ):
+                    decoded = Image.open(io.BytesIO(data)).convert('RGB')
+                    exact = decoded.tobytes() == reference.tobytes()
+
+                results.append(
+                    {
+                        'style': style_name,
+                        'size': size,
+                        'format': extension,
+                        'options': options,
+                        'encode_seconds': seconds,
+                        'bytes': len(data),
+                        'lossless_exact': exact,
+                    }
+                )
+                print(
+                    f"{style_name:<9}{size:>6}  {name:<48}{seconds * 1000:>8.2f}ms"
+                    f"{len(data):>10}{'-' if exact is None else 'yes' if exact else 'NO':>7}"
+                )
+
+    return results
+
+
+def peak_rss_bytes():
+    """Peak resident set size of this process so far (None where unsupported)"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def _percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    rank = max(1, int(-(-fraction * len(sorted_values) // 1)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def benchmark_pipeline(
+    sizes: List[int],
+    themes: List[str] = BENCH_THEMES,
+    masks: List[str] = BENCH_MASKS,
+    ecc_levels: List[str] = BENCH_ECC_LEVELS,
+    overlays: List[bool] = (False, True),
+    iterations: int = 10,
+    warmup: int = 2,
+) -> Dict[str, Any]:
+    """Time ``generate_qr_code`` over a theme/mask/size/ECC/overlay matrix
+
+    Every case renders ``warmup`` untimed codes followed by ``iterations``
+    timed ones. Contents are fixed per case and distinct per iteration, so
+    runs are reproducible and every render misses the encode cache (style
+    and logo caches are reused, as in a real batch). Reports throughput,
+    p50/p95 latency and the process's peak RSS after each case.
+    """
+    generator = QRBatchGenerator()
+    base_config = dict(generator.config, fg_color='#1a365d', bg_color='#ffffff')
+
+    environment = {
+        'python': sys.version.split()[0],
+        'platform': sys.platform,
+        'pillow': Image.__version__,
+        'numpy': np.__version__ if NUMPY_AVAILABLE else None,
+        'fast_masks': FAST_MASKS_AVAILABLE,
+        'iterations': iterations,
+        'warmup': warmup,
+    }
+
+    cases = []
+    print(
+        f"{'theme':<16}{'mask':<12}{'size':>6}{'ecc':>5}{'logo':>6}"
+        f"{'codes/s':>10}{'p50':>10}{'p95':>10}{'peak RSS':>11}"
+    )
+    for theme, mask, size, ecc, overlay in itertools.product(
+        themes, masks, sizes, ecc_levels, overlays
+    ):
+        config = dict(
+            base_config,
+            theme=theme,
+            color_mask=mask,
+            size=size,
+            error_correction=ecc,
+            use_image=overlay,
+            image_path=BENCH_LOGO_PATH if overlay else '',
+        )
+        content_prefix = (
+            f"https://example.com/bench/{theme}/{mask}/{size}/{ecc}/{overlay:d}/"
+        )
+
+        for i in range(warmup):
+            generator.generate_qr_code(f"{content_prefix}w{i:05d}", config)
+
+        latencies = []
+        case_start = time.perf_counter()
+        for i in range(iterations):
+            start = time.perf_counter()
+            generator.generate_qr_code(f"{content_prefix}{i:06d}", config)
+            latencies.append(time.perf_counter() - start)
+        case_seconds = time.perf_counter() - case_start
+
+        latencies.sort()
+        peak_rss = peak_rss_bytes()
+        case = {
+            'theme': theme,
+            'mask': mask,
+            'size': size,
+            'error_correction': ecc,
+            'overlay': overlay,
+            'iterations': iterations,
+            'codes_per_second': iterations / case_seconds if case_seconds else None,
+            'p50_seconds': _percentile(latencies, 0.50),
+            'p95_seconds': _percentile(latencies, 0.95),
+            'peak_rss_bytes': peak_rss,
+        }
+        cases.append(case)
+        print(
+            f"{theme:<16}{mask:<12}{size:>6}{ecc:>5}{'on' if overlay else 'off':>6}"
+            f"{case['codes_per_second']:>10.1f}"
+            f"{case['p50_seconds'] * 1000:>8.2f}ms{case['p95_seconds'] * 1000:>8.2f}ms"
+            + (f"{peak_rss / 2**20:>9.1f}MB" if peak_rss is not None else f"{'-':>11}")
+        )
+
+    return {'environment': environment, 'cases': cases}
+
+
+def synthetic_photo(
+    rng, width: int, height: int, codes: int
+) -> Tuple[Any, List[str]]:
+    """A cluttered BGR "photo" with ``codes`` QR codes pasted into it
+
+    The background is a smooth random color field with rectangles and text
+    on top (edges that are not codes), the codes are pasted at random
+    BENCH_PHOTO_CODE_SIDES without overlapping, and the whole image is
+    slightly blurred and noised like a camera shot. Returns the image and
+    the pasted contents.
+    """
+    import cv2
+
+    field = rng.randint(40, 220, (height // 96 + 2, width // 96 + 2, 3)).astype(np.uint8)
+    image = cv2.resize(field, (width, height), interpolation=cv2.INTER_CUBIC)
+    for _ in range(60):
+        x, y = int(rng.randint(0, width)), int(rng.randint(0, height))
+        color = tuple(int(channel) for channel in rng.randint(0, 256, 3))
+        if rng.rand() < 0.5:
+            corner = (x + int(rng.randint(20, 600)), y + int(rng.randint(20, 400)))
+            cv2.rectangle(image, (x, y), corner, color, -1 if rng.rand() < 0.5 else 3)
+        else:
+            cv2.putText(
+                image,
+                'Lorem ipsum 123',
+                (x, y),
+                cv2.FONT_HERSHEY_SIMPLEX,
+                float(rng.uniform(1, 4)),
+                color,
+                int(rng.randint(1, 6)),
+            )
+
+    contents = []
+    placed = []
+    for _ in range(codes):
+        content = f"https://example.com/photo/{rng.randint(10**9):09d}"
+        modules = np.array(encode_qr(content).get_matrix(), dtype=bool)
+        count = modules.shape[0]
+        side = max(count, int(rng.choice(BENCH_PHOTO_CODE_SIDES)) // count * count)
+        if side >= min(width, height):
+            continue
+        tile = cv2.resize(
+            np.where(modules, 0, 255).astype(np.uint8),
+            (side, side),
+            interpolation=cv2.INTER_NEAREST,
+        )
+        for _ in range(100):
+            x = int(rng.randint(0, width - side))
+            y = int(rng.randint(0, height - side))
+            if all(
+                x + side < px or px + ps < x or y + side < py or py + ps < y
+                for px, py, ps in placed
+            ):
+                break
+        else:
+            continue
+        placed.append((x, y, side))
+        image[y : y + side, x : x + side] = tile[..., None]
+        contents.append(content)
+
+    image = cv2.GaussianBlur(image, (3, 3), 0)
+    noise = rng.normal(0, 5, image.shape)
+    image = np.clip(image + noise, 0, 255).astype(np.uint8)
+    return image, contents
+
+
+def benchmark_pyramid(
+    scanner: QRScanner,
+    photos: int = 8,
+    size: Tuple[int, int] = BENCH_PHOTO_SIZE,
+    codes: int = BENCH_PHOTO_CODES,
+    seed: int = 0,
+) -> Dict[str, Any]:
+    """Full-resolution vs coarse-to-fine decoding of synthetic large photos
+
+    Every photo (see ``synthetic_photo``, reproducible from ``seed``) is
+    decoded as-is and through a PyramidDecoder, without preprocessing.
+    Reports the share of pasted codes found, codes decoded that were never
+    pasted, and p50/p95 decode time per photo.
+    """
+    import cv2
+
+    width, height = size
+    rng = np.random.RandomState(seed)
+    modes = {
+        'full': scanner.decode_image,
+        'pyramid': PyramidDecoder(scanner.decode_image).decode,
+    }
+    tallies = {mode: {'seconds': [], 'found': 0, 'spurious': 0} for mode in modes}
+    placed = 0
+
+    print(f"🖼️  Decoding {photos} synthetic {width}x{height} photos ({codes} codes each)")
+    for _ in range(photos):
+        image, contents = synthetic_photo(rng, width, height, codes)
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        placed += len(contents)
+        for mode, decode in modes.items():
+            start = time.perf_counter()
+            decoded = {result['content'] for result in decode(gray)}
+            tallies[mode]['seconds'].append(time.perf_counter() - start)
+            tallies[mode]['found'] += len(decoded & set(contents))
+            tallies[mode]['spurious'] += len(decoded - set(contents))
+
+    cases = []
+    print(f"{'mode':<10}{'found':>12}{'spurious':>10}{'p50':>11}{'p95':>11}")
+    for mode, tally in tallies.items():
+        seconds = sorted(tally['seconds'])
+        case = {
+            'mode': mode,
+            'photos': photos,
+            'codes': placed,
+            'found': tally['found'],
+            'spurious': tally['spurious'],
+            'p50_seconds': _percentile(seconds, 0.50),
+            'p95_seconds': _percentile(seconds, 0.95),
+        }
+        cases.append(case)
+        print(
+            f"{mode:<10}{tally['found']:>6}/{placed:<5}{tally['spurious']:>10}"
+            f"{case['p50_seconds'] * 1000:>9.0f}ms{case['p95_seconds'] * 1000:>9.0f}ms"
+        )
+
+    environment = {
+        'python': sys.version.split()[0],
+        'platform': sys.platform,
+        'opencv': cv2.__version__,
+        'photo_size': [width, height],
+        'seed': seed,
+    }
+    return {'environment': environment, 'cases': cases}
+
+
+def benchmark_backends(
+    sizes: List[int],
+    photos: int = 4,
+    photo_size: Tuple[int, int] = BENCH_PHOTO_SIZE,
+    codes: int = BENCH_PHOTO_CODES,
+    backends: List[str] = None,
+    seed: int = 0,
+) -> Dict[str, Any]:
+    """Compare decoder backends on the same images
+
+    The image set is clean codes rendered with BENCH_BACKEND_THEMES at every
+    size plus ``photos`` synthetic photos (see ``synthetic_photo``), all
+    grayscale. Each available backend decodes every image once, without
+    preprocessing; found/spurious codes and p50/p95 time per image are
+    reported per backend and image kind.
+    """
+    import cv2
+
+    generator = QRBatchGenerator()
+    images = []
+    for theme in BENCH_BACKEND_THEMES:
+        for size in sizes:
+            content = f"https://example.com/backends/{theme}/{size}"
+            config = dict(generator.config, theme=theme, size=size)
+            image = generator.generate_qr_code(content, config)
+            images.append(('rendered', np.asarray(image.convert('L')), [content]))
+
+    width, height = photo_size
+    rng = np.random.RandomState(seed)
+    for _ in range(photos):
+        image, contents = synthetic_photo(rng, width, height, codes)
+        images.append(('photo', cv2.cvtColor(image, cv2.COLOR_BGR2GRAY), contents))
+
+    names = backends or available_backends()
+    cases = []
+    print(f"🔍 Decoding {len(images)} images with: {', '.join(names)}")
+    print(f"{'backend':<10}{'images':<10}{'found':>12}{'spurious':>10}{'p50':>11}{'p95':>11}")
+    for name in names:
+        backend = create_backend(name)
+        if backend is None:
+            print(f"{name:<10}skipped: not available")
+            continue
+
+        for kind in ('rendered', 'photo'):
+            subset = [(image, expected) for k, image, expected in images if k == kind]
+            if not subset:
+                continue
+            seconds = []
+            found = spurious = placed = 0
+            for image, expected in subset:
+                start = time.perf_counter()
+                decoded = {result['content'] for result in backend.decode(image)}
+                seconds.append(time.perf_counter() - start)
+                placed += len(expected)
+                found += len(decoded & set(expected))
+                spurious += len(decoded - set(expected))
+
+            seconds.sort()
+            case = {
+                'backend': name,
+                'images': kind,
+                'count': len(subset),
+                'codes': placed,
+                'found': found,
+                'spurious': spurious,
+                'p50_seconds': _percentile(seconds, 0.50),
+                'p95_seconds': _percentile(seconds, 0.95),
+            }
+            cases.append(case)
+            print(
+                f"{name:<10}{kind:<10}{found:>6}/{placed:<5}{spurious:>10}"
+                f"{case['p50_seconds'] * 1000:>9.1f}ms{case['p95_seconds'] * 1000:>9.1f}ms"
+            )
+
+    environment = {
+        'python': sys.version.split()[0],
+        'platform': sys.platform,
+        'opencv': cv2.__version__,
+        'sizes': sizes,
+        'photo_size': [width, height],
+        'seed': seed,
+    }
+    return {'environment': environment, 'cases': cases}
+
+
+def compare_benchmarks(
+    current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float = 0.10
+) -> List[Dict[str, Any]]:
+    """Print p50 changes against a saved pipeline benchmark
+
+    Returns the cases whose p50 latency grew by more than ``tolerance``
+    (a fraction). Cases missing from either run are ignored.
+    """
+    key_fields = ('theme', 'mask', 'size', 'error_correction', 'overlay')
+    baseline_cases = {
+        tuple(case[field] for field in key_fields): case
+        for case in baseline.get('cases', [])
+    }
+
+    regressions = []
+    print(f"\n📈 Compared with baseline (tolerance {tolerance:.0%}):")
+    for case in current['cases']:
+        key = tuple(case[field] for field in key_fields)
+        old = baseline_cases.get(key)
+        if not old or not old['p50_seconds']:
+            continue
+        change = case['p50_seconds'] / old['p50_seconds'] - 1
+        regressed = change > tolerance
+        if regressed:
+            regressions.append(dict(case, p50_change=change))
+        print(
+            f"   {'❌' if regressed else '✅'} {case['theme']}/{case['mask']} "
+            f"{case['size']}px {case['error_correction']} "
+            f"logo {'on' if case['overlay'] else 'off'}: "
+            f"{old['p50_seconds'] * 1000:.2f}ms -> {case['p50_seconds'] * 1000:.2f}ms "
+            f"({change:+.0%})"
+        )
+
+    print(f"   {len(regressions)} regression(s)")
+    return regressions
+
+
 def main():
     """Enhanced command line interface"""
     parser = argparse.ArgumentParser(description='Enhanced QR Code Utilities')
@@ -801,19 +2999,245 @@ def main():
 
     # Batch generation commands
     batch_parser = subparsers.add_parser('batch', help='Batch generate QR codes')
-    batch_parser.add_argument('input_file', help='Input CSV or JSON file')
     batch_parser.add_argument(
-        '--output', '-o', default='./exports/batch_output', help='Output directory'
+        'input_file', help='Input CSV, JSON or JSON Lines (.jsonl) file'
+    )
+    batch_parser.add_argument(
+        '--output',
+        '-o',
+        default='./exports/batch_output',
+        help='Output directory, or a .zip / .tar[.gz] archive',
+    )
+    batch_parser.add_argument(
+        '--sink',
+        choices=SINK_TYPES,
+        help='Output kind (default: guessed from --output)',
+    )
+    batch_parser.add_argument(
+        '--shard-size',
+        type=int,
+        default=DEFAULT_SHARD_SIZE,
+        help="Outputs per tar shard with --sink shards",
     )
     batch_parser.add_argument('--config', '-c', help='Configuration file')
+    batch_parser.add_argument(
+        '--render-mode',
+        choices=RENDER_MODES,
+        help="'exact' renders at the target size with no resampling pass",
+    )
+    batch_parser.add_argument(
+        '--png-compress-level',
+        type=int,
+        choices=range(10),
+        metavar='0-9',
+        help='PNG zlib level (lower is faster, larger)',
+    )
+    batch_parser.add_argument(
+        '--reduce-colors',
+        type=int,
+        metavar='N',
+        help='Write palette/1-bit images when a code has at most N colors',
+    )
+    batch_parser.add_argument(
+        '--quality', type=int, help='JPEG/WebP/AVIF quality (lossless WebP: effort)'
+    )
+    batch_parser.add_argument(
+        '--webp-lossless', action='store_true', help='Encode WebP losslessly'
+    )
+    batch_parser.add_argument(
+        '--webp-method',
+        type=int,
+        choices=range(7),
+        metavar='0-6',
+        help='WebP encoder method (higher is slower, smaller)',
+    )
+    batch_parser.add_argument(
+        '--workers',
+        '-w',
+        type=int,
+        default=1,
+        help='Worker processes for parallel generation (0 = all CPU cores)',
+    )
+    batch_parser.add_argument(
+        '--chunksize',
+        type=int,
+        default=DEFAULT_BATCH_CHUNKSIZE,
+        help='Rows sent to a worker per dispatch',
+    )
+    batch_parser.add_argument(
+        '--unordered',
+        action='store_true',
+        help='Report rows as they finish instead of in input order',
+    )
+    batch_parser.add_argument(
+        '--profile',
+        action='store_true',
+        help='Print per-stage timing histograms after the run',
+    )
+    batch_parser.add_argument(
+        '--profile-dump',
+        metavar='DIR',
+        help='With --profile, cProfile the slowest rows and save .pstats files here',
+    )
+    batch_parser.add_argument(
+        '--profile-top',
+        type=int,
+        default=DEFAULT_PROFILE_TOP,
+        metavar='N',
+        help='Slowest rows to cProfile with --profile-dump',
+    )
+    batch_parser.add_argument(
+        '--verify',
+        action='store_true',
+        help='Decode every output back and reject rows that do not match',
+    )
+    batch_parser.add_argument(
+        '--reject-report',
+        metavar='FILE',
+        help='With --verify, write rejected rows here (JSON Lines)',
+    )
+    batch_parser.add_argument(
+        '--incremental',
+        action='store_true',
+        help='Skip rows whose output is unchanged since the last run',
+    )
+    batch_parser.add_argument(
+        '--prune',
+        action='store_true',
+        help='With --incremental, delete outputs no longer produced by any row',
+    )
 
     # Enhanced scanning commands
     scan_parser = subparsers.add_parser('scan', help='Scan and analyze QR codes')
-    scan_parser.add_argument('--file', '-f', required=True, help='Image file to scan')
+    scan_source = scan_parser.add_mutually_exclusive_group(required=True)
+    scan_source.add_argument('--file', '-f', help='Image file to scan')
+    scan_source.add_argument('--dir', '-d', help='Scan every image in a directory')
+    scan_source.add_argument(
+        '--glob', '-g', help="Scan files matching a quoted glob ('**' recurses)"
+    )
+    scan_parser.add_argument(
+        '--recursive', '-r', action='store_true', help='Include subdirectories of --dir'
+    )
     scan_parser.add_argument(
         '--analyze', '-a', action='store_true', help='Analyze content type'
     )
-    scan_parser.add_argument('--output', '-o', help='Save analysis to file')
+    scan_parser.add_argument(
+        '--output',
+        '-o',
+        help='Save analysis to file (JSON Lines for --dir/--glob, default stdout)',
+    )
+    scan_parser.add_argument(
+        '--failures', help='With --dir/--glob, write undecoded files here (JSON Lines)'
+    )
+    scan_parser.add_argument(
+        '--workers',
+        '-w',
+        type=int,
+        default=1,
+        help='Worker processes for --dir/--glob (0 = all CPU cores)',
+    )
+    scan_parser.add_argument(
+        '--chunksize',
+        type=int,
+        default=DEFAULT_SCAN_CHUNKSIZE,
+        help='Files sent to a worker per dispatch',
+    )
+    scan_parser.add_argument(
+        '--preprocess',
+        nargs='+',
+        choices=PREPROCESS_STAGES,
+        default=list(PREPROCESS_STAGES),
+        help='Preprocessing stages to try, in order, until a code decodes',
+    )
+    scan_parser.add_argument(
+        '--pyramid',
+        action='store_true',
+        help='Decode large photos coarse-to-fine (downscaled, then candidate crops)',
+    )
+    scan_parser.add_argument(
+        '--backend',
+        choices=('auto',) + DECODER_BACKENDS,
+        default='auto',
+        help='QR decoder (auto = fastest available)',
+    )
+    scan_parser.add_argument(
+        '--unordered',
+        action='store_true',
+        help='Write records as files finish instead of in path order',
+    )
+
+    # Benchmark commands
+    bench_parser = subparsers.add_parser(
+        'bench', help='Benchmark generation components'
+    )
+    bench_parser.add_argument(
+        '--suite',
+        choices=['masks', 'encoders', 'pipeline', 'pyramid', 'backends'],
+        default='masks',
+        help='Benchmark to run',
+    )
+    bench_parser.add_argument(
+        '--sizes',
+        type=int,
+        nargs='+',
+        default=[200, 400, 800],
+        help='Image sizes in pixels',
+    )
+    bench_parser.add_argument(
+        '--themes', nargs='+', default=list(BENCH_THEMES), help='Pipeline themes'
+    )
+    bench_parser.add_argument(
+        '--masks', nargs='+', default=list(BENCH_MASKS), help='Pipeline color masks'
+    )
+    bench_parser.add_argument(
+        '--ecc',
+        nargs='+',
+        choices=list(ERROR_CORRECTION_LEVELS),
+        default=list(BENCH_ECC_LEVELS),
+        help='Pipeline error correction levels',
+    )
+    bench_parser.add_argument(
+        '--overlay',
+        choices=['off', 'on', 'both'],
+        default='both',
+        help='Pipeline runs without and/or with a logo overlay',
+    )
+    bench_parser.add_argument(
+        '--iterations', type=int, default=10, help='Timed codes per pipeline case'
+    )
+    bench_parser.add_argument(
+        '--baseline', help='Pipeline JSON from an earlier run to compare against'
+    )
+    bench_parser.add_argument(
+        '--tolerance',
+        type=float,
+        default=0.10,
+        help='Allowed p50 slowdown against --baseline before failing (0.10 = 10%%)',
+    )
+    bench_parser.add_argument(
+        '--photos',
+        type=int,
+        default=8,
+        help='Synthetic photos for the pyramid/backends suites',
+    )
+    bench_parser.add_argument(
+        '--photo-size',
+        type=int,
+        nargs=2,
+        metavar=('WIDTH', 'HEIGHT'),
+        default=list(BENCH_PHOTO_SIZE),
+        help='Synthetic photo size in pixels',
+    )
+    bench_parser.add_argument(
+        '--codes', type=int, default=BENCH_PHOTO_CODES, help='QR codes per synthetic photo'
+    )
+    bench_parser.add_argument(
+        '--backends',
+        nargs='+',
+        choices=DECODER_BACKENDS,
+        help='Decoder backends to compare (default: all available)',
+    )
+    bench_parser.add_argument('--output', '-o', help='Save results as JSON')
 
     # Sample generation commands
     sample_parser = subparsers.add_parser(
@@ -839,28 +3263,80 @@ def main():
 
         if args.config:
             generator.load_config(args.config)
+        if args.render_mode:
+            generator.config['render_mode'] = args.render_mode
+        for option in ENCODER_OPTIONS:
+            value = getattr(args, option)
+            if value is not None and value is not False:
+                generator.config[option] = value
 
         input_path = Path(args.input_file)
         if not input_path.exists():
             print(f"Error: Input file {args.input_file} not found")
             return
 
+        sink_type = args.sink or guess_sink_type(args.output)
+        if (args.incremental or args.prune) and sink_type != 'dir':
+            print("Error: --incremental and --prune need a directory output")
+            return
+
+        workers = args.workers if args.workers > 0 else (os.cpu_count() or 1)
+        batch_options = {
+            'workers': workers,
+            'chunksize': max(1, args.chunksize),
+            'ordered': not args.unordered,
+            'incremental': args.incremental,
+            'prune': args.prune,
+            'sink_type': sink_type,
+            'shard_size': args.shard_size,
+        }
+        if args.verify or args.reject_report:
+            if not NUMPY_AVAILABLE:
+                print("Error: --verify requires numpy")
+                print("Install with: pip install numpy")
+                return
+            scanner = QRScanner()
+            if not scanner.scanning_available:
+                scanner.print_requirements()
+                return
+            batch_options['verifier'] = VerifyReport(args.reject_report)
+        if args.profile or args.profile_dump:
+            batch_options['profiler'] = StageProfiler(
+                args.profile_top if args.profile_dump else 0, args.profile_dump
+            )
+
         print(f"Processing {args.input_file}...")
         if input_path.suffix.lower() == '.csv':
-            generator.generate_from_csv(args.input_file, args.output)
-        elif input_path.suffix.lower() == '.json':
-            generator.generate_from_json(args.input_file, args.output)
+            generator.generate_from_csv(args.input_file, args.output, **batch_options)
+        elif input_path.suffix.lower() in ('.json',) + JSON_LINES_SUFFIXES:
+            generator.generate_from_json(args.input_file, args.output, **batch_options)
         else:
-            print("Error: Input file must be CSV or JSON")
+            print("Error: Input file must be CSV, JSON or JSON Lines")
 
-        print(f"Batch generation complete! Check {args.output} directory.")
+        print(f"Batch generation complete! Check {args.output}")
 
     elif args.command == 'scan':
-        scanner = QRScanner()
+        scanner = QRScanner(args.preprocess, args.pyramid, args.backend)
 
-        if not scanner.opencv_available or not scanner.pyzbar_available:
-            print("Error: Scanning requires opencv-python-headless and pyzbar")
-            print("Install with: pip install opencv-python-headless pyzbar")
+        if not scanner.scanning_available:
+            scanner.print_requirements()
+            return
+
+        if args.file is None:
+            if args.dir is not None and not os.path.isdir(args.dir):
+                print(f"Error: Directory {args.dir} not found")
+                return
+            paths = iter_image_paths(args.dir, args.glob, args.recursive)
+            scan_batch(
+                scanner,
+                paths,
+                args.output,
+                args.failures,
+                workers=args.workers if args.workers > 0 else (os.cpu_count() or 1),
+                chunksize=max(1, args.chunksize),
+                ordered=not args.unordered,
+                analyze=args.analyze,
+            )
             return
 
         results = scanner.scan_from_file(args.file)
@@ -889,6 +3365,52 @@ def main():
                 json.dump(results, f, indent=2)
             print(f"\nAnalysis saved to {args.output}")
 
+    elif args.command == 'bench':
+        if args.suite == 'masks':
+            results = benchmark_color_masks(args.sizes)
+        elif args.suite == 'encoders':
+            results = benchmark_encoders(args.sizes)
+        elif args.suite == 'pipeline':
+            overlays = {'off': [False], 'on': [True], 'both': [False, True]}
+            results = benchmark_pipeline(
+                args.sizes,
+                args.themes,
+                args.masks,
+                args.ecc,
+                overlays[args.overlay],
+                max(1, args.iterations),
+            )
+        elif args.suite == 'pyramid':
+            scanner = QRScanner()
+            if not scanner.scanning_available:
+                scanner.print_requirements()
+                return
+            results = benchmark_pyramid(
+                scanner, max(1, args.photos), tuple(args.photo_size), max(1, args.codes)
+            )
+        elif args.suite == 'backends':
+            if not available_backends():
+                QRScanner().print_requirements()
+                return
+            results = benchmark_backends(
+                args.sizes,
+                max(0, args.photos),
+                tuple(args.photo_size),
+                max(1, args.codes),
+                args.backends,
+            )
+
+        if args.output and results:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                json.dump(results, f, indent=2)
+            print(f"\nBenchmark results saved to {args.output}")
+
+        if args.suite == 'pipeline' and args.baseline:
+            with open(args.baseline, 'r', encoding='utf-8') as f:
+                baseline = json.load(f)
+            if compare_benchmarks(results, baseline, args.tolerance):
+                sys.exit(1)
+
     elif args.command == 'samples':
         if args.all or args.csv:
             create_sample_csv_enhanced()
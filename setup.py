@@ -198,8 +198,9 @@ class QRGeneratorInstaller:
 
         optional_packages = [
             ("pyperclip==1.8.2", "Clipboard functionality"),
+            ("numpy>=1.24.0", "Fast color masks"),
             ("opencv-python-headless>=4.8.0", "QR scanning"),
-            ("pyzbar>=0.1.9", "QR scanning"),
+            ("pyzbar>=0.1.9", "Optional zbar decoder for scan --backend zbar"),
         ]
 
         installed_count = 0
@@ -243,7 +244,7 @@ class QRGeneratorInstaller:
                     'python3-tk': 'GUI framework (required for application)',
                     'xclip': 'Primary clipboard support',
                     'xsel': 'Alternative clipboard support',
-                    'libzbar0': 'QR code scanning library',
+                    'libzbar0': 'zbar decoder library (optional, for pyzbar)',
                 },
             },
             'dnf': {
@@ -254,7 +255,7 @@ class QRGeneratorInstaller:
                     'tkinter': 'GUI framework (required for application)',
                     'xclip': 'Primary clipboard support',
                     'xsel': 'Alternative clipboard support',
-                    'zbar': 'QR code scanning library',
+                    'zbar': 'zbar decoder library (optional, for pyzbar)',
                 },
             },
             'pacman': {
@@ -265,7 +266,7 @@ class QRGeneratorInstaller:
                     'tk': 'GUI framework (required for application)',
                     'xclip': 'Primary clipboard support',
                     'xsel': 'Alternative clipboard support',
-                    'zbar': 'QR code scanning library',
+                    'zbar': 'zbar decoder library (optional, for pyzbar)',
                 },
             },
             'zypper': {
@@ -276,7 +277,7 @@ class QRGeneratorInstaller:
                     'python3-tkinter': 'GUI framework (required for application)',
                     'xclip': 'Primary clipboard support',
                     'xsel': 'Alternative clipboard support',
-                    'libzbar0': 'QR code scanning library',
+                    'libzbar0': 'zbar decoder library (optional, for pyzbar)',
                 },
             },
         }
@@ -296,7 +297,7 @@ class QRGeneratorInstaller:
             self.print_warning("You may need to install dependencies manually:")
             self.print_warning("- GUI framework: python3-tk/tkinter")
             self.print_warning("- Clipboard: xclip, xsel")
-            self.print_warning("- QR scanning: libzbar0/zbar")
+            self.print_warning("- Optional zbar decoder (scan --backend zbar): libzbar0/zbar")
             return True
 
         pm_config = package_managers[detected_pm]